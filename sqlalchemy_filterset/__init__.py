@@ -1,20 +1,31 @@
 from .constants import NullsPosition
 from .filters import (
+    ArrayContainedByFilter,
+    ArrayContainsFilter,
+    ArrayOverlapFilter,
     BaseFilter,
     BooleanFilter,
     Filter,
     InFilter,
     IsNullFilter,
+    JsonContainsFilter,
+    JsonHasKeyFilter,
+    JsonPathFilter,
     LimitOffsetFilter,
     MethodFilter,
     NotInFilter,
     OrderingField,
     OrderingFilter,
+    RangeAdjacentFilter,
+    RangeContainedByFilter,
+    RangeContainsFilter,
     RangeFilter,
+    RangeOverlapFilter,
     SearchFilter,
 )
 from .filtersets import AsyncFilterSet, BaseFilterSet, FilterSet
 from .strategies import (
+    AutoStrategy,
     BaseStrategy,
     JoinStrategy,
     MultiJoinStrategy,
@@ -25,21 +36,32 @@ from .strategies import (
 
 __all__ = [
     "NullsPosition",
+    "ArrayContainedByFilter",
+    "ArrayContainsFilter",
+    "ArrayOverlapFilter",
     "BaseFilter",
     "BooleanFilter",
     "Filter",
     "InFilter",
+    "JsonContainsFilter",
+    "JsonHasKeyFilter",
+    "JsonPathFilter",
     "LimitOffsetFilter",
     "MethodFilter",
     "NotInFilter",
     "OrderingField",
     "OrderingFilter",
+    "RangeAdjacentFilter",
+    "RangeContainedByFilter",
+    "RangeContainsFilter",
     "RangeFilter",
+    "RangeOverlapFilter",
     "SearchFilter",
     "IsNullFilter",
     "AsyncFilterSet",
     "BaseFilterSet",
     "FilterSet",
+    "AutoStrategy",
     "BaseStrategy",
     "JoinStrategy",
     "MultiJoinStrategy",
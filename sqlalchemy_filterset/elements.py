@@ -0,0 +1,145 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import String, not_
+from sqlalchemy.engine import Dialect
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ColumnElement, TableClause
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.type_api import TypeDecorator, TypeEngine
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class DialectCase(ColumnElement):
+    """Expression which is rendered by its variant for the dialect of a compiler
+
+    All variants are built beforehand, so their bound parameters belong to the statement
+    and its cache key. Only the variant for the dialect is rendered, default otherwise.
+
+    Example::
+
+        DialectCase(field.in_(values), postgresql=field == any_(array_of_values))
+    """
+
+    __visit_name__ = "dialect_case"
+
+    _traverse_internals = [
+        ("default", InternalTraversal.dp_clauseelement),
+        ("cases", InternalTraversal.dp_string_clauseelement_dict),
+    ]
+
+    def __init__(self, default: ColumnElement, **cases: ColumnElement) -> None:
+        """
+        :param default: Expression for dialects without variant
+        :param cases: Expressions for dialects by dialect name
+        """
+        self.default = default
+        self.cases: Dict[str, ColumnElement] = cases
+        self.type = default.type
+
+    def get_variant(self, dialect_name: str) -> ColumnElement:
+        return self.cases.get(dialect_name, self.default)
+
+    def _negate(self) -> ColumnElement:
+        cases = {name: not_(case) for name, case in self.cases.items()}
+        return DialectCase(not_(self.default), **cases)
+
+    def self_group(self, against: Optional[Any] = None) -> ColumnElement:
+        default = self.default.self_group(against=against)
+        cases = {name: case.self_group(against=against) for name, case in self.cases.items()}
+        if default is self.default and all(
+            cases[name] is case for name, case in self.cases.items()
+        ):
+            return self
+        return DialectCase(default, **cases)
+
+
+def _compile_dialect_case(element: DialectCase, compiler: SQLCompiler, **kw: Any) -> str:
+    return compiler.process(element.get_variant(compiler.dialect.name), **kw)
+
+
+compiles(DialectCase)(_compile_dialect_case)  # type: ignore[no-untyped-call]
+
+
+class Unsupported(ColumnElement):
+    """Expression which can not be rendered, compilation raises CompileError
+
+    It's a variant of DialectCase for dialects which have no equivalent of an expression,
+    so the error is raised only when a statement is compiled for such dialect.
+    """
+
+    __visit_name__ = "unsupported"
+
+    _traverse_internals = [("message", InternalTraversal.dp_string)]
+
+    def __init__(self, message: str) -> None:
+        """
+        :param message: Message of the compilation error
+        """
+        self.message = message
+        self.type = sa.Boolean()
+
+
+def _compile_unsupported(element: Unsupported, compiler: SQLCompiler, **kw: Any) -> str:
+    raise CompileError(element.message)
+
+
+compiles(Unsupported)(_compile_unsupported)  # type: ignore[no-untyped-call]
+
+
+class JsonArray(TypeDecorator):
+    """Bind a sequence of values as a json array string.
+
+    Values are processed by item_type for the dialect of a statement,
+    so they are encoded the same way as values bound to a column of item_type.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def __init__(self, item_type: TypeEngine) -> None:
+        super().__init__()
+        self.item_type = item_type
+
+    def process_bind_param(self, value: Optional[Any], dialect: Dialect) -> Optional[str]:
+        if value is None:
+            return None
+        processor = self.item_type.dialect_impl(dialect).bind_processor(dialect)
+        items: List[Any] = [processor(item) for item in value] if processor else list(value)
+        return json.dumps(items, default=str)
+
+
+class TemporaryValues(TableClause):
+    """Values which are loaded into a temporary table before a statement is executed
+
+    Statement refers to the table by name, values are not part of the statement.
+    FilterSet creates the table with values before execution and drops it afterwards.
+    """
+
+    inherit_cache = True
+
+    def __init__(self, name: str, type_: TypeEngine, values: Iterable) -> None:
+        """
+        :param name: Name of the temporary table
+        :param type_: Type of values
+        :param values: Values of the table, duplicates and None are skipped
+        """
+        super().__init__(name, sa.column("value", type_))
+        self.value_type = type_
+        self.values = [value for value in dict.fromkeys(values) if value is not None]
+
+    def to_table(self, on_commit_drop: bool = False) -> sa.Table:
+        """Get the temporary table for creation
+
+        :param on_commit_drop: Drop the table at the end of the transaction on postgresql,
+            a table of a connection in autocommit mode would be dropped right after creation
+        """
+        return sa.Table(
+            self.name,
+            sa.MetaData(),
+            sa.Column("value", self.value_type, primary_key=True, autoincrement=False),
+            prefixes=["TEMPORARY"],
+            postgresql_on_commit="DROP" if on_commit_drop else None,
+        )
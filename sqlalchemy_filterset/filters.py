@@ -1,20 +1,59 @@
 import abc
+import datetime
+import functools
 import inspect
 import operator as op
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import sqlalchemy as sa
 from sqlalchemy.sql import ColumnElement, Select
 from sqlalchemy.sql import operators as sa_op
 
 from sqlalchemy_filterset.constants import NullsPosition
-from sqlalchemy_filterset.operators import icontains, is_null
+from sqlalchemy_filterset.elements import TemporaryValues
+from sqlalchemy_filterset.operators import (
+    array_contained_by,
+    array_contains,
+    array_overlap,
+    icontains,
+    in_array,
+    in_values,
+    is_null,
+    json_contains,
+    json_has_all_keys,
+    json_has_any_key,
+    json_has_key,
+    json_path,
+    not_in_array,
+    not_in_values,
+    range_adjacent,
+    range_contained_by,
+    range_contains,
+    range_overlap,
+)
 from sqlalchemy_filterset.strategies import BaseStrategy
 from sqlalchemy_filterset.types import LookupExpr, ModelAttribute
 
 if TYPE_CHECKING:
     from sqlalchemy_filterset.filtersets import BaseFilterSet  # pragma: no cover
 
+# Maximum number of memoized orderings of OrderingFilter
+ORDERING_CACHE_SIZE = 256
+
+# Arguments which MethodFilter passes to a method if it accepts them
+METHOD_FILTER_PARAMS = ("query", "value", "values")
+
 
 class BaseFilter:
     """A Base class for all filters
@@ -77,13 +116,45 @@ class Filter(BaseFilter):
 
 
 class InFilter(Filter):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs, lookup_expr=sa_op.in_op)
+    def __init__(
+        self,
+        *args: Any,
+        as_array: bool = False,
+        temporary_table_threshold: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param as_array: Bind all values as a single array parameter,
+            so the statement has the same size for any number of values
+        :param temporary_table_threshold: Load values into a temporary table
+            when there are more values than threshold.
+            The table is created and dropped by FilterSet around query execution.
+        """
+        lookup_expr = in_array if as_array else in_values
+        super().__init__(*args, **kwargs, lookup_expr=lookup_expr)
+        self.temporary_table_threshold = temporary_table_threshold
+
+    def filter(self, query: Select, value: Any, values: Dict) -> Select:
+        threshold = self.temporary_table_threshold
+        if threshold is None:
+            return super().filter(query, value, values)
+        value = list(value)
+        if len(value) <= threshold:
+            return super().filter(query, value, values)
+        # The name is the same for every query, so the statement is cached,
+        # FilterSet renames tables of nested queries and of several filters
+        table = TemporaryValues("in_filter_values", self.field.type, value)
+        return self.strategy.filter(query, sa_op.in_op(self.field, sa.select(table.c.value)))
 
 
 class NotInFilter(Filter):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs, lookup_expr=sa_op.not_in_op)
+    def __init__(self, *args: Any, as_array: bool = False, **kwargs: Any) -> None:
+        """
+        :param as_array: Bind all values as a single array parameter,
+            so the statement has the same size for any number of values
+        """
+        lookup_expr = not_in_array if as_array else not_in_values
+        super().__init__(*args, **kwargs, lookup_expr=lookup_expr)
 
 
 class BooleanFilter(Filter):
@@ -99,6 +170,96 @@ class IsNullFilter(Filter):
         super().__init__(*args, **kwargs, lookup_expr=is_null)
 
 
+class ArrayOverlapFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: Array field of Model for filtration by any of values
+        """
+        super().__init__(*args, **kwargs, lookup_expr=array_overlap)
+
+
+class ArrayContainsFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: Array field of Model for filtration by all of values
+        """
+        super().__init__(*args, **kwargs, lookup_expr=array_contains)
+
+
+class ArrayContainedByFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: Array field of Model for filtration by items which are all in values
+        """
+        super().__init__(*args, **kwargs, lookup_expr=array_contained_by)
+
+
+class RangeOverlapFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: Range field of Model for filtration by overlap with a range
+            or with any of a list of ranges
+        """
+        super().__init__(*args, **kwargs, lookup_expr=range_overlap)
+
+
+class RangeContainsFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: Range field of Model for filtration by containment of a range
+            or of all ranges of a list
+        """
+        super().__init__(*args, **kwargs, lookup_expr=range_contains)
+
+
+class RangeContainedByFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: Range or scalar field of Model for filtration by being within a range
+            or within one of a list of ranges
+        """
+        super().__init__(*args, **kwargs, lookup_expr=range_contained_by)
+
+
+class RangeAdjacentFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: Range field of Model for filtration by adjacency to a range
+        """
+        super().__init__(*args, **kwargs, lookup_expr=range_adjacent)
+
+
+class JsonContainsFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: JSON field of Model for filtration by containment of a JSON document
+        """
+        super().__init__(*args, **kwargs, lookup_expr=json_contains)
+
+
+class JsonHasKeyFilter(Filter):
+    def __init__(self, *args: Any, any_key: bool = False, **kwargs: Any) -> None:
+        """
+        :param field: JSON field of Model for filtration by existence of top level keys
+        :param any_key: For a list of keys check that any of them exists instead of all of them
+        """
+        lookup_expr = json_has_any_key if any_key else json_has_all_keys
+        super().__init__(*args, **kwargs, lookup_expr=lookup_expr)
+
+    def filter(self, query: Select, value: Any, values: Dict) -> Select:
+        if isinstance(value, str):
+            return self.strategy.filter(query, json_has_key(self.field, value))
+        return super().filter(query, value, values)
+
+
+class JsonPathFilter(Filter):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        :param field: JSON field of Model for filtration by existence of an item matching jsonpath
+        """
+        super().__init__(*args, **kwargs, lookup_expr=json_path)
+
+
 class RangeFilter(BaseFilter):
     """Filter results by field within specified range"""
 
@@ -110,6 +271,9 @@ class RangeFilter(BaseFilter):
         right_lookup_expr: LookupExpr = op.le,
         logic_expr: Callable = sa.and_,
         strategy: Optional[BaseStrategy] = None,
+        prunable: bool = False,
+        partition_key: Optional[ModelAttribute] = None,
+        partition_key_lag: Tuple[Any, Any] = (None, None),
     ) -> None:
         """
         :param field: Filed of Model for filtration
@@ -118,14 +282,35 @@ class RangeFilter(BaseFilter):
         :param right_lookup_expr: Comparison operator for the right border of the range.
             default callable for comparison op: op.ge, op.gt, op.le, op.lt
         :param logic_expr: and/or operator to produce a conjunction of border expressions
+        :param prunable: Build borders which allow partition pruning at plan time:
+            values are converted to the type of field (timezone of datetimes, dates to datetimes),
+            borders are `field >= left AND field < right` when the next value of a border exists.
+            Requires op.ge/op.gt left, op.le/op.lt right lookups and sa.and_ logic
+        :param partition_key: Partition key correlated with field, it gets the same borders
+            shifted by partition_key_lag. Requires prunable
+        :param partition_key_lag: Maximum differences
+            (field - partition_key, partition_key - field),
+            e.g. (timedelta(0), timedelta(days=1)) when a row is partitioned by its creation time
+            and created within a day after field
         """
         super().__init__()
+        if prunable and not (
+            left_lookup_expr in (op.ge, op.gt)
+            and right_lookup_expr in (op.le, op.lt)
+            and logic_expr is sa.and_
+        ):
+            raise ValueError("Prunable range requires op.ge/op.gt, op.le/op.lt and sa.and_")
+        if partition_key is not None and not prunable:
+            raise ValueError("Partition key requires prunable range")
 
         self.field = field
         self.left_lookup_expr = left_lookup_expr
         self.right_lookup_expr = right_lookup_expr
         self.logic_expr = logic_expr
         self.strategy = strategy if strategy is not None else BaseStrategy()
+        self.prunable = prunable
+        self.partition_key = partition_key
+        self.partition_key_lag = partition_key_lag
 
     def filter(
         self, query: Select, value: Optional[Tuple[Any, Any]], values: Dict[str, Any]
@@ -142,6 +327,9 @@ class RangeFilter(BaseFilter):
             return query
 
         left_value, right_value = value
+        if self.prunable:
+            return self.strategy.filter(query, self._prunable_expression(left_value, right_value))
+
         expressions = []
         if left_value is not None:
             expressions.append(self.left_lookup_expr(self.field, left_value))
@@ -149,10 +337,71 @@ class RangeFilter(BaseFilter):
             expressions.append(self.right_lookup_expr(self.field, right_value))
         return self.strategy.filter(query, self.logic_expr(*expressions))
 
+    def _prunable_expression(self, left_value: Any, right_value: Any) -> ColumnElement:
+        """Build borders of field and partition key as `>= AND <` when it's possible"""
+        left_lookup_expr, right_lookup_expr = self.left_lookup_expr, self.right_lookup_expr
+        left_value = _to_column_type(self.field.type, left_value)
+        right_value = _to_column_type(self.field.type, right_value)
+        if left_value is not None and left_lookup_expr is op.gt:
+            next_value = _get_next_value(self.field.type, left_value)
+            if next_value is not None:
+                left_lookup_expr, left_value = op.ge, next_value
+        if right_value is not None and right_lookup_expr is op.le:
+            next_value = _get_next_value(self.field.type, right_value)
+            if next_value is not None:
+                right_lookup_expr, right_value = op.lt, next_value
+
+        expressions = []
+        if left_value is not None:
+            expressions.append(left_lookup_expr(self.field, left_value))
+        if right_value is not None:
+            expressions.append(right_lookup_expr(self.field, right_value))
+        if self.partition_key is not None:
+            key_type = self.partition_key.type
+            before, after = self.partition_key_lag
+            if left_value is not None:
+                key_left = left_value - before if before is not None else left_value
+                expressions.append(
+                    left_lookup_expr(self.partition_key, _to_column_type(key_type, key_left))
+                )
+            if right_value is not None:
+                key_right = right_value + after if after is not None else right_value
+                expressions.append(
+                    right_lookup_expr(self.partition_key, _to_column_type(key_type, key_right))
+                )
+        return sa.and_(*expressions)
+
+
+def _to_column_type(type_: Any, value: Any) -> Any:
+    """Convert date and datetime values to a datetime with timezone of a DateTime column.
+    Aware values are converted to UTC for columns without timezone
+    """
+    if not isinstance(type_, sa.DateTime) or not isinstance(value, datetime.date):
+        return value
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    if type_.timezone and value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    if not type_.timezone and value.tzinfo is not None:
+        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _get_next_value(type_: Any, value: Any) -> Any:
+    """Get the least value of a column greater than value, None if it's unknown"""
+    if isinstance(type_, sa.Integer) and isinstance(value, int) and not isinstance(value, bool):
+        return value + 1
+    if isinstance(type_, sa.DateTime) and isinstance(value, datetime.datetime):
+        return value + datetime.timedelta(microseconds=1)
+    if isinstance(type_, sa.Date) and type(value) is datetime.date:
+        return value + datetime.timedelta(days=1)
+    return None
+
 
 class OrderingField(NamedTuple):
     field: ModelAttribute
     nulls: Optional[NullsPosition] = None
+    strategy: Optional[BaseStrategy] = None
 
     def build_sqlalchemy_field(self, reverse: bool) -> ColumnElement:
         """Build sqlalchemy ordering field
@@ -162,7 +411,10 @@ class OrderingField(NamedTuple):
 
         :returns: sqlalchemy ordering field
         """
-        field = self.field.asc() if not reverse else self.field.desc()
+        field = self.field
+        if self.strategy is not None:
+            field = self.strategy.ordering_field(field, reverse)
+        field = field.asc() if not reverse else field.desc()
 
         if self.nulls == NullsPosition.first:
             field = field.nullsfirst()
@@ -186,6 +438,14 @@ class OrderingFilter(BaseFilter):
         """
         super().__init__()
         self.fields: Dict[str, OrderingField] = fields
+        self._ordering_elements: Dict[Tuple[str, bool], ColumnElement] = {
+            (name, reverse): field.build_sqlalchemy_field(reverse)
+            for name, field in fields.items()
+            for reverse in (False, True)
+        }
+        self._get_ordering = functools.lru_cache(maxsize=ORDERING_CACHE_SIZE)(
+            self._get_sqlalchemy_fields
+        )
 
     def filter(self, query: Select, value: Sequence[str], values: Dict[str, Any]) -> Select:
         """Apply ordering to a query instance
@@ -206,21 +466,31 @@ class OrderingFilter(BaseFilter):
         if not value:
             return query
 
-        ordering_fields = self._get_sqlalchemy_fields(value)
+        ordering_fields, strategies = self._get_ordering(tuple(value))
+        for strategy in strategies:
+            query = strategy.apply_ordering_join(query)
         if ordering_fields:
             query = query.order_by(*ordering_fields)
         return query
 
-    def _get_sqlalchemy_fields(self, params: Sequence[str]) -> List[ColumnElement]:
+    def _get_sqlalchemy_fields(
+        self, params: Sequence[str]
+    ) -> Tuple[Tuple[ColumnElement, ...], Tuple[BaseStrategy, ...]]:
+        """Get precomputed ordering elements of params and strategies of their fields,
+        memoized by params
+        """
         sqlalchemy_fields = []
+        strategies = []
         for param in params:
             reverse, param = self._parse_param(param)
 
             if not param or param not in self.fields:
                 continue
-            ordering: OrderingField = self.fields[param]
-            sqlalchemy_fields.append(ordering.build_sqlalchemy_field(reverse))
-        return sqlalchemy_fields
+            sqlalchemy_fields.append(self._ordering_elements[param, reverse])
+            strategy = self.fields[param].strategy
+            if strategy is not None and strategy not in strategies:
+                strategies.append(strategy)
+        return tuple(sqlalchemy_fields), tuple(strategies)
 
     @staticmethod
     def _parse_param(param: str) -> Tuple[bool, str]:
@@ -231,6 +501,15 @@ class OrderingFilter(BaseFilter):
 class LimitOffsetFilter(BaseFilter):
     """Filter for managing limit and offset"""
 
+    def __init__(self, *, deferred_join: bool = False) -> None:
+        """
+        :param deferred_join: FilterSet selects primary keys of a page first
+            and then fetches entities by them, so deep offsets skip only keys instead of full rows.
+            Used when the query selects a single mapped entity
+        """
+        super().__init__()
+        self.deferred_join = deferred_join
+
     def filter(
         self,
         query: Select,
@@ -259,15 +538,23 @@ class LimitOffsetFilter(BaseFilter):
 class MethodFilter(BaseFilter):
     """This helper is used to override Filter.filter() when a 'method' argument
     is passed. It proxies the call to the actual method on the filter's parent filterset.
+    Methods of AsyncFilterSet may be coroutines, they are called by filter_async
+    from afilter_query and other coroutine query methods of AsyncFilterSet.
     """
 
-    def __init__(self, method: str) -> None:
+    def __init__(self, method: str, *, concurrent: bool = False) -> None:
         """
         :param method: Method name in parent FilterSet
+        :param concurrent: Await the coroutine method concurrently with other concurrent methods.
+            Such methods must not use the session of FilterSet,
+            as a session does not support concurrent operations
         """
         super().__init__()
         self.method = method
+        self.concurrent = concurrent
         self._filter: Optional[Callable] = None
+        self._params: Tuple[str, ...] = ()
+        self.is_async = False
 
     @property
     def filter_set(self) -> Optional["BaseFilterSet"]:
@@ -280,18 +567,38 @@ class MethodFilter(BaseFilter):
         self.init_filter_method()
 
     def init_filter_method(self) -> None:
-        from sqlalchemy_filterset.filtersets import BaseFilterSet
+        from sqlalchemy_filterset.filtersets import AsyncFilterSet, BaseFilterSet
 
         assert isinstance(self.filter_set, BaseFilterSet)
         assert hasattr(self.filter_set, self.method)
         self._filter = getattr(self.filter_set, self.method)
+        self._params = _get_method_params(getattr(self._filter, "__func__", self._filter))
+        self.is_async = inspect.iscoroutinefunction(self._filter)
+        assert not self.is_async or isinstance(self.filter_set, AsyncFilterSet)
 
     def filter(self, query: Select, value: Any, values: Dict[str, Any]) -> Select:
+        assert not self.is_async
+        return self._call(query, value, values)
+
+    def filter_async(self, query: Select, value: Any, values: Dict[str, Any]) -> Awaitable[Select]:
+        """Apply filtering by a coroutine method to a query instance"""
+        assert self.is_async
+        return self._call(query, value, values)
+
+    def _call(self, query: Select, value: Any, values: Dict[str, Any]) -> Any:
         assert self._filter
         params = {"query": query, "value": value, "values": values}
-        attrs = inspect.getfullargspec(self._filter).args
-        required_attrs = {k: v for k, v in params.items() if k in attrs}
-        return self._filter(**required_attrs)
+        return self._filter(**{name: params[name] for name in self._params})
+
+
+@functools.lru_cache(maxsize=None)
+def _get_method_params(method: Callable) -> Tuple[str, ...]:
+    """Get arguments of METHOD_FILTER_PARAMS which method accepts, all of them for **kwargs"""
+    spec = inspect.getfullargspec(method)
+    if spec.varkw is not None:
+        return METHOD_FILTER_PARAMS
+    accepted = set(spec.args) | set(spec.kwonlyargs)
+    return tuple(name for name in METHOD_FILTER_PARAMS if name in accepted)
 
 
 class SearchFilter(BaseFilter):
@@ -302,16 +609,24 @@ class SearchFilter(BaseFilter):
         *fields: ModelAttribute,
         lookup_expr: LookupExpr = icontains,
         logic_expr: Callable = sa.or_,
+        rank_expr: Optional[LookupExpr] = None,
+        tokenize: bool = False,
     ) -> None:
         """
         :param fields: Fields for search
         :param search_type: Type of search
         :param search_expr: and/or operator to produce a conjunction of search expressions
+        :param rank_expr: Ordering expression by relevance of a field to a search string,
+            e.g. full_text_rank. Results are not ordered by default
+        :param tokenize: Split a search string by whitespaces and search every token,
+            all tokens must be found
         """
         super().__init__()
         self.fields = fields
         self.lookup_expr = lookup_expr
         self.logic_expr = logic_expr
+        self.rank_expr = rank_expr
+        self.tokenize = tokenize
 
     def filter(self, query: Select, value: Optional[str], values: Dict[str, Any]) -> Select:
         """Apply search to a query instance
@@ -325,7 +640,15 @@ class SearchFilter(BaseFilter):
         if not value:
             return query
 
-        expressions = []
-        for field in self.fields:
-            expressions.append(self.lookup_expr(field, value))
-        return query.where(self.logic_expr(*expressions))
+        tokens = value.split() if self.tokenize else [value]
+        if not tokens:
+            return query
+
+        for token in tokens:
+            expressions = []
+            for field in self.fields:
+                expressions.append(self.lookup_expr(field, token))
+            query = query.where(self.logic_expr(*expressions))
+        if self.rank_expr is not None:
+            query = query.order_by(*(self.rank_expr(field, value) for field in self.fields))
+        return query
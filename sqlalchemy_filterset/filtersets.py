@@ -1,14 +1,43 @@
 import abc
+import asyncio
 import copy
 from collections import OrderedDict
-from typing import Any, Dict, Generic, Sequence, TypeVar
+from contextlib import asynccontextmanager, contextmanager, suppress
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    Generator,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import Select
+from sqlalchemy.orm import Mapper, Session
+from sqlalchemy.sql import Delete, Select, Update, visitors
 
-from sqlalchemy_filterset.filters import BaseFilter
+from sqlalchemy_filterset.elements import TemporaryValues
+from sqlalchemy_filterset.filters import BaseFilter, LimitOffsetFilter, MethodFilter, RangeFilter
+from sqlalchemy_filterset.operators import histogram_bucket
+from sqlalchemy_filterset.planner import (
+    is_statically_empty,
+    joins_to_exists,
+    merge_query,
+    normalize_where,
+    plan_joins,
+)
+from sqlalchemy_filterset.strategies import AutoStrategy, BaseStrategy, SubqueryExistsStrategy
 
 
 class FilterSetMetaclass(abc.ABCMeta):
@@ -42,6 +71,15 @@ class FilterSetMetaclass(abc.ABCMeta):
 
 Model = TypeVar("Model")
 
+# Execution options of update and delete: objects in session are not synchronized,
+# as criteria with subqueries can not be evaluated in Python
+DML_OPTIONS = {"synchronize_session": False}
+
+# Key of connection info with names of temporary tables of statements being executed
+TEMPORARY_TABLES_KEY = "sqlalchemy_filterset_temporary_tables"
+
+Statement = TypeVar("Statement", Select, Update, Delete)
+
 
 class BaseFilterSet(Generic[Model], metaclass=FilterSetMetaclass):
     declared_filters: Dict[str, BaseFilter]
@@ -72,11 +110,103 @@ class BaseFilterSet(Generic[Model], metaclass=FilterSetMetaclass):
             if name not in self.filters:
                 continue
             query = self.filters[name].filter(query, value, params)
-        return query
+        return self._plan_query(query)
+
+    def _plan_query(self, query: Select) -> Select:
+        """Normalize where criteria and plan joins which filters added to the base query"""
+        query = normalize_where(query, self.__base_query)
+        return plan_joins(query, self.__base_query)
 
     def count_query(self, params: Dict) -> Select:
         """Build query for calculating the total number of filtration results"""
-        query = self.filter_query(params).limit(None).offset(None)
+        return self._count_query(self.filter_query(params))
+
+    def exists_query(self, params: Dict) -> Select:
+        """Build query for checking that there are filtration results"""
+        return self._exists_query(self.filter_query(params))
+
+    def facets_query(self, params: Dict, facets: Dict[str, Any]) -> Select:
+        """Build query counting filtration results by several facets at once
+
+        The query uses GROUPING SETS and FILTER clauses of aggregates, which requires PostgreSQL.
+
+        :param params: Filtration params
+        :param facets: Expressions to group results by, keyed by facet names.
+            Counts of a facet are not filtered by the filter of the same name
+        """
+        common_params = {name: value for name, value in params.items() if name not in facets}
+        faceted = {
+            name: self.filters[name].filter(self.get_base_query(), value, params)
+            for name, value in params.items()
+            if name in facets and name in self.filters
+        }
+        return self._facets_query(self.filter_query(common_params), faceted, facets)
+
+    def histogram_query(
+        self, params: Dict, name: str, bounds: Tuple[Any, Any], buckets: int
+    ) -> Select:
+        """Build query counting filtration results by equal width buckets of a RangeFilter field
+
+        :param params: Filtration params, the RangeFilter itself is not applied
+        :param name: Name of RangeFilter
+        :param bounds: Lower (inclusive) and upper (exclusive) bounds of buckets
+        :param buckets: Number of buckets
+        """
+        common_params = {key: value for key, value in params.items() if key != name}
+        return self._histogram_query(self.filter_query(common_params), name, bounds, buckets)
+
+    def distinct_values_query(
+        self,
+        params: Dict,
+        name: str,
+        prefix: Optional[str] = None,
+        limit: int = 50,
+        loose_index_scan: bool = False,
+    ) -> Select:
+        """Build query for distinct values of a filter field, e.g. for autocomplete
+
+        :param params: Filtration params, the filter itself is not applied
+        :param name: Name of filter with field
+        :param prefix: Prefix of values
+        :param limit: Maximum number of values
+        :param loose_index_scan: Get values by recursive query which jumps
+            from one value to the next one, it is fast with an index on the field
+            when there are few distinct values in a lot of rows
+        """
+        common_params = {key: value for key, value in params.items() if key != name}
+        query = self.filter_query(common_params)
+        return self._distinct_values_query(query, name, prefix, limit, loose_index_scan)
+
+    def aggregate_query(self, params: Dict, **aggregates: Any) -> Select:
+        """Build query calculating aggregates over filtration results
+
+        :param params: Filtration params
+        :param aggregates: Aggregate expressions over columns of the base query, keyed by names
+        """
+        return self._aggregate_query(self.filter_query(params), aggregates)
+
+    def ids_query(self, params: Dict) -> Select:
+        """Build filtration query selecting only primary keys of the base query entity"""
+        return self._primary_keys_query(self.filter_query(params))
+
+    def update_query(self, params: Dict, values: Dict[str, Any]) -> Update:
+        """Build query updating filtration results by one statement
+
+        :param params: Filtration params, ordering and pagination are ignored
+        :param values: New values of columns of the base query entity
+        """
+        return self._update_query(self.filter_query(params), values)
+
+    def delete_query(self, params: Dict) -> Delete:
+        """Build query deleting filtration results by one statement
+
+        :param params: Filtration params, ordering and pagination are ignored
+        """
+        return self._delete_query(self.filter_query(params))
+
+    @staticmethod
+    def _count_query(query: Select) -> Select:
+        query = query.limit(None).offset(None)
         cnt = sa.func.count(sa.literal_column("1"))
         if query._distinct and not query._distinct_on:
             query = sa.select(cnt).select_from(query.order_by(None).subquery())
@@ -86,6 +216,272 @@ class BaseFilterSet(Generic[Model], metaclass=FilterSetMetaclass):
             query = query.order_by(None).with_only_columns(cnt, maintain_column_froms=True)
         return query
 
+    @staticmethod
+    def _exists_query(query: Select) -> Select:
+        return sa.select(query.limit(None).offset(None).order_by(None).exists())
+
+    def _aggregate_query(self, query: Select, aggregates: Dict[str, Any]) -> Select:
+        """Calculate aggregates over results of query
+
+        When query is distinct or filters joined other tables, rows of the base query
+        may be repeated, so aggregates are calculated over rows selected by primary keys.
+        """
+        base_query = self.__base_query
+        query = query.limit(None).offset(None).order_by(None)
+        columns = [expression.label(name) for name, expression in aggregates.items()]
+        if not query._distinct and len(query._setup_joins) == len(base_query._setup_joins):
+            return query.with_only_columns(*columns, maintain_column_froms=True)
+
+        mapper = self._get_base_mapper()
+        if mapper is None:
+            raise ValueError(
+                "Aggregates of distinct or joined results require a base query of one entity"
+            )
+        ids = self._ids_query(query, mapper)
+        key = self._get_primary_key(mapper)
+        froms = base_query.get_final_froms()
+        return sa.select(*columns).select_from(*froms).where(key.in_(ids))
+
+    def _primary_keys_query(self, query: Select) -> Select:
+        """Build query selecting primary keys of filtration results
+
+        ORDER BY of SELECT DISTINCT may refer only to selected columns,
+        so rows of distinct queries are grouped by primary keys instead:
+        other columns of the base entity are functionally dependent on them.
+        """
+        mapper = self._get_base_mapper()
+        if mapper is None:
+            raise ValueError("Primary keys require a base query of one entity")
+        ids = self._ids_query(query, mapper)
+        if query._distinct and not query._distinct_on:
+            ids._distinct = False
+            ids = ids.group_by(*mapper.primary_key)
+        return ids
+
+    def _update_query(self, query: Select, values: Dict[str, Any]) -> Update:
+        mapper, criteria = self._get_dml_criteria(query)
+        return sa.update(mapper).where(*criteria).values(values)
+
+    def _delete_query(self, query: Select) -> Delete:
+        mapper, criteria = self._get_dml_criteria(query)
+        return sa.delete(mapper).where(*criteria)
+
+    def _get_dml_criteria(self, query: Select) -> Tuple[Mapper, List[Any]]:
+        """Get the base query entity and where criteria selecting results of query
+
+        Joins added by filters are rewritten to EXISTS, when it is not possible
+        (outer joins or joins of the base query) results are selected by primary keys.
+        """
+        mapper = self._get_base_mapper()
+        if mapper is None:
+            raise ValueError("Update and delete require a base query of one entity")
+        criteria = joins_to_exists(query, self.__base_query)
+        if criteria is None:
+            ids = self._ids_query(query.limit(None).offset(None).order_by(None), mapper)
+            criteria = [self._get_primary_key(mapper).in_(ids)]
+        return mapper, criteria
+
+    def _facets_query(
+        self, query: Select, faceted: Dict[str, Select], facets: Dict[str, Any]
+    ) -> Select:
+        """Count results of query by grouping sets of facets
+
+        Where criteria of faceted filters are moved to FILTER clauses of counts of other facets,
+        their joins are added to query.
+
+        :param faceted: Base queries filtered by faceted filters, keyed by facet names
+        """
+        base_query = self.__base_query
+        common_criteria = query._where_criteria
+        facet_criteria: Dict[str, Sequence[Any]] = {}
+        for name, filtered in faceted.items():
+            facet_criteria[name] = filtered._where_criteria[len(base_query._where_criteria) :]
+            query = merge_query(query, base_query, filtered)
+        query = query._generate()
+        query._where_criteria = common_criteria
+        query = plan_joins(query, base_query)
+
+        expressions = list(facets.values())
+        columns: List[Any] = [sa.func.grouping(*expressions)]
+        for name, expression in facets.items():
+            criteria = [
+                criterion
+                for other, other_criteria in facet_criteria.items()
+                if other != name
+                for criterion in other_criteria
+            ]
+            count = sa.func.count(sa.literal_column("1"))
+            columns.extend([expression, count.filter(*criteria) if criteria else count])
+        return (
+            query.limit(None)
+            .offset(None)
+            .order_by(None)
+            .with_only_columns(*columns, maintain_column_froms=True)
+            .group_by(sa.func.grouping_sets(*expressions))
+        )
+
+    def _histogram_query(
+        self, query: Select, name: str, bounds: Tuple[Any, Any], buckets: int
+    ) -> Select:
+        """Count results of query by buckets of the field of RangeFilter"""
+        filter_ = self.filters.get(name)
+        if not isinstance(filter_, RangeFilter):
+            raise ValueError(f"{name} is not a RangeFilter")
+        lower, upper = bounds
+        if buckets < 1 or not lower < upper:
+            raise ValueError("Histogram requires lower < upper bounds and at least one bucket")
+
+        field = filter_.field
+        if not isinstance(field.type, (sa.Integer, sa.Numeric)):
+            raise ValueError(f"Histogram requires a numeric field, {name} is {field.type}")
+        bucket = histogram_bucket(field, lower, upper, buckets)
+        query = self._join_filter_field(query, filter_.strategy)
+        return (
+            query.where(field >= lower, field < upper)
+            .limit(None)
+            .offset(None)
+            .order_by(None)
+            .with_only_columns(
+                bucket, sa.func.count(sa.literal_column("1")), maintain_column_froms=True
+            )
+            .group_by(bucket)
+        )
+
+    def _join_filter_field(self, query: Select, strategy: BaseStrategy) -> Select:
+        """Join the model of a filter field to query to select the field
+
+        Exists strategies don't join the related model, so it is joined by their onclause.
+        """
+        exists_strategy = strategy.strategy if isinstance(strategy, AutoStrategy) else strategy
+        if isinstance(exists_strategy, SubqueryExistsStrategy):
+            query = query.join(exists_strategy.model, exists_strategy.onclause)
+        else:
+            query = strategy.apply_join(query)
+        return plan_joins(query, self.__base_query)
+
+    def _distinct_values_query(
+        self,
+        query: Select,
+        name: str,
+        prefix: Optional[str],
+        limit: int,
+        loose_index_scan: bool,
+    ) -> Select:
+        """Select ordered distinct values of the filter field from results of query"""
+        filter_ = self.filters.get(name)
+        field = getattr(filter_, "field", None)
+        strategy = getattr(filter_, "strategy", None)
+        if field is None or strategy is None:
+            raise ValueError(f"{name} is not a filter with field")
+
+        query = self._join_filter_field(query, strategy)
+        query = query.where(field.is_not(None)).limit(None).offset(None).order_by(None)
+        if prefix is not None:
+            query = query.where(field.startswith(prefix, autoescape=True))
+        if not loose_index_scan:
+            return (
+                query.with_only_columns(field, maintain_column_froms=True)
+                .distinct()
+                .order_by(field)
+                .limit(limit)
+            )
+
+        first = query.with_only_columns(
+            sa.func.min(field).label("value"), maintain_column_froms=True
+        )
+        values = first.cte("distinct_values", recursive=True)
+        following = (
+            query.with_only_columns(sa.func.min(field), maintain_column_froms=True)
+            .where(field > values.c.value)
+            .scalar_subquery()
+        )
+        values = values.union_all(sa.select(following).where(values.c.value.is_not(None)))
+        return sa.select(values.c.value).where(values.c.value.is_not(None)).limit(limit)
+
+    @staticmethod
+    def _histogram_result(
+        rows: Sequence[Any], bounds: Tuple[Any, Any], buckets: int
+    ) -> List[Tuple[Any, Any, int]]:
+        """Get (lower, upper, count) of every bucket from rows of histogram query"""
+        counts = {bucket: count for bucket, count in rows}
+        lower, upper = bounds
+        borders = [lower + (upper - lower) * index / buckets for index in range(buckets)]
+        borders.append(upper)
+        return [
+            (borders[index], borders[index + 1], counts.get(index + 1, 0))
+            for index in range(buckets)
+        ]
+
+    @staticmethod
+    def _facets_result(rows: Sequence[Any], facets: Dict[str, Any]) -> Dict[str, Dict[Any, int]]:
+        """Get counts of values by facet names from rows of facets query, zero counts are omitted"""
+        result: Dict[str, Dict[Any, int]] = {name: {} for name in facets}
+        for row in rows:
+            grouping = row[0]
+            for index, name in enumerate(facets):
+                count = row[index * 2 + 2]
+                if not grouping & (1 << (len(facets) - index - 1)) and count:
+                    result[name][row[index * 2 + 1]] = count
+        return result
+
+    def _get_deferred_join_mapper(self, query: Select, params: Dict) -> Optional[Mapper]:
+        """Get mapper of the entity selected by the base query
+        if pagination with deferred join is requested
+
+        Distinct queries are not deferred: ORDER BY of SELECT DISTINCT may refer
+        only to selected columns, which are replaced by primary keys.
+        """
+        if query._distinct:
+            return None
+        if not any(
+            isinstance(filter_, LimitOffsetFilter) and filter_.deferred_join and params.get(name)
+            for name, filter_ in self.filters.items()
+        ):
+            return None
+        return self._get_base_mapper()
+
+    def _get_base_mapper(self) -> Optional[Mapper]:
+        """Get mapper of the entity selected by the base query"""
+        descriptions = self.__base_query.column_descriptions
+        if len(descriptions) != 1:
+            return None
+        mapper = sa.inspect(descriptions[0]["expr"], raiseerr=False)
+        return mapper if isinstance(mapper, Mapper) else None
+
+    @staticmethod
+    def _ids_query(query: Select, mapper: Mapper) -> Select:
+        """Build query selecting primary keys of filtration results"""
+        return query.with_only_columns(*mapper.primary_key, maintain_column_froms=True)
+
+    @staticmethod
+    def _get_id(row: Any) -> Any:
+        """Get primary key from row of ids query, tuple for a composite primary key"""
+        return row[0] if len(row) == 1 else tuple(row)
+
+    @staticmethod
+    def _get_primary_key(mapper: Mapper) -> Any:
+        """Get expression of primary key columns of mapper"""
+        if len(mapper.primary_key) == 1:
+            return mapper.primary_key[0]
+        return sa.tuple_(*mapper.primary_key)
+
+    def _entities_query(self, mapper: Mapper, ids: Sequence[Any]) -> Select:
+        """Build query selecting entities by primary keys"""
+        query = self.get_base_query().limit(None).offset(None).order_by(None)
+        if len(mapper.primary_key) == 1:
+            return query.where(mapper.primary_key[0].in_([id_ for id_, in ids]))
+        return query.where(sa.tuple_(*mapper.primary_key).in_([tuple(id_) for id_ in ids]))
+
+    @staticmethod
+    def _restore_order(
+        mapper: Mapper, entities: Sequence[Model], ids: Sequence[Any]
+    ) -> Sequence[Model]:
+        """Sort entities in the order of their primary keys"""
+        positions = {tuple(id_): position for position, id_ in enumerate(ids)}
+        return sorted(
+            entities, key=lambda entity: positions[tuple(mapper.primary_key_from_instance(entity))]
+        )
+
 
 class FilterSet(BaseFilterSet[Model]):
     def __init__(
@@ -102,11 +498,146 @@ class FilterSet(BaseFilterSet[Model]):
 
     def filter(self, params: Dict) -> Sequence[Model]:
         """Get filtration results"""
-        return self.session.execute(self.filter_query(params)).unique().scalars().all()
+        query = self.filter_query(params)
+        if is_statically_empty(query):
+            return []
+        mapper = self._get_deferred_join_mapper(query, params)
+        with self._temporary_tables(query) as query:
+            if mapper is None:
+                return self.session.execute(query).unique().scalars().all()
+            ids = self.session.execute(self._ids_query(query, mapper)).all()
+        if not ids:
+            return []
+        entities_query = self._entities_query(mapper, ids)
+        entities = self.session.execute(entities_query).unique().scalars().all()
+        return self._restore_order(mapper, entities, ids)
+
+    def filter_ids(self, params: Dict) -> Sequence[Any]:
+        """Get primary keys of filtration results without loading entities"""
+        query = self.ids_query(params)
+        if is_statically_empty(query):
+            return []
+        with self._temporary_tables(query) as query:
+            return [self._get_id(row) for row in self.session.execute(query)]
+
+    def stream_ids(self, params: Dict, batch_size: int = 1000) -> Generator[Any, None, None]:
+        """Iterate over primary keys of filtration results fetched by batches
+
+        :param params: Filtration params
+        :param batch_size: Number of rows fetched at once
+        """
+        query = self.ids_query(params)
+        if is_statically_empty(query):
+            return
+        with self._temporary_tables(query) as query:
+            result = self.session.execute(query, execution_options={"yield_per": batch_size})
+            try:
+                for row in result:
+                    yield self._get_id(row)
+            finally:
+                result.close()
 
     def count(self, params: Dict) -> int:
         """Calculating the total number of filtration results"""
-        return self.session.execute(self.count_query(params)).scalar()  # type: ignore
+        query = self.filter_query(params)
+        if is_statically_empty(query):
+            return 0
+        query = self._count_query(query)
+        with self._temporary_tables(query) as query:
+            return self.session.execute(query).scalar()  # type: ignore
+
+    def exists(self, params: Dict) -> bool:
+        """Check that there are filtration results"""
+        query = self.filter_query(params)
+        if is_statically_empty(query):
+            return False
+        query = self._exists_query(query)
+        with self._temporary_tables(query) as query:
+            return bool(self.session.execute(query).scalar())
+
+    def aggregate(self, params: Dict, **aggregates: Any) -> Dict[str, Any]:
+        """Calculate aggregates over filtration results by one query
+
+        :returns: Values of aggregates by their names
+        """
+        query = self.aggregate_query(params, **aggregates)
+        with self._temporary_tables(query) as query:
+            return dict(self.session.execute(query).one()._mapping)
+
+    def update(self, params: Dict, values: Dict[str, Any]) -> int:
+        """Update filtration results by one statement
+
+        :returns: Number of updated rows
+        """
+        query = self.filter_query(params)
+        if is_statically_empty(query):
+            return 0
+        statement = self._update_query(query, values)
+        with self._temporary_tables(statement) as statement:
+            result = self.session.execute(statement, execution_options=DML_OPTIONS)
+        return result.rowcount
+
+    def delete(self, params: Dict) -> int:
+        """Delete filtration results by one statement
+
+        :returns: Number of deleted rows
+        """
+        query = self.filter_query(params)
+        if is_statically_empty(query):
+            return 0
+        statement = self._delete_query(query)
+        with self._temporary_tables(statement) as statement:
+            result = self.session.execute(statement, execution_options=DML_OPTIONS)
+        return result.rowcount
+
+    def facets(self, params: Dict, facets: Dict[str, Any]) -> Dict[str, Dict[Any, int]]:
+        """Count filtration results by values of several facets at once"""
+        query = self.facets_query(params, facets)
+        with self._temporary_tables(query) as query:
+            return self._facets_result(self.session.execute(query).all(), facets)
+
+    def histogram(
+        self, params: Dict, name: str, bounds: Tuple[Any, Any], buckets: int
+    ) -> List[Tuple[Any, Any, int]]:
+        """Count filtration results by equal width buckets of a RangeFilter field
+
+        :returns: Lower and upper borders and count of every bucket
+        """
+        query = self.histogram_query(params, name, bounds, buckets)
+        with self._temporary_tables(query) as query:
+            return self._histogram_result(self.session.execute(query).all(), bounds, buckets)
+
+    def distinct_values(
+        self,
+        params: Dict,
+        name: str,
+        prefix: Optional[str] = None,
+        limit: int = 50,
+        loose_index_scan: bool = False,
+    ) -> Sequence[Any]:
+        """Get ordered distinct values of a filter field for filtration results"""
+        query = self.distinct_values_query(params, name, prefix, limit, loose_index_scan)
+        with self._temporary_tables(query) as query:
+            return self.session.execute(query).scalars().all()
+
+    @contextmanager
+    def _temporary_tables(self, statement: Statement) -> Iterator[Statement]:
+        """Create temporary tables required by statement and drop them after execution
+
+        Yields the statement referring to the created tables.
+        """
+        connection = self.session.connection()
+        names = connection.info.setdefault(TEMPORARY_TABLES_KEY, set())
+        statement, tables = _get_temporary_values(statement, names)
+        names.update(values.name for values in tables)
+        try:
+            for values in tables:
+                _create_temporary_table(connection, values)
+            yield statement
+        finally:
+            for values in tables:
+                _drop_temporary_table(connection, values)
+            names.difference_update(values.name for values in tables)
 
 
 class AsyncFilterSet(BaseFilterSet[Model]):
@@ -122,10 +653,313 @@ class AsyncFilterSet(BaseFilterSet[Model]):
         self.session = session
         super().__init__(query)
 
+    async def afilter_query(self, params: Dict) -> Select:
+        """Build filtration query
+
+        Filters with coroutine methods are awaited one by one in the order of params.
+        Concurrent ones are applied after other filters and awaited together,
+        each one gets the query built by other filters and may add where criteria,
+        joins and ordering to it.
+        """
+        query = self.get_base_query()
+        concurrent_filters: List[Tuple[MethodFilter, Any]] = []
+        for name, value in params.items():
+            if name not in self.filters:
+                continue
+            filter_ = self.filters[name]
+            if isinstance(filter_, MethodFilter) and filter_.is_async and filter_.concurrent:
+                concurrent_filters.append((filter_, value))
+                continue
+            query = await self._filter(filter_, query, value, params)
+
+        source = query
+        results = await asyncio.gather(
+            *(filter_.filter_async(source, value, params) for filter_, value in concurrent_filters)
+        )
+        for result in results:
+            query = merge_query(query, source, result)
+        return self._plan_query(query)
+
+    @staticmethod
+    async def _filter(filter_: BaseFilter, query: Select, value: Any, params: Dict) -> Select:
+        """Apply filter to query, awaiting a coroutine method of MethodFilter"""
+        if isinstance(filter_, MethodFilter) and filter_.is_async:
+            return await filter_.filter_async(query, value, params)
+        return filter_.filter(query, value, params)
+
+    async def acount_query(self, params: Dict) -> Select:
+        """Build query for calculating the total number of filtration results"""
+        return self._count_query(await self.afilter_query(params))
+
+    async def aexists_query(self, params: Dict) -> Select:
+        """Build query for checking that there are filtration results"""
+        return self._exists_query(await self.afilter_query(params))
+
+    async def aaggregate_query(self, params: Dict, **aggregates: Any) -> Select:
+        """Build query calculating aggregates over filtration results"""
+        return self._aggregate_query(await self.afilter_query(params), aggregates)
+
+    async def aids_query(self, params: Dict) -> Select:
+        """Build filtration query selecting only primary keys of the base query entity"""
+        return self._primary_keys_query(await self.afilter_query(params))
+
+    async def aupdate_query(self, params: Dict, values: Dict[str, Any]) -> Update:
+        """Build query updating filtration results by one statement"""
+        return self._update_query(await self.afilter_query(params), values)
+
+    async def adelete_query(self, params: Dict) -> Delete:
+        """Build query deleting filtration results by one statement"""
+        return self._delete_query(await self.afilter_query(params))
+
+    async def afacets_query(self, params: Dict, facets: Dict[str, Any]) -> Select:
+        """Build query counting filtration results by several facets at once"""
+        common_params = {name: value for name, value in params.items() if name not in facets}
+        faceted = {
+            name: await self._filter(self.filters[name], self.get_base_query(), value, params)
+            for name, value in params.items()
+            if name in facets and name in self.filters
+        }
+        return self._facets_query(await self.afilter_query(common_params), faceted, facets)
+
+    async def ahistogram_query(
+        self, params: Dict, name: str, bounds: Tuple[Any, Any], buckets: int
+    ) -> Select:
+        """Build query counting filtration results by equal width buckets of a RangeFilter field"""
+        common_params = {key: value for key, value in params.items() if key != name}
+        query = await self.afilter_query(common_params)
+        return self._histogram_query(query, name, bounds, buckets)
+
+    async def adistinct_values_query(
+        self,
+        params: Dict,
+        name: str,
+        prefix: Optional[str] = None,
+        limit: int = 50,
+        loose_index_scan: bool = False,
+    ) -> Select:
+        """Build query for distinct values of a filter field, e.g. for autocomplete"""
+        common_params = {key: value for key, value in params.items() if key != name}
+        query = await self.afilter_query(common_params)
+        return self._distinct_values_query(query, name, prefix, limit, loose_index_scan)
+
     async def filter(self, params: Dict) -> Sequence[Model]:
         """Get filtration results"""
-        return (await self.session.execute(self.filter_query(params))).unique().scalars().all()
+        query = await self.afilter_query(params)
+        if is_statically_empty(query):
+            return []
+        mapper = self._get_deferred_join_mapper(query, params)
+        async with self._temporary_tables(query) as query:
+            if mapper is None:
+                return (await self.session.execute(query)).unique().scalars().all()
+            ids = (await self.session.execute(self._ids_query(query, mapper))).all()
+        if not ids:
+            return []
+        entities_query = self._entities_query(mapper, ids)
+        entities = (await self.session.execute(entities_query)).unique().scalars().all()
+        return self._restore_order(mapper, entities, ids)
+
+    async def filter_ids(self, params: Dict) -> Sequence[Any]:
+        """Get primary keys of filtration results without loading entities"""
+        query = await self.aids_query(params)
+        if is_statically_empty(query):
+            return []
+        async with self._temporary_tables(query) as query:
+            return [self._get_id(row) for row in await self.session.execute(query)]
+
+    async def stream_ids(self, params: Dict, batch_size: int = 1000) -> AsyncGenerator[Any, None]:
+        """Iterate over primary keys of filtration results fetched by batches
+
+        :param params: Filtration params
+        :param batch_size: Number of rows fetched at once
+        """
+        query = await self.aids_query(params)
+        if is_statically_empty(query):
+            return
+        async with self._temporary_tables(query, stream=True) as query:
+            options = {"yield_per": batch_size}
+            result = await self.session.stream(query, execution_options=options)
+            try:
+                async for row in result:
+                    yield self._get_id(row)
+            finally:
+                await result.close()
 
     async def count(self, params: Dict) -> int:
         """Calculating the total number of filtration results"""
-        return (await self.session.execute(self.count_query(params))).scalar()  # type: ignore
+        query = await self.afilter_query(params)
+        if is_statically_empty(query):
+            return 0
+        query = self._count_query(query)
+        async with self._temporary_tables(query) as query:
+            return (await self.session.execute(query)).scalar()  # type: ignore
+
+    async def exists(self, params: Dict) -> bool:
+        """Check that there are filtration results"""
+        query = await self.afilter_query(params)
+        if is_statically_empty(query):
+            return False
+        query = self._exists_query(query)
+        async with self._temporary_tables(query) as query:
+            return bool((await self.session.execute(query)).scalar())
+
+    async def aggregate(self, params: Dict, **aggregates: Any) -> Dict[str, Any]:
+        """Calculate aggregates over filtration results by one query
+
+        :returns: Values of aggregates by their names
+        """
+        query = await self.aaggregate_query(params, **aggregates)
+        async with self._temporary_tables(query) as query:
+            return dict((await self.session.execute(query)).one()._mapping)
+
+    async def update(self, params: Dict, values: Dict[str, Any]) -> int:
+        """Update filtration results by one statement
+
+        :returns: Number of updated rows
+        """
+        query = await self.afilter_query(params)
+        if is_statically_empty(query):
+            return 0
+        statement = self._update_query(query, values)
+        async with self._temporary_tables(statement) as statement:
+            result = await self.session.execute(statement, execution_options=DML_OPTIONS)
+        return result.rowcount
+
+    async def delete(self, params: Dict) -> int:
+        """Delete filtration results by one statement
+
+        :returns: Number of deleted rows
+        """
+        query = await self.afilter_query(params)
+        if is_statically_empty(query):
+            return 0
+        statement = self._delete_query(query)
+        async with self._temporary_tables(statement) as statement:
+            result = await self.session.execute(statement, execution_options=DML_OPTIONS)
+        return result.rowcount
+
+    async def facets(self, params: Dict, facets: Dict[str, Any]) -> Dict[str, Dict[Any, int]]:
+        """Count filtration results by values of several facets at once"""
+        query = await self.afacets_query(params, facets)
+        async with self._temporary_tables(query) as query:
+            return self._facets_result((await self.session.execute(query)).all(), facets)
+
+    async def histogram(
+        self, params: Dict, name: str, bounds: Tuple[Any, Any], buckets: int
+    ) -> List[Tuple[Any, Any, int]]:
+        """Count filtration results by equal width buckets of a RangeFilter field
+
+        :returns: Lower and upper borders and count of every bucket
+        """
+        query = await self.ahistogram_query(params, name, bounds, buckets)
+        async with self._temporary_tables(query) as query:
+            rows = (await self.session.execute(query)).all()
+        return self._histogram_result(rows, bounds, buckets)
+
+    async def distinct_values(
+        self,
+        params: Dict,
+        name: str,
+        prefix: Optional[str] = None,
+        limit: int = 50,
+        loose_index_scan: bool = False,
+    ) -> Sequence[Any]:
+        """Get ordered distinct values of a filter field for filtration results"""
+        query = await self.adistinct_values_query(params, name, prefix, limit, loose_index_scan)
+        async with self._temporary_tables(query) as query:
+            return (await self.session.execute(query)).scalars().all()
+
+    @asynccontextmanager
+    async def _temporary_tables(
+        self, statement: Statement, stream: bool = False
+    ) -> AsyncIterator[Statement]:
+        """Create temporary tables required by statement and drop them after execution
+
+        Yields the statement referring to the created tables.
+
+        :param stream: Statement is executed by a server side cursor. asyncpg keeps
+            the portal of the cursor open until the end of the transaction and the tables
+            can not be dropped while it's open, so the statement is executed in a savepoint
+            which is rolled back to close the portal.
+        """
+        connection = await self.session.connection()
+        names = connection.info.setdefault(TEMPORARY_TABLES_KEY, set())
+        statement, tables = _get_temporary_values(statement, names)
+        names.update(values.name for values in tables)
+        savepoint = None
+        try:
+            for values in tables:
+                await connection.run_sync(_create_temporary_table, values)
+            if stream and tables and connection.dialect.driver == "asyncpg":
+                savepoint = await connection.begin_nested()
+            yield statement
+        finally:
+            if savepoint is not None:
+                await savepoint.rollback()
+            for values in tables:
+                await connection.run_sync(_drop_temporary_table, values)
+            names.difference_update(values.name for values in tables)
+
+
+def _get_temporary_values(
+    statement: Statement, names: Set[str]
+) -> Tuple[Statement, List[TemporaryValues]]:
+    """Get values of temporary tables which statement refers to
+
+    Tables share the name of their filter, so statements are cached. When several tables
+    of statement or tables of an outer statement being executed have the same name,
+    the table is renamed with a numeric suffix and statement is rewritten to refer to it.
+
+    :param names: Names of tables of outer statements
+    """
+    tables: List[TemporaryValues] = []
+    for element in visitors.iterate(statement):
+        if isinstance(element, TemporaryValues) and all(element is not t for t in tables):
+            tables.append(element)
+    used = set(names)
+    renamed: Dict[TemporaryValues, TemporaryValues] = {}
+    for values in tables:
+        name, suffix = values.name, 0
+        while name in used:
+            suffix += 1
+            name = f"{values.name}_{suffix}"
+        used.add(name)
+        if name != values.name:
+            renamed[values] = TemporaryValues(name, values.value_type, values.values)
+    if not renamed:
+        return statement, tables
+
+    def replace(element: Any, **kw: Any) -> Any:
+        if isinstance(element, TemporaryValues):
+            return renamed.get(element)
+        if isinstance(element, sa.ColumnClause) and element.table in renamed:
+            return renamed[element.table].c[element.name]
+        return None
+
+    statement = cast(Statement, visitors.replacement_traverse(statement, {}, replace))
+    return statement, [renamed.get(values, values) for values in tables]
+
+
+def _create_temporary_table(connection: Connection, values: TemporaryValues) -> None:
+    """Create temporary table with values
+
+    Table is analyzed on postgresql, so the planner knows the number of values.
+    A table of a transaction is dropped at its end on postgresql in case
+    the transaction fails before the table is dropped.
+    """
+    table = values.to_table(on_commit_drop=not connection._is_autocommit_isolation())
+    table.create(connection)
+    if values.values:
+        connection.execute(table.insert(), [{"value": value} for value in values.values])
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            sa.text(f"ANALYZE {connection.dialect.identifier_preparer.quote(table.name)}")
+        )
+
+
+def _drop_temporary_table(connection: Connection, values: TemporaryValues) -> None:
+    """Drop temporary table
+
+    The table can not be dropped in a failed transaction, then it's dropped by rollback.
+    """
+    with suppress(DBAPIError):
+        values.to_table().drop(connection)
@@ -1,17 +1,538 @@
-from typing import Any
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql import ColumnElement
 from sqlalchemy.sql import operators as sa_op
 
+from sqlalchemy_filterset.elements import DialectCase, JsonArray, Unsupported
 from sqlalchemy_filterset.types import ModelAttribute
 
+# Escape character of LIKE patterns built from search values
+LIKE_ESCAPE = "/"
+
+# Maximum number of values of a single IN operator by dialect name
+IN_VALUES_LIMITS = {"postgresql": 32767, "sqlite": 999, "mssql": 2000, "oracle": 1000}
+
+# Range and multirange types of postgresql range fields
+_RANGE_TYPES = (
+    (postgresql.INT4RANGE, postgresql.INT4MULTIRANGE),
+    (postgresql.INT8RANGE, postgresql.INT8MULTIRANGE),
+    (postgresql.NUMRANGE, postgresql.NUMMULTIRANGE),
+    (postgresql.DATERANGE, postgresql.DATEMULTIRANGE),
+    (postgresql.TSRANGE, postgresql.TSMULTIRANGE),
+    (postgresql.TSTZRANGE, postgresql.TSTZMULTIRANGE),
+)
+
+# Jsonpath of keys and indexes, which sqlite evaluates like postgresql
+_SQLITE_JSON_PATH = re.compile(r'\$(\.[A-Za-z_]\w*|\."[^"]*"|\[\d+\])*')
+
 
 def icontains(field: ModelAttribute, value: str) -> ColumnElement:
     return field.ilike(f"%{value}%")
 
 
+def startswith(field: ModelAttribute, value: str) -> ColumnElement:
+    """Prefix search: field LIKE 'value%'
+
+    Special characters of value are escaped, and the whole pattern is a single parameter,
+    so a B-tree index with text_pattern_ops (or the C collation) is used.
+    """
+    return field.like(f"{_escape_like(value)}%", escape=LIKE_ESCAPE)
+
+
+def istartswith(field: ModelAttribute, value: str) -> ColumnElement:
+    """Case insensitive prefix search: lower(field) LIKE 'value%'
+
+    Value is lowercased, so an index on lower(field) is used, see startswith.
+    """
+    return sa.func.lower(field).like(f"{_escape_like(value.lower())}%", escape=LIKE_ESCAPE)
+
+
+def prefix_range(field: ModelAttribute, value: str) -> ColumnElement:
+    """Prefix search by range: field >= 'value' AND field < 'valuf'
+
+    Range is used by any B-tree index on field, e.g. on a case-folded column,
+    when the collation of field sorts strings by code points.
+    """
+    upper_bound = value.rstrip(chr(sys.maxunicode))
+    if not upper_bound:
+        return field >= value
+    upper_bound = upper_bound[:-1] + chr(ord(upper_bound[-1]) + 1)
+    return sa.and_(field >= value, field < upper_bound)
+
+
+def full_text(field: ModelAttribute, value: str, config: str = "english") -> ColumnElement:
+    """Full text search
+
+    postgresql: to_tsvector(config, field) @@ websearch_to_tsquery(config, value),
+        field of TSVECTOR type is used without to_tsvector
+    sqlite: field MATCH '"word" "word"', field is a column of a FTS5 table.
+        Words of value are quoted as FTS5 strings, so punctuation and
+        keywords like AND are searched as text instead of the query syntax.
+    other dialects: icontains
+    """
+    return DialectCase(
+        icontains(field, value),
+        postgresql=_ts_vector(field, config).op("@@", is_comparison=True)(_ts_query(value, config)),
+        sqlite=sa_op.match_op(field, _fts5_query(value)),
+    )
+
+
+def full_text_rank(field: ModelAttribute, value: str, config: str = "english") -> ColumnElement:
+    """Ordering of full text search results by relevance
+
+    postgresql: ts_rank(to_tsvector(config, field), websearch_to_tsquery(config, value)) DESC
+    sqlite: bm25(table), table is a FTS5 table of field
+    other dialects: rows where field contains value first
+    """
+    return DialectCase(
+        _contains_first(field, value),
+        postgresql=sa.func.ts_rank(_ts_vector(field, config), _ts_query(value, config)).desc(),
+        sqlite=sa.func.bm25(sa.literal_column(field.table.name)),
+    )
+
+
+def trigram_similar(
+    field: ModelAttribute, value: str, threshold: Optional[float] = None, word: bool = False
+) -> ColumnElement:
+    """Trigram similarity search of pg_trgm extension
+
+    postgresql: field % value, or value <% field for word similarity.
+        The operators use a trigram index with pg_trgm.similarity_threshold
+        (pg_trgm.word_similarity_threshold) of a session.
+        A greater threshold adds similarity(field, value) >= threshold
+        to check rows found by the index.
+    other dialects: icontains
+    """
+    expression: ColumnElement
+    if word:
+        expression = sa.literal(value).op("<%", is_comparison=True)(field)
+    else:
+        expression = field.op("%", is_comparison=True)(value)
+    if threshold is not None:
+        expression = sa.and_(expression, _trigram_similarity(field, value, word) >= threshold)
+    return DialectCase(icontains(field, value), postgresql=expression)
+
+
+def trigram_similarity_rank(field: ModelAttribute, value: str, word: bool = False) -> ColumnElement:
+    """Ordering of trigram similarity search results by similarity
+
+    postgresql: similarity(field, value) DESC, or word_similarity(value, field) DESC
+    other dialects: rows where field contains value first
+    """
+    return DialectCase(
+        _contains_first(field, value),
+        postgresql=_trigram_similarity(field, value, word).desc(),
+    )
+
+
 def is_null(field: ModelAttribute, value: bool) -> Any:
     if value:
         return sa_op.is_(field, None)
     else:
         return sa_op.is_not(field, None)
+
+
+def in_values(field: ModelAttribute, value: Iterable) -> ColumnElement:
+    """IN operator which fits values into the limits of a dialect
+
+    Values are deduplicated and sorted when possible.
+    When there are more values than IN_VALUES_LIMITS allows for a dialect:
+    postgresql: field = ANY (:values::type[])
+    sqlite: field IN (SELECT value FROM json_each(:values))
+    mssql: field IN (SELECT CAST(value AS type) FROM OPENJSON(:values))
+    oracle: field IN (:chunk_1) OR field IN (:chunk_2) ...
+    """
+    if isinstance(value, str) or not isinstance(value, Iterable):
+        return sa_op.in_op(field, value)
+    values = _unique_sorted(value)
+    default = sa_op.in_op(field, values)
+    cases: Dict[str, ColumnElement] = {}
+    if len(values) > IN_VALUES_LIMITS["postgresql"]:
+        cases["postgresql"] = field == sa.any_(_array_param(field, values))
+    if len(values) > IN_VALUES_LIMITS["sqlite"]:
+        cases["sqlite"] = sa_op.in_op(field, _json_each_select(field, values))
+    if len(values) > IN_VALUES_LIMITS["mssql"]:
+        cases["mssql"] = sa_op.in_op(field, _openjson_select(field, values))
+    if len(values) > IN_VALUES_LIMITS["oracle"]:
+        chunks = _chunks(values, IN_VALUES_LIMITS["oracle"])
+        cases["oracle"] = sa.or_(*(sa_op.in_op(field, chunk) for chunk in chunks))
+    return DialectCase(default, **cases) if cases else default
+
+
+def not_in_values(field: ModelAttribute, value: Iterable) -> ColumnElement:
+    """NOT IN operator which fits values into the limits of a dialect
+
+    Values are deduplicated and sorted when possible.
+    When there are more values than IN_VALUES_LIMITS allows for a dialect:
+    postgresql: field != ALL (:values::type[])
+    sqlite: field NOT IN (SELECT value FROM json_each(:values))
+    mssql: field NOT IN (SELECT CAST(value AS type) FROM OPENJSON(:values))
+    oracle: field NOT IN (:chunk_1) AND field NOT IN (:chunk_2) ...
+    """
+    if isinstance(value, str) or not isinstance(value, Iterable):
+        return sa_op.not_in_op(field, value)
+    values = _unique_sorted(value)
+    default = sa_op.not_in_op(field, values)
+    cases: Dict[str, ColumnElement] = {}
+    if len(values) > IN_VALUES_LIMITS["postgresql"]:
+        cases["postgresql"] = field != sa.all_(_array_param(field, values))
+    if len(values) > IN_VALUES_LIMITS["sqlite"]:
+        cases["sqlite"] = sa_op.not_in_op(field, _json_each_select(field, values))
+    if len(values) > IN_VALUES_LIMITS["mssql"]:
+        cases["mssql"] = sa_op.not_in_op(field, _openjson_select(field, values))
+    if len(values) > IN_VALUES_LIMITS["oracle"]:
+        chunks = _chunks(values, IN_VALUES_LIMITS["oracle"])
+        cases["oracle"] = sa.and_(*(sa_op.not_in_op(field, chunk) for chunk in chunks))
+    return DialectCase(default, **cases) if cases else default
+
+
+def in_array(field: ModelAttribute, value: Iterable) -> ColumnElement:
+    """IN operator which binds all values as a single parameter
+
+    postgresql: field = ANY (:values::type[])
+    sqlite: field IN (SELECT value FROM json_each(:values))
+    other dialects: field IN (:values)
+    """
+    values = list(value)
+    return DialectCase(
+        sa_op.in_op(field, values),
+        postgresql=field == sa.any_(_array_param(field, values)),
+        sqlite=sa_op.in_op(field, _json_each_select(field, values)),
+    )
+
+
+def not_in_array(field: ModelAttribute, value: Iterable) -> ColumnElement:
+    """NOT IN operator which binds all values as a single parameter
+
+    postgresql: field != ALL (:values::type[])
+    sqlite: field NOT IN (SELECT value FROM json_each(:values))
+    other dialects: field NOT IN (:values)
+    """
+    values = list(value)
+    return DialectCase(
+        sa_op.not_in_op(field, values),
+        postgresql=field != sa.all_(_array_param(field, values)),
+        sqlite=sa_op.not_in_op(field, _json_each_select(field, values)),
+    )
+
+
+def array_overlap(field: ModelAttribute, value: Iterable) -> ColumnElement:
+    """Array field has any of values: field && :values
+
+    Values are bound as a single array parameter.
+    """
+    return field.op("&&", is_comparison=True)(_array_field_param(field, value))
+
+
+def array_contains(field: ModelAttribute, value: Iterable) -> ColumnElement:
+    """Array field has all of values: field @> :values
+
+    Values are bound as a single array parameter.
+    """
+    return field.op("@>", is_comparison=True)(_array_field_param(field, value))
+
+
+def array_contained_by(field: ModelAttribute, value: Iterable) -> ColumnElement:
+    """All items of array field are in values: field <@ :values
+
+    Values are bound as a single array parameter.
+    """
+    return field.op("<@", is_comparison=True)(_array_field_param(field, value))
+
+
+def range_overlap(field: ModelAttribute, value: Any) -> ColumnElement:
+    """Range field overlaps a range or any range of a list: field && :value
+
+    A list of ranges is bound as a multirange.
+    """
+    return field.op("&&", is_comparison=True)(_range_param(field, value))
+
+
+def range_contains(field: ModelAttribute, value: Any) -> ColumnElement:
+    """Range field contains a range or all ranges of a list: field @> :value"""
+    return field.op("@>", is_comparison=True)(_range_param(field, value))
+
+
+def range_contained_by(field: ModelAttribute, value: Any) -> ColumnElement:
+    """Range or scalar field is within a range or one of ranges of a list: field <@ :value"""
+    return field.op("<@", is_comparison=True)(_range_param(field, value))
+
+
+def range_adjacent(field: ModelAttribute, value: Any) -> ColumnElement:
+    """Range field is adjacent to a range or a list of ranges: field -|- :value"""
+    return field.op("-|-", is_comparison=True)(_range_param(field, value))
+
+
+def histogram_bucket(field: ModelAttribute, lower: Any, upper: Any, buckets: int) -> ColumnElement:
+    """Number of an equal width bucket of [lower, upper) with a field value, from 1 to buckets.
+    Values below lower are in bucket 0, values above or equal to upper are in bucket buckets + 1
+
+    postgresql: width_bucket(field, lower, upper, buckets)
+    other dialects: CAST((field - lower) * buckets / (upper - lower) AS INTEGER) + 1
+    """
+    return DialectCase(
+        sa.case(
+            (field < lower, 0),
+            (field >= upper, buckets + 1),
+            else_=sa.cast((field - lower) * buckets / (upper - lower), sa.Integer) + 1,
+        ),
+        postgresql=sa.func.width_bucket(field, lower, upper, buckets, type_=sa.Integer),
+    )
+
+
+def json_contains(field: ModelAttribute, value: Any) -> ColumnElement:
+    """Containment of a JSON document: field @> :value
+
+    It's supported by GIN indexes of jsonb on postgresql.
+    sqlite: comparisons of every scalar of value with json_extract(field, path),
+    items of arrays are found by json_each(field, path), objects and arrays
+    in arrays are compared by containment at paths of the found items.
+    Keys containing double quotes can not be a part of a path on sqlite.
+    """
+    return DialectCase(
+        _jsonb(field).contains(sa.bindparam(None, value, type_=postgresql.JSONB)),
+        sqlite=_json_contains_sqlite(field, "$", value),
+    )
+
+
+def json_has_key(field: ModelAttribute, value: str) -> ColumnElement:
+    """Existence of a top level key: field ? :value
+
+    sqlite: json_type(field, '$."key"') IS NOT NULL
+    """
+    return DialectCase(
+        _jsonb(field).has_key(sa.bindparam(None, value, type_=sa.Text)),
+        sqlite=_json_has_key_sqlite(field, value),
+    )
+
+
+def json_has_any_key(field: ModelAttribute, value: Iterable[str]) -> ColumnElement:
+    """Existence of any of top level keys: field ?| :value
+
+    sqlite: json_type(field, '$."key_1"') IS NOT NULL OR ...
+    """
+    keys = list(value)
+    return DialectCase(
+        _jsonb(field).has_any(_keys_param(keys)),
+        sqlite=sa.or_(sa.false(), *(_json_has_key_sqlite(field, key) for key in keys)),
+    )
+
+
+def json_has_all_keys(field: ModelAttribute, value: Iterable[str]) -> ColumnElement:
+    """Existence of all top level keys: field ?& :value
+
+    sqlite: json_type(field, '$."key_1"') IS NOT NULL AND ...
+    """
+    keys = list(value)
+    return DialectCase(
+        _jsonb(field).has_all(_keys_param(keys)),
+        sqlite=sa.and_(sa.true(), *(_json_has_key_sqlite(field, key) for key in keys)),
+    )
+
+
+def json_path(field: ModelAttribute, value: str) -> ColumnElement:
+    """Existence of an item matching a jsonpath: field @? CAST(:value AS JSONPATH)
+
+    It's supported by GIN indexes of jsonb on postgresql.
+    sqlite: json_type(field, :value) IS NOT NULL, only paths of keys and indexes are supported,
+    e.g. $.size."width"[0], other paths raise CompileError.
+    """
+    sqlite: ColumnElement
+    if _SQLITE_JSON_PATH.fullmatch(value):
+        sqlite = sa.func.json_type(field, value).is_not(None)
+    else:
+        sqlite = Unsupported(f"Jsonpath {value!r} is not supported by sqlite")
+    return DialectCase(
+        _jsonb(field).path_exists(sa.cast(value, postgresql.JSONPATH)),
+        sqlite=sqlite,
+    )
+
+
+def _escape_like(value: str) -> str:
+    for char in (LIKE_ESCAPE, "%", "_"):
+        value = value.replace(char, LIKE_ESCAPE + char)
+    return value
+
+
+def _array_param(field: ModelAttribute, values: list) -> ColumnElement:
+    return sa.bindparam(None, values, type_=postgresql.ARRAY(field.type))
+
+
+def _array_field_param(field: ModelAttribute, values: Iterable) -> ColumnElement:
+    return sa.bindparam(None, list(values), type_=field.type)
+
+
+def _range_param(field: ModelAttribute, value: Any) -> ColumnElement:
+    """Bind a range as CAST(:value AS range) or a list of ranges as CAST(:value AS multirange)
+
+    Ranges are postgresql.Range or (lower, upper) tuples with "[)" bounds.
+    They are bound as a text literal, so the statement is the same for any number of ranges.
+    """
+    range_type, multirange_type = _get_range_types(field)
+    if isinstance(value, list):
+        literal = "{%s}" % ",".join(_range_literal(item) for item in value)
+        return sa.cast(sa.bindparam(None, literal, type_=sa.Text), multirange_type)
+    return sa.cast(sa.bindparam(None, _range_literal(value), type_=sa.Text), range_type)
+
+
+def _get_range_types(field: ModelAttribute) -> Tuple[Any, Any]:
+    """Get range and multirange types of a range field or of a field of range elements"""
+    type_ = field.type
+    for range_type, multirange_type in _RANGE_TYPES:
+        if isinstance(type_, (range_type, multirange_type)):
+            return range_type(), multirange_type()
+    if isinstance(type_, sa.DateTime):
+        if type_.timezone:
+            return postgresql.TSTZRANGE(), postgresql.TSTZMULTIRANGE()
+        return postgresql.TSRANGE(), postgresql.TSMULTIRANGE()
+    if isinstance(type_, sa.Date):
+        return postgresql.DATERANGE(), postgresql.DATEMULTIRANGE()
+    if isinstance(type_, sa.BigInteger):
+        return postgresql.INT8RANGE(), postgresql.INT8MULTIRANGE()
+    if isinstance(type_, sa.Integer):
+        return postgresql.INT4RANGE(), postgresql.INT4MULTIRANGE()
+    if isinstance(type_, sa.Numeric):
+        return postgresql.NUMRANGE(), postgresql.NUMMULTIRANGE()
+    raise ValueError(f"There is no range type for {type_}")
+
+
+def _range_literal(value: Any) -> str:
+    if not isinstance(value, postgresql.Range):
+        value = postgresql.Range(*value)
+    if value.empty:
+        return "empty"
+    lower, upper = ("" if bound is None else f'"{bound}"' for bound in (value.lower, value.upper))
+    return f"{value.bounds[0]}{lower},{upper}{value.bounds[1]}"
+
+
+def _json_each_select(field: ModelAttribute, values: list) -> sa.Select:
+    json_each = sa.func.json_each(sa.bindparam(None, values, type_=JsonArray(field.type)))
+    return sa.select(json_each.table_valued("value").c.value)
+
+
+def _openjson_select(field: ModelAttribute, values: list) -> sa.Select:
+    openjson = sa.func.openjson(sa.bindparam(None, values, type_=JsonArray(field.type)))
+    return sa.select(sa.cast(openjson.table_valued("value").c.value, field.type))
+
+
+def _keys_param(keys: List[str]) -> ColumnElement:
+    return sa.bindparam(None, keys, type_=postgresql.ARRAY(sa.Text))
+
+
+def _jsonb(field: ModelAttribute) -> Any:
+    return sa.type_coerce(field, postgresql.JSONB)
+
+
+def _json_has_key_sqlite(field: ModelAttribute, key: str) -> ColumnElement:
+    path = _json_key_path("$", key)
+    if path is None:
+        return _json_key_unsupported(key)
+    return sa.func.json_type(field, path).is_not(None)
+
+
+def _json_contains_sqlite(field: ModelAttribute, path: Any, value: Any) -> ColumnElement:
+    """Check containment of value at path of field by JSON1 functions of sqlite
+
+    Path is a string or an expression, e.g. fullkey of an item found by json_each.
+    """
+    json_type = sa.func.json_type(field, path)
+    if isinstance(value, dict):
+        criteria = []
+        for key, item in value.items():
+            item_path = _json_key_path(path, key)
+            if item_path is None:
+                return _json_key_unsupported(key)
+            criteria.append(_json_contains_sqlite(field, item_path, item))
+        return sa.and_(json_type == "object", *criteria)
+    if isinstance(value, list):
+        items = sa.func.json_each(field, path).table_valued("value", "type", "fullkey")
+        return sa.and_(
+            json_type == "array",
+            *(
+                sa.select(sa.literal_column("1"))
+                .select_from(items)
+                .where(_json_item_contains_sqlite(field, items, item))
+                .exists()
+                for item in value
+            ),
+        )
+    return _json_equals_sqlite(sa.func.json_extract(field, path), json_type, value)
+
+
+def _json_item_contains_sqlite(field: ModelAttribute, items: Any, item: Any) -> ColumnElement:
+    """Check containment of item in an item of an array found by json_each"""
+    if isinstance(item, (dict, list)):
+        return _json_contains_sqlite(field, items.c.fullkey, item)
+    return _json_equals_sqlite(items.c.value, items.c.type, item)
+
+
+def _json_equals_sqlite(value: Any, json_type: Any, item: Any) -> ColumnElement:
+    """Compare a scalar JSON value extracted by sqlite"""
+    if item is None:
+        return json_type == "null"
+    if isinstance(item, bool):
+        return json_type == ("true" if item else "false")
+    return value == item
+
+
+def _json_key_path(path: Any, key: str) -> Any:
+    """Append a quoted key to a JSON path of sqlite, None if key can not be quoted"""
+    if '"' in key:
+        return None
+    if isinstance(path, str):
+        return f'{path}."{key}"'
+    return path.concat(f'."{key}"')
+
+
+def _json_key_unsupported(key: str) -> ColumnElement:
+    return Unsupported(f"JSON key {key!r} containing double quotes is not supported by sqlite")
+
+
+def _unique_sorted(value: Iterable) -> list:
+    try:
+        values = list(dict.fromkeys(value))
+    except TypeError:
+        return list(value)
+    try:
+        values.sort()
+    except TypeError:
+        pass
+    return values
+
+
+def _chunks(values: list, size: int) -> List[list]:
+    return [values[index : index + size] for index in range(0, len(values), size)]
+
+
+def _ts_vector(field: ModelAttribute, config: str) -> Any:
+    if isinstance(field.type, postgresql.TSVECTOR):
+        return field
+    return sa.func.to_tsvector(_ts_config(config), field)
+
+
+def _ts_query(value: str, config: str) -> ColumnElement:
+    return sa.func.websearch_to_tsquery(_ts_config(config), value)
+
+
+def _fts5_query(value: str) -> str:
+    words = value.split() or [""]
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in words)
+
+
+def _ts_config(config: str) -> ColumnElement:
+    # Rendered as a literal, so expression indexes on to_tsvector match the query
+    return sa.literal(config, sa.String, literal_execute=True)
+
+
+def _contains_first(field: ModelAttribute, value: str) -> ColumnElement:
+    return sa.case((icontains(field, value), 0), else_=1)
+
+
+def _trigram_similarity(field: ModelAttribute, value: str, word: bool) -> ColumnElement:
+    if word:
+        return sa.func.word_similarity(value, field)
+    return sa.func.similarity(field, value)
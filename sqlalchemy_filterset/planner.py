@@ -0,0 +1,462 @@
+import datetime
+import operator as op
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm import RelationshipProperty
+from sqlalchemy.sql import ClauseElement, ColumnElement, FromClause, Select
+from sqlalchemy.sql import operators as sa_op
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList, False_
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.util import find_tables, join_condition
+
+from sqlalchemy_filterset.elements import DialectCase
+
+# Element of Select._setup_joins: (target, onclause, from_, flags)
+SetupJoin = Tuple[Any, Any, Any, Dict[str, Any]]
+
+# Attributes of Select which merge_query extends and which it requires to be unchanged
+_MERGED_ATTRIBUTES = ("_where_criteria", "_setup_joins", "_order_by_clauses")
+_KEPT_ATTRIBUTES = (
+    "_raw_columns",
+    "_limit_clause",
+    "_offset_clause",
+    "_distinct",
+    "_distinct_on",
+    "_group_by_clauses",
+    "_having_criteria",
+)
+
+# Operators of predicates which are merged by normalize_where
+_MERGED_OPERATORS = (op.eq, op.ge, op.gt, op.le, op.lt, sa_op.in_op)
+
+
+def plan_joins(query: Select, base_query: Select) -> Select:
+    """Emit the joins added to base_query by filters once and in an optimal order
+
+    Every join is emitted once: equal joins (same target, onclause and type)
+    requested by different filters (e.g. shared prefixes of MultiJoinStrategy chains
+    and standalone JoinStrategy) are merged. Joins without onclause and joins by a relationship
+    are compared by the onclause which SQLAlchemy derives from foreign keys.
+    A left outer join is merged into an inner join of the same target and onclause.
+    Inner joins are placed before outer joins when the onclause of a join
+    does not depend on a table joined later. Full joins are never moved.
+    Joins of base_query are kept as is.
+
+    :param query: Query built by filters from base_query
+    :param base_query: Base query of FilterSet
+
+    :returns: Query with planned joins
+    """
+    base_joins_count = len(base_query._setup_joins)
+    joins: Sequence[SetupJoin] = query._setup_joins[base_joins_count:]
+    if not joins:
+        return query
+
+    resolved_joins = _resolve_onclauses(joins, base_query)
+    unique_indexes: List[int] = []
+    for index, join in enumerate(resolved_joins):
+        unique_joins = [resolved_joins[other] for other in unique_indexes]
+        if any(_is_same_join(join, other) for other in unique_joins):
+            continue
+        # An inner join replaces an equal left outer join (e.g. of ordering),
+        # which would join the same table once more
+        for position, other in enumerate(unique_joins):
+            if not _is_outer(join) and _is_same_join(join, other, outer=True):
+                unique_indexes[position] = index
+                break
+        else:
+            if not any(_is_same_join(other, join, outer=True) for other in unique_joins):
+                unique_indexes.append(index)
+
+    planned_joins = _order_joins([joins[index] for index in unique_indexes])
+    if len(planned_joins) == len(joins) and all(
+        planned is join for planned, join in zip(planned_joins, joins)
+    ):
+        return query
+
+    query = query._generate()
+    query._setup_joins = query._setup_joins[:base_joins_count] + tuple(planned_joins)
+    return query
+
+
+def joins_to_exists(query: Select, base_query: Select) -> Optional[List[ColumnElement]]:
+    """Get where criteria of query with the joins added by filters rewritten to EXISTS
+
+    Statements like UPDATE and DELETE can not carry joins, so inner joins are replaced
+    by a subquery correlated with the tables of base_query by the onclause of the first join.
+    Criteria which refer only to tables of base_query are kept outside of the subquery.
+
+    :param query: Query built by filters from base_query
+    :param base_query: Base query of FilterSet without joins
+
+    :returns: Where criteria or None when base_query has joins or filters added outer joins
+    """
+    joins: Sequence[SetupJoin] = query._setup_joins
+    if base_query._setup_joins or any(_is_outer(join) or join[2] is not None for join in joins):
+        return None
+    if not joins:
+        return list(query._where_criteria)
+
+    base_tables = set(base_query.get_final_froms())
+    criteria: List[ColumnElement] = []
+    joined_criteria: List[ColumnElement] = []
+    for criterion in query._where_criteria:
+        if set(find_tables(criterion, check_columns=True, include_aliases=True)) <= base_tables:
+            criteria.append(criterion)
+        else:
+            joined_criteria.append(criterion)
+
+    subquery: Select = sa.select(sa.literal_column("1")).select_from(joins[0][0])
+    for target, onclause, _, _ in joins[1:]:
+        subquery = subquery.join(target, onclause)
+    criteria.append(sa.exists(subquery.where(joins[0][1], *joined_criteria)))
+    return criteria
+
+
+def _resolve_onclauses(joins: Sequence[SetupJoin], base_query: Select) -> List[SetupJoin]:
+    """Get joins with implicit onclauses resolved for comparison
+
+    A join by a relationship is replaced by the join of the related table by its primary join.
+    A missing onclause is resolved by foreign keys between the target and the only one
+    of the tables joined before (or the table of join_from) which has them,
+    otherwise it is kept missing.
+    """
+    froms: List[FromClause] = list(base_query.get_final_froms())
+    resolved: List[SetupJoin] = []
+    for target, onclause, from_, flags in joins:
+        relationship = target if onclause is None else onclause
+        prop = getattr(relationship, "property", None)
+        if (
+            isinstance(prop, RelationshipProperty)
+            and prop.secondary is None
+            and relationship.parent is prop.parent
+            and relationship._of_type is None
+            and (onclause is None or _is_same_element(target, prop.entity.selectable))
+        ):
+            target, onclause = prop.entity.selectable, prop.primaryjoin
+        if onclause is None and isinstance(target, FromClause):
+            lefts = froms if from_ is None else [sa.inspect(from_).selectable]
+            conditions = []
+            for left in lefts:
+                try:
+                    conditions.append(join_condition(left, target))
+                except sa.exc.ArgumentError:
+                    continue
+            if len(conditions) == 1:
+                onclause = conditions[0]
+        resolved.append((target, onclause, from_, flags))
+        if isinstance(target, FromClause) and not any(
+            _is_same_element(target, other) for other in froms
+        ):
+            froms.append(target)
+    return resolved
+
+
+def _is_same_join(join: SetupJoin, other: SetupJoin, outer: bool = False) -> bool:
+    """Check joins are equal
+
+    :param outer: Check other is a left outer join equal to the inner join
+    """
+    target, onclause, from_, flags = join
+    other_target, other_onclause, other_from, other_flags = other
+    if outer:
+        flags = dict(flags, isouter=True)
+    if flags != other_flags:
+        return False
+    return (
+        _is_same_element(target, other_target)
+        and _is_same_element(from_, other_from)
+        and _is_same_element(onclause, other_onclause)
+    )
+
+
+def _is_same_element(element: Any, other: Any) -> bool:
+    """Compare clause elements, other ones (e.g. relationship attributes) by identity"""
+    if isinstance(element, ClauseElement) and isinstance(other, ClauseElement):
+        return bool(element.compare(other))
+    return element is other
+
+
+def _order_joins(joins: List[SetupJoin]) -> List[SetupJoin]:
+    """Order joins topologically: inner joins first, then by the initial position"""
+    dependencies = [_get_dependencies(joins, index) for index in range(len(joins))]
+    planned: List[SetupJoin] = []
+    planned_indexes: Set[int] = set()
+    while len(planned) < len(joins):
+        ready = [
+            index
+            for index in range(len(joins))
+            if index not in planned_indexes and dependencies[index] <= planned_indexes
+        ]
+        index = min(ready, key=lambda index: (_is_outer(joins[index]), index))
+        planned.append(joins[index])
+        planned_indexes.add(index)
+    return planned
+
+
+def _get_dependencies(joins: List[SetupJoin], index: int) -> Set[int]:
+    """Get indexes of previous joins which must stay before the join"""
+    target, onclause, from_, flags = joins[index]
+    previous = set(range(index))
+    if not isinstance(onclause, ClauseElement) or from_ is not None or flags["full"]:
+        return previous
+
+    dependencies = {
+        previous_index for previous_index in previous if joins[previous_index][3]["full"]
+    }
+    tables = find_tables(onclause, check_columns=True, include_aliases=True)
+    for previous_index in previous:
+        previous_target = joins[previous_index][0]
+        if any(table.is_derived_from(previous_target) for table in tables):
+            dependencies.add(previous_index)
+    return dependencies
+
+
+def _is_outer(join: SetupJoin) -> bool:
+    flags = join[3]
+    return bool(flags["isouter"] or flags["full"])
+
+
+class _Predicate(NamedTuple):
+    """Comparison of a column with bound values: column <operator> values"""
+
+    column: ColumnElement
+    operator: Callable
+    values: List[Any]
+
+
+class _Bound(NamedTuple):
+    value: Any
+    inclusive: bool
+
+
+def normalize_where(query: Select, base_query: Select) -> Select:
+    """Merge predicates added to base_query by filters on the same column
+
+    Top level AND predicates comparing a column with numbers, dates, datetimes or uuids
+    by =, IN, >, >=, <, <= are merged:
+    IN sets are intersected with equalities, ranges are intersected,
+    and values outside of a range are removed from IN sets.
+    Predicates which can not be true together are replaced by false.
+    Predicates are rewritten only when they become simpler.
+    Predicates of base_query are kept as is.
+
+    :param query: Query built by filters from base_query
+    :param base_query: Base query of FilterSet
+
+    :returns: Query with normalized where criteria
+    """
+    base_criteria_count = len(base_query._where_criteria)
+    criteria = list(_flatten_and(query._where_criteria[base_criteria_count:]))
+
+    groups: List[List[int]] = []
+    predicates: Dict[int, _Predicate] = {}
+    for index, criterion in enumerate(criteria):
+        predicate = _parse_predicate(criterion)
+        if predicate is None:
+            continue
+        predicates[index] = predicate
+        for group in groups:
+            if predicates[group[0]].column.compare(predicate.column):
+                group.append(index)
+                break
+        else:
+            groups.append([index])
+
+    replacements: Dict[int, List[ColumnElement]] = {}
+    for group in groups:
+        merged = _merge_predicates([predicates[index] for index in group])
+        if merged is not None and (len(merged) < len(group) or _is_false(merged)):
+            replacements.update({index: [] for index in group})
+            replacements[group[0]] = merged
+    if not replacements:
+        return query
+
+    normalized: List[ColumnElement] = []
+    for index, criterion in enumerate(criteria):
+        normalized.extend(replacements.get(index, [criterion]))
+    query = query._generate()
+    query._where_criteria = query._where_criteria[:base_criteria_count] + tuple(normalized)
+    return query
+
+
+def merge_query(query: Select, source: Select, changed: Select) -> Select:
+    """Add to query the where criteria, joins and ordering which changed query added to source
+
+    It combines queries which were built concurrently from the same source query.
+
+    :param query: Query to add changes to
+    :param source: Query which changed query was built from
+    :param changed: Query built from source
+
+    :raises ValueError: when changed query is not built by adding where criteria,
+        joins or ordering to source
+
+    :returns: Query with changes
+    """
+    for attribute in _KEPT_ATTRIBUTES:
+        if getattr(changed, attribute) is not getattr(source, attribute):
+            raise ValueError(f"Changes of {attribute[1:]} can not be merged")
+
+    query = query._generate()
+    for attribute in _MERGED_ATTRIBUTES:
+        source_items = getattr(source, attribute)
+        changed_items = getattr(changed, attribute)
+        if len(changed_items) < len(source_items) or any(
+            item is not source_item for item, source_item in zip(changed_items, source_items)
+        ):
+            raise ValueError(f"Changes of {attribute[1:]} can not be merged")
+        setattr(query, attribute, getattr(query, attribute) + changed_items[len(source_items) :])
+    return query
+
+
+def is_statically_empty(query: Select) -> bool:
+    """Check that query returns no rows without executing it
+
+    Query is empty when one of top level AND predicates is false
+    or IN with an empty list of values. Queries with GROUP BY, HAVING or functions
+    in selected columns are never empty, as aggregates return a row for no rows.
+    """
+    if query._group_by_clauses or query._having_criteria:
+        return False
+    for column in query.selected_columns:
+        if any(isinstance(element, FunctionElement) for element in visitors.iterate(column)):
+            return False
+    return any(_is_false_predicate(criterion) for criterion in _flatten_and(query._where_criteria))
+
+
+def _is_false_predicate(criterion: ColumnElement) -> bool:
+    if isinstance(criterion, DialectCase):
+        criterion = criterion.default
+    if isinstance(criterion, False_):
+        return True
+    return (
+        isinstance(criterion, BinaryExpression)
+        and criterion.operator is sa_op.in_op
+        and isinstance(criterion.right, BindParameter)
+        and criterion.right.expanding
+        and criterion.right.callable is None
+        and criterion.right.value == []
+    )
+
+
+def _flatten_and(criteria: Iterable[ColumnElement]) -> Iterable[ColumnElement]:
+    for criterion in criteria:
+        if isinstance(criterion, BooleanClauseList) and criterion.operator is sa_op.and_:
+            yield from _flatten_and(criterion.clauses)
+        else:
+            yield criterion
+
+
+def _parse_predicate(criterion: ColumnElement) -> Optional[_Predicate]:
+    if not isinstance(criterion, BinaryExpression) or criterion.operator not in _MERGED_OPERATORS:
+        return None
+    if not isinstance(criterion.right, BindParameter) or criterion.right.callable is not None:
+        return None
+    value = criterion.right.value
+    if criterion.operator is sa_op.in_op:
+        if not criterion.right.expanding or not isinstance(value, (list, tuple)):
+            return None
+        values = list(value)
+    else:
+        values = [value]
+    categories = {_get_category(value) for value in values}
+    if len(categories) != 1 or None in categories:
+        return None
+    return _Predicate(criterion.left, criterion.operator, values)
+
+
+def _get_category(value: Any) -> Optional[type]:
+    """Get a category of values which are compared the same way in python and sql"""
+    if isinstance(value, bool):
+        return None
+    # Floats are not merged with exact numbers: 1.1 != Decimal("1.1") in python,
+    # while sql compares both as the type of the column
+    if isinstance(value, float):
+        return float
+    if isinstance(value, (int, Decimal)):
+        return Decimal
+    if isinstance(value, datetime.datetime):
+        return datetime.datetime
+    if isinstance(value, datetime.date):
+        return datetime.date
+    if isinstance(value, uuid.UUID):
+        return uuid.UUID
+    return None
+
+
+def _merge_predicates(predicates: List[_Predicate]) -> Optional[List[ColumnElement]]:
+    """Merge predicates of a column, None if values can not be compared"""
+    if len({_get_category(predicate.values[0]) for predicate in predicates}) != 1:
+        return None
+
+    column = predicates[0].column
+    allowed: Optional[Set[Any]] = None
+    lower: Optional[_Bound] = None
+    upper: Optional[_Bound] = None
+    try:
+        for predicate in predicates:
+            if predicate.operator in (op.eq, sa_op.in_op):
+                values = set(predicate.values)
+                allowed = values if allowed is None else allowed & values
+            elif predicate.operator in (op.ge, op.gt):
+                bound = _Bound(predicate.values[0], predicate.operator is op.ge)
+                lower = bound if lower is None else max(lower, bound, key=_lower_bound_key)
+            else:
+                bound = _Bound(predicate.values[0], predicate.operator is op.le)
+                upper = bound if upper is None else min(upper, bound, key=_upper_bound_key)
+
+        if allowed is not None:
+            remaining = sorted(value for value in allowed if _is_within(value, lower, upper))
+            if not remaining:
+                return [sa.false()]
+            if len(remaining) == 1:
+                return [column == remaining[0]]
+            return [column.in_(remaining)]
+        if lower is not None and upper is not None:
+            if lower.value > upper.value:
+                return [sa.false()]
+            if lower.value == upper.value:
+                if lower.inclusive and upper.inclusive:
+                    return [column == lower.value]
+                return [sa.false()]
+    except TypeError:
+        # e.g. comparison of naive and aware datetimes
+        return None
+
+    merged: List[ColumnElement] = []
+    if lower is not None:
+        merged.append(column >= lower.value if lower.inclusive else column > lower.value)
+    if upper is not None:
+        merged.append(column <= upper.value if upper.inclusive else column < upper.value)
+    return merged
+
+
+def _lower_bound_key(bound: _Bound) -> Tuple[Any, bool]:
+    """Key of lower bounds, the greatest is the most strict"""
+    return bound.value, not bound.inclusive
+
+
+def _upper_bound_key(bound: _Bound) -> Tuple[Any, bool]:
+    """Key of upper bounds, the least is the most strict"""
+    return bound.value, bound.inclusive
+
+
+def _is_within(value: Any, lower: Optional[_Bound], upper: Optional[_Bound]) -> bool:
+    if lower is not None and (
+        value < lower.value or (value == lower.value and not lower.inclusive)
+    ):
+        return False
+    if upper is not None and (
+        value > upper.value or (value == upper.value and not upper.inclusive)
+    ):
+        return False
+    return True
+
+
+def _is_false(criteria: List[ColumnElement]) -> bool:
+    return len(criteria) == 1 and isinstance(criteria[0], False_)
@@ -1,10 +1,16 @@
 import copy
 import functools
-from typing import Any, List, Type, Union
+from typing import Any, List, Set, Type, Union
 
-from sqlalchemy import literal_column, select
+from sqlalchemy import Column, Table, UniqueConstraint, literal_column, select
 from sqlalchemy.sql import Select
-from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql import operators as sa_op
+from sqlalchemy.sql.elements import (
+    BinaryExpression,
+    BooleanClauseList,
+    ColumnElement,
+    KeyedColumnElement,
+)
 from sqlalchemy.sql.selectable import Exists, Join, ScalarSelect
 
 from sqlalchemy_filterset.types import Model
@@ -14,6 +20,20 @@ class BaseStrategy:
     def filter(self, query: Select, expression: Any) -> Select:
         return query.where(expression)
 
+    def apply_join(self, query: Select) -> Select:
+        """Join related models required by fields of this strategy"""
+        return query
+
+    def apply_ordering_join(self, query: Select) -> Select:
+        """Join related models required by ordering by fields of this strategy,
+        rows without related models are kept
+        """
+        return self.apply_join(query)
+
+    def ordering_field(self, field: Any, reverse: bool) -> Any:
+        """Get an expression to order a query by a field of the related model"""
+        return field
+
 
 class JoinStrategy(BaseStrategy):
     def __init__(
@@ -36,30 +56,44 @@ class JoinStrategy(BaseStrategy):
     def apply_join(self, query: Select) -> Select:
         return self._join_if_necessary(query)
 
+    def apply_ordering_join(self, query: Select) -> Select:
+        """Outer join the model, so ordering does not filter out rows without related model.
+        Any join of the model made before (e.g. an inner join of a filter) is reused
+        """
+        if self.is_full:
+            return self.apply_join(query)
+        if self._is_joined(query, any_type=True):
+            return query
+        return query.join(self.model, onclause=self.onclause, isouter=True)
+
     def _join_if_necessary(self, query: Select) -> Select:
-        joined_before = False
+        if not self._is_joined(query):
+            query = self._build_join(query, onclause=self.onclause)
+        return query
+
+    def _is_joined(self, query: Select, any_type: bool = False) -> bool:
+        """Check the model is joined by onclause, by a join of the same type unless any_type"""
         to_check = list(query.get_final_froms())
         while to_check:
             element = to_check.pop()
             if not isinstance(element, Join):
                 continue
 
+            if any_type:
+                is_same_type = not element.full
+            else:
+                is_same_type = element.isouter == self.is_outer and element.full == self.is_full
             if (
                 element.right == self.model.__table__
                 and element.onclause is not None
                 and element.onclause.compare(self.onclause)
-                and element.isouter == self.is_outer
-                and element.full == self.is_full
+                and is_same_type
             ):
-                joined_before = True
-                break
+                return True
 
             to_check.append(element.left)
             to_check.append(element.right)
-
-        if not joined_before:
-            query = self._build_join(query, onclause=self.onclause)
-        return query
+        return False
 
     def _build_join(self, query: Select, onclause: ColumnElement[bool]) -> Select:
         return query.join(self.model, onclause=onclause, isouter=self.is_outer, full=self.is_full)
@@ -77,10 +111,18 @@ class MultiJoinStrategy(BaseStrategy):
         self.joins = joins
 
     def filter(self, query: Select, expression: Any) -> Select:
-        query = functools.reduce(
+        query = self.apply_join(query)
+        return query.where(expression)
+
+    def apply_join(self, query: Select) -> Select:
+        return functools.reduce(
             lambda query, strategy: strategy.apply_join(query), self.joins, query
         )
-        return query.where(expression)
+
+    def apply_ordering_join(self, query: Select) -> Select:
+        return functools.reduce(
+            lambda query, strategy: strategy.apply_ordering_join(query), self.joins, query
+        )
 
 
 class SubqueryExistsStrategy(BaseStrategy):
@@ -116,6 +158,19 @@ class SubqueryExistsStrategy(BaseStrategy):
         query._where_criteria = tuple(new_where_criteria)
         return query
 
+    def ordering_field(self, field: Any, reverse: bool) -> Any:
+        """Get a correlated subquery selecting the first related value in the ordering direction,
+        so the rows of the query are not duplicated by a join
+        """
+        return (
+            select(field)
+            .select_from(self.model)
+            .where(self.onclause, field.is_not(None))
+            .order_by(field.desc() if reverse else field.asc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
     def _get_where_criteria_index_of_subquery_with_same_onclause(
         self, query: Select
     ) -> Union[int, None]:
@@ -147,3 +202,87 @@ class SubqueryExistsStrategy(BaseStrategy):
 
 # TODO: Deprecated
 RelationSubqueryExistsStrategy = SubqueryExistsStrategy
+
+
+class AutoStrategy(BaseStrategy):
+    """
+    This strategy chooses between `JoinStrategy` and `SubqueryExistsStrategy`
+    by the cardinality of the relation described by onclause.
+    If onclause compares a primary key or a unique constraint of the related table,
+    every row matches at most one related row (to-one) and the related table is joined.
+    Otherwise (to-many) it makes exists subquery, so the rows of the query are not duplicated.
+
+    The decision is made once on creation and is available as `is_to_one` and `strategy`.
+    """
+
+    def __init__(
+        self,
+        model: Type[Model],
+        onclause: ColumnElement[bool],
+        *,
+        is_outer: bool = False,
+    ) -> None:
+        self.model = model
+        self.onclause = onclause
+        self.is_to_one = self._is_unique_match(model.__table__, onclause)
+        self.strategy: BaseStrategy
+        if self.is_to_one:
+            self.strategy = JoinStrategy(model, onclause, is_outer=is_outer)
+        else:
+            self.strategy = SubqueryExistsStrategy(model, onclause)
+
+    def filter(self, query: Select, expression: Any) -> Select:
+        return self.strategy.filter(query, expression)
+
+    def apply_join(self, query: Select) -> Select:
+        return self.strategy.apply_join(query)
+
+    def apply_ordering_join(self, query: Select) -> Select:
+        return self.strategy.apply_ordering_join(query)
+
+    def ordering_field(self, field: Any, reverse: bool) -> Any:
+        return self.strategy.ordering_field(field, reverse)
+
+    @classmethod
+    def _is_unique_match(cls, table: Table, onclause: ColumnElement[bool]) -> bool:
+        """Check the columns of table compared by onclause cover one of its unique keys"""
+        compared_columns = cls._get_compared_columns(table, onclause)
+        return any(key and key <= compared_columns for key in cls._get_unique_keys(table))
+
+    @staticmethod
+    def _get_compared_columns(
+        table: Table, onclause: ColumnElement[bool]
+    ) -> Set[KeyedColumnElement]:
+        """Get columns of table which onclause compares by equality"""
+        if isinstance(onclause, BooleanClauseList) and onclause.operator is sa_op.and_:
+            clauses = list(onclause.clauses)
+        else:
+            clauses = [onclause]
+
+        columns = set()
+        for clause in clauses:
+            if not isinstance(clause, BinaryExpression) or clause.operator is not sa_op.eq:
+                continue
+            left, right = (
+                table.corresponding_column(side) if isinstance(side, KeyedColumnElement) else None
+                for side in (clause.left, clause.right)
+            )
+            # Comparing two columns of the same table doesn't restrict related rows
+            if left is not None and right is None:
+                columns.add(left)
+            elif right is not None and left is None:
+                columns.add(right)
+        return columns
+
+    @staticmethod
+    def _get_unique_keys(table: Table) -> List[Set[KeyedColumnElement]]:
+        """Get sets of columns which are unique in table"""
+        keys: List[Set[KeyedColumnElement]] = [set(table.primary_key.columns)]
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                keys.append(set(constraint.columns))
+        for index in table.indexes:
+            # Functional indexes don't make plain column values unique
+            if index.unique and all(isinstance(expr, Column) for expr in index.expressions):
+                keys.append(set(index.columns))
+        return keys
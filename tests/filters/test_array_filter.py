@@ -0,0 +1,42 @@
+from typing import Any, Type
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import (
+    ArrayContainedByFilter,
+    ArrayContainsFilter,
+    ArrayOverlapFilter,
+    Filter,
+)
+
+product = sa.Table(
+    "product",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("tags", postgresql.ARRAY(sa.String)),
+)
+
+
+class TestArrayFiltersBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "postgresql"
+
+    @pytest.mark.parametrize(
+        "filter_class, operator",
+        [
+            (ArrayOverlapFilter, "&&"),
+            (ArrayContainsFilter, "@>"),
+            (ArrayContainedByFilter, "<@"),
+        ],
+    )
+    @pytest.mark.parametrize("value", [[], ["new"], ("new", "sale"), [str(i) for i in range(1000)]])
+    def test_filtering(self, filter_class: Type[Filter], operator: str, value: Any) -> None:
+        filter_ = filter_class(product.c.tags)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(product.c.id), value, {}),
+            f"SELECT product.id FROM product WHERE product.tags {operator} %(param_1)s::VARCHAR[]",
+            checkparams={"param_1": list(value)},
+        )
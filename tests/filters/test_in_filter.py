@@ -1,11 +1,19 @@
-from typing import Any
+import uuid
+from decimal import Decimal
+from typing import Any, Iterator
 
 import pytest
+import sqlalchemy as sa
 from sqlalchemy import select
-from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import ArgumentError
+from sqlalchemy.orm import QueryableAttribute, Session
 from sqlalchemy.testing import AssertsCompiledSQL
 
+from sqlalchemy_filterset.elements import DialectCase, JsonArray
 from sqlalchemy_filterset.filters import InFilter, NotInFilter
+from sqlalchemy_filterset.filtersets import FilterSet, _get_temporary_values
+from sqlalchemy_filterset.operators import IN_VALUES_LIMITS, in_array
 from tests.models.base import Item, ItemType
 
 
@@ -19,7 +27,14 @@ class TestInFilterBuildSelect(AssertsCompiledSQL):
             (Item.name, [""], "item.name IN ('')"),
             (Item.type, [ItemType.foo], "item.type IN ('foo')"),
             (Item.name, [ItemType.foo.value], "item.name IN ('foo')"),
-            (Item.name, ["foo", "bar"], "item.name IN ('foo', 'bar')"),
+            (Item.name, ["foo", "bar"], "item.name IN ('bar', 'foo')"),
+            (Item.name, ["foo", "bar", "foo"], "item.name IN ('bar', 'foo')"),
+            (Item.type, [ItemType.foo, ItemType.bar], "item.type IN ('foo', 'bar')"),
+            (
+                sa.tuple_(Item.area, Item.name),
+                [[2, "b"], [1, "a"]],
+                "(item.area, item.name) IN ((2, 'b'), (1, 'a'))",
+            ),
             (Item.name, [], "item.name IN (NULL) AND (1 != 1)"),
             (Item.name, (), "item.name IN (NULL) AND (1 != 1)"),
         ],
@@ -43,7 +58,8 @@ class TestNotInFilterBuildSelect(AssertsCompiledSQL):
             (Item.name, [""], "(item.name NOT IN (''))"),
             (Item.type, [ItemType.foo], "(item.type NOT IN ('foo'))"),
             (Item.name, [ItemType.foo.value], "(item.name NOT IN ('foo'))"),
-            (Item.name, ["foo", "bar"], "(item.name NOT IN ('foo', 'bar'))"),
+            (Item.name, ["foo", "bar"], "(item.name NOT IN ('bar', 'foo'))"),
+            (Item.name, ["foo", "bar", "foo"], "(item.name NOT IN ('bar', 'foo'))"),
             (Item.name, [], "(item.name NOT IN (NULL) OR (1 = 1))"),
             (Item.name, (), "(item.name NOT IN (NULL) OR (1 = 1))"),
         ],
@@ -55,3 +71,239 @@ class TestNotInFilterBuildSelect(AssertsCompiledSQL):
             f"SELECT item.id FROM item WHERE {expected}",
             literal_binds=True,
         )
+
+
+class TestNotInFilterValidation:
+    @pytest.mark.parametrize("value", ["", None])
+    def test_not_list(self, value: Any) -> None:
+        filter_ = NotInFilter(Item.name)
+        with pytest.raises(ArgumentError):
+            filter_.filter(select(Item.id), value, {})
+
+
+class TestInFilterValuesLimitsBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.fixture(autouse=True)
+    def limits(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        for dialect in IN_VALUES_LIMITS:
+            monkeypatch.setitem(IN_VALUES_LIMITS, dialect, 2)
+
+    @pytest.mark.parametrize(
+        "filter_class, dialect, expected",
+        [
+            (InFilter, "default", "item.name IN (__[POSTCOMPILE_name_1])"),
+            (InFilter, "postgresql", "item.name = ANY (%(param_1)s::VARCHAR[])"),
+            (
+                InFilter,
+                "sqlite",
+                "item.name IN (SELECT anon_1.value FROM json_each(?) AS anon_1)",
+            ),
+            (
+                InFilter,
+                "mssql",
+                "item.name IN (SELECT CAST(anon_1.value AS VARCHAR(max)) AS value "
+                "FROM openjson(:param_1) AS anon_1)",
+            ),
+            (
+                InFilter,
+                "oracle",
+                "item.name IN (__[POSTCOMPILE_name_1]) OR item.name IN (__[POSTCOMPILE_name_2])",
+            ),
+            (NotInFilter, "default", "(item.name NOT IN (__[POSTCOMPILE_name_1]))"),
+            (NotInFilter, "postgresql", "item.name != ALL (%(param_1)s::VARCHAR[])"),
+            (
+                NotInFilter,
+                "sqlite",
+                "(item.name NOT IN (SELECT anon_1.value FROM json_each(?) AS anon_1))",
+            ),
+            (
+                NotInFilter,
+                "mssql",
+                "(item.name NOT IN (SELECT CAST(anon_1.value AS VARCHAR(max)) AS value "
+                "FROM openjson(:param_1) AS anon_1))",
+            ),
+            (
+                NotInFilter,
+                "oracle",
+                "(item.name NOT IN (__[POSTCOMPILE_name_1])) "
+                "AND (item.name NOT IN (__[POSTCOMPILE_name_2]))",
+            ),
+        ],
+    )
+    def test_filtering(self, filter_class: Any, dialect: str, expected: str) -> None:
+        filter_ = filter_class(Item.name)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), ["c", "a", "b", "a"], {}),
+            f"SELECT item.id FROM item WHERE {expected}",
+            dialect=dialect,
+        )
+
+    def test_oracle_chunks(self) -> None:
+        filter_ = InFilter(Item.name)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id).where(Item.id.is_(None)), ["c", "a", "b"], {}),
+            "SELECT item.id FROM item WHERE item.id IS NULL "
+            "AND (item.name IN ('a', 'b') OR item.name IN ('c'))",
+            dialect="oracle",
+            literal_binds=True,
+        )
+
+    def test_within_limits(self) -> None:
+        filter_ = InFilter(Item.name)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), ["b", "a", "b"], {}),
+            "SELECT item.id FROM item WHERE item.name IN (__[POSTCOMPILE_name_1])",
+            dialect="oracle",
+        )
+
+
+class TestInFilterAsArrayBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "filter_class, dialect, expected",
+        [
+            (InFilter, "default", "item.name IN (__[POSTCOMPILE_name_1])"),
+            (InFilter, "postgresql", "item.name = ANY (%(param_1)s::VARCHAR[])"),
+            (
+                InFilter,
+                "sqlite",
+                "item.name IN (SELECT anon_1.value FROM json_each(?) AS anon_1)",
+            ),
+            (NotInFilter, "default", "(item.name NOT IN (__[POSTCOMPILE_name_1]))"),
+            (NotInFilter, "postgresql", "item.name != ALL (%(param_1)s::VARCHAR[])"),
+            (
+                NotInFilter,
+                "sqlite",
+                "(item.name NOT IN (SELECT anon_1.value FROM json_each(?) AS anon_1))",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("value", [[], ["foo"], [str(i) for i in range(1000)]])
+    def test_filtering(self, filter_class: Any, dialect: str, expected: str, value: Any) -> None:
+        filter_ = filter_class(Item.name, as_array=True)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), value, {}),
+            f"SELECT item.id FROM item WHERE {expected}",
+            dialect=dialect,
+        )
+
+    @pytest.mark.parametrize(
+        "field, value, expected",
+        [
+            (Item.type, [ItemType.foo, ItemType.bar], '["foo", "bar"]'),
+            (Item.id, [uuid.UUID(int=1)], '["00000000000000000000000000000001"]'),
+            (Item.area, [Decimal("1.5")], "[1.5]"),
+            (Item.name, ["a", None], '["a", null]'),
+            (Item.name, None, None),
+        ],
+    )
+    def test_sqlite_param(self, field: QueryableAttribute, value: Any, expected: Any) -> None:
+        dialect = sqlite.dialect()  # type: ignore[no-untyped-call]
+        filter_ = InFilter(field, as_array=True)
+        compiled = filter_.filter(select(Item.id), [], {}).compile(dialect=dialect)
+        bind_type = compiled.binds["param_1"].type
+        assert isinstance(bind_type, JsonArray)
+        assert bind_type.process_bind_param(value, dialect) == expected
+
+    @pytest.mark.parametrize(
+        "dialect, expected",
+        [
+            ("default", "(item.name NOT IN (__[POSTCOMPILE_name_1]))"),
+            ("postgresql", "NOT (item.name = ANY (%(param_1)s::VARCHAR[]))"),
+        ],
+    )
+    def test_negation(self, dialect: str, expected: str) -> None:
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            select(Item.id).where(sa.not_(in_array(Item.name, ["foo"]))),
+            f"SELECT item.id FROM item WHERE {expected}",
+            dialect=dialect,
+        )
+
+
+class TestInFilterTemporaryTableBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ([1, 2], "item.id IN (1, 2)"),
+            ([1, 2, 3], "item.id IN (SELECT {table}.value FROM {table})"),
+        ],
+    )
+    def test_filtering(self, value: Any, expected: str) -> None:
+        filter_ = InFilter(Item.id, temporary_table_threshold=2)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), iter(value), {}),
+            f"SELECT item.id FROM item WHERE {expected.format(table='in_filter_values')}",
+            literal_binds=True,
+        )
+
+    def test_same_statement(self) -> None:
+        filter_ = InFilter(Item.id, temporary_table_threshold=0)
+        first = filter_.filter(select(Item.id), [1], {})
+        second = filter_.filter(select(Item.id), [2, 3], {})
+        assert first._generate_cache_key() == second._generate_cache_key()
+
+    def test_rename(self) -> None:
+        query = select(Item.id)
+        query = InFilter(Item.id, temporary_table_threshold=0).filter(query, [1], {})
+        query = InFilter(Item.name, temporary_table_threshold=0).filter(query, ["a"], {})
+        query, tables = _get_temporary_values(query, {"in_filter_values"})
+        assert [(table.name, table.values) for table in tables] == [
+            ("in_filter_values_1", [1]),
+            ("in_filter_values_2", ["a"]),
+        ]
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            query,
+            "SELECT item.id FROM item "
+            "WHERE item.id IN (SELECT in_filter_values_1.value FROM in_filter_values_1) "
+            "AND item.name IN (SELECT in_filter_values_2.value FROM in_filter_values_2)",
+        )
+
+
+number = sa.Table("number", sa.MetaData(), sa.Column("id", sa.Integer, primary_key=True))
+
+
+class NumberFilterSet(FilterSet):
+    ids = InFilter(number.c.id, temporary_table_threshold=1)
+
+
+class TestInFilterTemporaryTableSqlite:
+    @pytest.fixture
+    def session(self) -> Iterator[Session]:
+        engine = sa.create_engine("sqlite://")
+        number.create(engine)
+        with Session(engine) as session:
+            session.execute(number.insert(), [{"id": id_} for id_ in range(5)])
+            yield session
+        engine.dispose()
+
+    def test_filtering(self, session: Session) -> None:
+        filter_set = NumberFilterSet(session, select(number.c.id))
+        assert filter_set.filter({"ids": (id_ for id_ in [1, 3, 7])}) == [1, 3]
+        assert filter_set.count({"ids": [1, 3, 7]}) == 2
+        assert sa.inspect(session.connection()).get_temp_table_names() == []
+
+
+class TestDialectCase(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "dialect, expected",
+        [
+            ("default", "item.id = 1 AND (item.name = 'a' OR item.name = 'b')"),
+            ("postgresql", "item.id = 1 AND item.name IN ('a', 'b')"),
+        ],
+    )
+    def test_grouping(self, dialect: str, expected: str) -> None:
+        case = DialectCase(
+            sa.or_(Item.name == "a", Item.name == "b"), postgresql=Item.name.in_(["a", "b"])
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            select(Item.id).where(sa.and_(Item.id == 1, case)),
+            f"SELECT item.id FROM item WHERE {expected}",
+            dialect=dialect,
+            literal_binds=True,
+        )
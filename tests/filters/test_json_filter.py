@@ -0,0 +1,263 @@
+from typing import Any, Iterator, List, Tuple
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import (
+    Filter,
+    JsonContainsFilter,
+    JsonHasKeyFilter,
+    JsonPathFilter,
+)
+
+product = sa.Table(
+    "product",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("attributes", sa.JSON().with_variant(postgresql.JSONB, "postgresql")),
+)
+
+
+class TestJsonContainsFilterBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    def test_postgresql(self) -> None:
+        filter_ = JsonContainsFilter(product.c.attributes)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(product.c.id), {"color": "red"}, {}),
+            "SELECT product.id FROM product WHERE product.attributes @> %(param_1)s",
+            dialect="postgresql",
+            checkparams={"param_1": {"color": "red"}},
+        )
+
+    @pytest.mark.parametrize(
+        "value, expected, params",
+        [
+            (
+                {"color": "red", "size": {"width": 1}},
+                "json_type(product.attributes, ?) = ? "
+                "AND json_extract(product.attributes, ?) = ? "
+                "AND json_type(product.attributes, ?) = ? "
+                "AND json_extract(product.attributes, ?) = ?",
+                ("$", "object", '$."color"', "red", '$."size"', "object", '$."size"."width"', 1),
+            ),
+            (
+                {"tags": ["new", None, True, {"id": 1}]},
+                "json_type(product.attributes, ?) = ? AND json_type(product.attributes, ?) = ? "
+                "AND (EXISTS (SELECT 1 FROM json_each(product.attributes, ?) AS anon_1 "
+                "WHERE anon_1.value = ?)) "
+                "AND (EXISTS (SELECT 1 FROM json_each(product.attributes, ?) AS anon_1 "
+                "WHERE anon_1.type = ?)) "
+                "AND (EXISTS (SELECT 1 FROM json_each(product.attributes, ?) AS anon_1 "
+                "WHERE anon_1.type = ?)) "
+                "AND (EXISTS (SELECT 1 FROM json_each(product.attributes, ?) AS anon_1 "
+                "WHERE json_type(product.attributes, anon_1.fullkey) = ? "
+                "AND json_extract(product.attributes, anon_1.fullkey || ?) = ?))",
+                (
+                    "$",
+                    "object",
+                    '$."tags"',
+                    "array",
+                    '$."tags"',
+                    "new",
+                    '$."tags"',
+                    "null",
+                    '$."tags"',
+                    "true",
+                    '$."tags"',
+                    "object",
+                    '."id"',
+                    1,
+                ),
+            ),
+            (
+                {"discount": False},
+                "json_type(product.attributes, ?) = ? AND json_type(product.attributes, ?) = ?",
+                ("$", "object", '$."discount"', "false"),
+            ),
+        ],
+    )
+    def test_sqlite(self, value: Any, expected: str, params: Tuple) -> None:
+        filter_ = JsonContainsFilter(product.c.attributes)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(product.c.id), value, {}),
+            f"SELECT product.id FROM product WHERE {expected}",
+            dialect="sqlite",
+            checkpositional=params,
+        )
+
+
+class TestJsonHasKeyFilterBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "any_key, value, expected, params",
+        [
+            (False, "color", "product.attributes ? %(param_1)s", {"param_1": "color"}),
+            (True, "color", "product.attributes ? %(param_1)s", {"param_1": "color"}),
+            (
+                False,
+                ["color", "size"],
+                "product.attributes ?& %(param_1)s::TEXT[]",
+                {"param_1": ["color", "size"]},
+            ),
+            (
+                True,
+                ["color", "size"],
+                "product.attributes ?| %(param_1)s::TEXT[]",
+                {"param_1": ["color", "size"]},
+            ),
+        ],
+    )
+    def test_postgresql(self, any_key: bool, value: Any, expected: str, params: Any) -> None:
+        filter_ = JsonHasKeyFilter(product.c.attributes, any_key=any_key)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(product.c.id), value, {}),
+            f"SELECT product.id FROM product WHERE {expected}",
+            dialect="postgresql",
+            checkparams=params,
+        )
+
+    @pytest.mark.parametrize(
+        "any_key, value, expected, params",
+        [
+            (False, "color", "json_type(product.attributes, ?) IS NOT NULL", ('$."color"',)),
+            (
+                False,
+                ["color", "size"],
+                "json_type(product.attributes, ?) IS NOT NULL "
+                "AND json_type(product.attributes, ?) IS NOT NULL",
+                ('$."color"', '$."size"'),
+            ),
+            (
+                True,
+                ["color", "size"],
+                "json_type(product.attributes, ?) IS NOT NULL "
+                "OR json_type(product.attributes, ?) IS NOT NULL",
+                ('$."color"', '$."size"'),
+            ),
+            (False, [], "1 = 1", ()),
+            (True, [], "0 = 1", ()),
+        ],
+    )
+    def test_sqlite(self, any_key: bool, value: Any, expected: str, params: Tuple) -> None:
+        filter_ = JsonHasKeyFilter(product.c.attributes, any_key=any_key)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(product.c.id), value, {}),
+            f"SELECT product.id FROM product WHERE {expected}",
+            dialect="sqlite",
+            checkpositional=params,
+        )
+
+
+class TestJsonPathFilterBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "dialect, expected",
+        [
+            (
+                "postgresql",
+                "product.attributes @? CAST(%(param_1)s AS JSONPATH)",
+            ),
+            ("sqlite", "json_type(product.attributes, ?) IS NOT NULL"),
+        ],
+    )
+    def test_filtering(self, dialect: str, expected: str) -> None:
+        filter_ = JsonPathFilter(product.c.attributes)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(product.c.id), "$.size.width", {}),
+            f"SELECT product.id FROM product WHERE {expected}",
+            dialect=dialect,
+        )
+
+
+class TestJsonFilterDatabases:
+    documents = [
+        {
+            "color": "red",
+            "size": {"width": 1},
+            "tags": ["new", {"id": 1, "name": "a"}],
+            "discount": False,
+        },
+        {"color": "blue", "tags": [[1, 2], {"id": 2}]},
+        {"x.y": 1, "tags": []},
+    ]
+
+    @pytest.fixture(params=["sqlite", "postgresql"])
+    def connection(self, request: pytest.FixtureRequest) -> Iterator[sa.Connection]:
+        url = (
+            "sqlite://"
+            if request.param == "sqlite"
+            else request.getfixturevalue("sync_database_url")
+        )
+        engine = sa.create_engine(url)
+        with engine.connect() as connection, connection.begin() as transaction:
+            product.create(connection)
+            connection.execute(
+                product.insert(),
+                [{"id": id_, "attributes": value} for id_, value in enumerate(self.documents)],
+            )
+            yield connection
+            transaction.rollback()
+        engine.dispose()
+
+    def _filter(self, connection: sa.Connection, filter_: Filter, value: Any) -> List[int]:
+        query = filter_.filter(select(product.c.id), value, {}).order_by(product.c.id)
+        return list(connection.execute(query).scalars())
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ({"color": "red"}, [0]),
+            ({"size": {}}, [0]),
+            ({"discount": False}, [0]),
+            ({"x.y": 1}, [2]),
+            ({"tags": []}, [0, 1, 2]),
+            ({"tags": [{"id": 1}]}, [0]),
+            ({"tags": ["new", {"name": "a"}]}, [0]),
+            ({"tags": [[1]]}, [1]),
+            ({"tags": [{"id": 3}]}, []),
+            ({"tags": [1]}, []),
+        ],
+    )
+    def test_contains(self, connection: sa.Connection, value: Any, expected: List[int]) -> None:
+        assert self._filter(connection, JsonContainsFilter(product.c.attributes), value) == expected
+
+    @pytest.mark.parametrize(
+        "any_key, value, expected",
+        [
+            (False, "x.y", [2]),
+            (False, ["color", "size"], [0]),
+            (True, ["size", "x.y"], [0, 2]),
+        ],
+    )
+    def test_has_key(
+        self, connection: sa.Connection, any_key: bool, value: Any, expected: List[int]
+    ) -> None:
+        filter_ = JsonHasKeyFilter(product.c.attributes, any_key=any_key)
+        assert self._filter(connection, filter_, value) == expected
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("$.size.width", [0]), ('$."x.y"', [2]), ("$.tags[1].id", [0, 1]), ("$.tags[2]", [])],
+    )
+    def test_path(self, connection: sa.Connection, value: str, expected: List[int]) -> None:
+        assert self._filter(connection, JsonPathFilter(product.c.attributes), value) == expected
+
+    @pytest.mark.parametrize(
+        "filter_, value",
+        [
+            (JsonContainsFilter(product.c.attributes), {'a"b': 1}),
+            (JsonHasKeyFilter(product.c.attributes), 'a"b'),
+            (JsonPathFilter(product.c.attributes), "$.tags[*] ? (@ == 1)"),
+        ],
+    )
+    def test_sqlite_unsupported(self, filter_: Filter, value: Any) -> None:
+        query = filter_.filter(select(product.c.id), value, {})
+        query.compile(dialect=postgresql.dialect())  # type: ignore[no-untyped-call]
+        with pytest.raises(sa.exc.CompileError):
+            query.compile(dialect=sqlite.dialect())  # type: ignore[no-untyped-call]
@@ -1,4 +1,5 @@
 from typing import Any
+from unittest import mock
 
 import pytest
 from sqlalchemy import select
@@ -89,3 +90,36 @@ class TestMethodFilterBuildSelect(AssertsCompiledSQL):
             "SELECT item.id FROM item WHERE item.type IN (NULL) AND (1 != 1)",
             literal_binds=True,
         )
+
+
+class TestMethodFilterParams(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    def test_params_are_resolved_once(self) -> None:
+        filter_set = FilterSetClass(query=select(Item.id))
+        filter_ = filter_set.filters["area"]
+        assert isinstance(filter_, MethodFilter)
+        assert filter_._params == ("query", "value")
+        with mock.patch("inspect.getfullargspec") as getfullargspec:
+            filter_.filter(filter_set.get_base_query(), 1, {})
+            FilterSetClass(query=select(Item.id))
+        getfullargspec.assert_not_called()
+
+    def test_kwargs(self) -> None:
+        class KwargsFilterSet(BaseFilterSet):
+            area = MethodFilter(method="filter_area")
+            name = MethodFilter(method="filter_name")
+
+            def filter_area(self, **kwargs: Any) -> Select:
+                return kwargs["query"].where(Item.area == kwargs["values"]["area"])
+
+            @staticmethod
+            def filter_name(query: Select, *, value: str, **kwargs: Any) -> Select:
+                return query.where(Item.name == value)
+
+        filter_set = KwargsFilterSet(query=select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.filter_query({"area": 1, "name": "foo"}),
+            "SELECT item.id FROM item WHERE item.area = 1 AND item.name = 'foo'",
+            literal_binds=True,
+        )
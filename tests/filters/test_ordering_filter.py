@@ -1,11 +1,20 @@
 from typing import Any, List, Tuple
 
 import pytest
+import sqlalchemy as sa
 from sqlalchemy import select
+from sqlalchemy.orm import registry
 from sqlalchemy.testing import AssertsCompiledSQL
 
 from sqlalchemy_filterset.filters import NullsPosition, OrderingField, OrderingFilter
-from tests.models.base import Item
+from sqlalchemy_filterset.strategies import (
+    AutoStrategy,
+    BaseStrategy,
+    JoinStrategy,
+    MultiJoinStrategy,
+    SubqueryExistsStrategy,
+)
+from tests.models.base import Item, Parent
 
 
 class TestOrderingField(AssertsCompiledSQL):
@@ -99,3 +108,161 @@ class TestOrderingBuildSelect(AssertsCompiledSQL):
             filter_.filter(select(Item.id), ["date", "title", "area"], {}),
             "SELECT item.id FROM item ORDER BY item.date ASC, item.title ASC, item.area ASC",
         )
+
+
+class TestOrderingPrecomputed:
+    def test_elements_are_reused(self) -> None:
+        filter_ = OrderingFilter(area=OrderingField(Item.area), date=OrderingField(Item.date))
+        first = filter_.filter(select(Item.id), ["area", "-date"], {})
+        second = filter_.filter(select(Item.id), ("area", "-date"), {})
+        assert len(first._order_by_clauses) == len(second._order_by_clauses) == 2
+        assert all(
+            left is right for left, right in zip(first._order_by_clauses, second._order_by_clauses)
+        )
+        assert filter_._get_ordering.cache_info().hits == 1
+
+
+class TestOrderingStrategies(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "strategy",
+        [
+            JoinStrategy(Parent, Item.parent_id == Parent.id),
+            AutoStrategy(Parent, Item.parent_id == Parent.id),
+            MultiJoinStrategy(JoinStrategy(Parent, Item.parent_id == Parent.id)),
+        ],
+    )
+    def test_join(self, strategy: BaseStrategy) -> None:
+        filter_ = OrderingFilter(
+            parent_name=OrderingField(Parent.name, strategy=strategy),
+            parent_date=OrderingField(Parent.date, strategy=strategy),
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), ["-parent_name", "parent_date"], {}),
+            "SELECT item.id FROM item LEFT OUTER JOIN parent ON item.parent_id = parent.id "
+            "ORDER BY parent.name DESC, parent.date ASC",
+        )
+
+    def test_full_join(self) -> None:
+        strategy = JoinStrategy(Parent, Item.parent_id == Parent.id, is_full=True)
+        filter_ = OrderingFilter(parent_name=OrderingField(Parent.name, strategy=strategy))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), ["parent_name"], {}),
+            "SELECT item.id FROM item FULL OUTER JOIN parent ON item.parent_id = parent.id "
+            "ORDER BY parent.name ASC",
+        )
+
+    def test_join_reuse(self) -> None:
+        filter_ = OrderingFilter(
+            parent_name=OrderingField(
+                Parent.name, strategy=JoinStrategy(Parent, Item.parent_id == Parent.id)
+            )
+        )
+        query = select(Item.id).join(Parent, Item.parent_id == Parent.id)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(query, ["parent_name"], {}),
+            "SELECT item.id FROM item JOIN parent ON item.parent_id = parent.id "
+            "ORDER BY parent.name ASC",
+        )
+
+    def test_join_is_not_applied_without_ordering(self) -> None:
+        filter_ = OrderingFilter(
+            area=OrderingField(Item.area),
+            parent_name=OrderingField(
+                Parent.name, strategy=JoinStrategy(Parent, Item.parent_id == Parent.id)
+            ),
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), ["area"], {}),
+            "SELECT item.id FROM item ORDER BY item.area ASC",
+        )
+
+    @pytest.mark.parametrize(
+        "strategy",
+        [
+            SubqueryExistsStrategy(Item, Item.parent_id == Parent.id),
+            AutoStrategy(Item, Item.parent_id == Parent.id),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "value, expected_ordering",
+        [
+            (
+                ["area"],
+                "(SELECT item.area FROM item WHERE item.parent_id = parent.id "
+                "AND item.area IS NOT NULL ORDER BY item.area ASC LIMIT 1) ASC NULLS LAST",
+            ),
+            (
+                ["-area"],
+                "(SELECT item.area FROM item WHERE item.parent_id = parent.id "
+                "AND item.area IS NOT NULL ORDER BY item.area DESC LIMIT 1) DESC NULLS LAST",
+            ),
+        ],
+    )
+    def test_subquery(
+        self, strategy: BaseStrategy, value: List[str], expected_ordering: str
+    ) -> None:
+        filter_ = OrderingFilter(
+            area=OrderingField(Item.area, nulls=NullsPosition.last, strategy=strategy)
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Parent.id), value, {}),
+            f"SELECT parent.id FROM parent ORDER BY {expected_ordering}",
+            literal_binds=True,
+        )
+
+
+metadata = sa.MetaData()
+
+
+class Category:
+    __table__ = sa.Table(
+        "category",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String),
+    )
+
+
+class Product:
+    __table__ = sa.Table(
+        "product",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("category_id", sa.ForeignKey("category.id"), nullable=True),
+    )
+
+
+category = Category.__table__
+product = Product.__table__
+mapper_registry = registry()
+mapper_registry.map_imperatively(Category, category)
+mapper_registry.map_imperatively(Product, product)
+
+
+class TestOrderingJoinSqlite:
+    @pytest.mark.parametrize(
+        "strategy",
+        [
+            JoinStrategy(Category, category.c.id == product.c.category_id),
+            AutoStrategy(Category, category.c.id == product.c.category_id),
+            MultiJoinStrategy(JoinStrategy(Category, category.c.id == product.c.category_id)),
+        ],
+    )
+    def test_rows_without_related_are_kept(self, strategy: BaseStrategy) -> None:
+        filter_ = OrderingFilter(
+            category_name=OrderingField(
+                category.c.name, nulls=NullsPosition.last, strategy=strategy
+            )
+        )
+        engine = sa.create_engine("sqlite://")
+        with engine.connect() as connection:
+            metadata.create_all(connection)
+            connection.execute(category.insert(), [{"id": 1, "name": "a"}])
+            connection.execute(
+                product.insert(), [{"id": 1, "category_id": None}, {"id": 2, "category_id": 1}]
+            )
+            query = filter_.filter(select(product.c.id), ["category_name"], {})
+            assert list(connection.execute(query).scalars()) == [2, 1]
+        engine.dispose()
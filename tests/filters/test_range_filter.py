@@ -1,8 +1,10 @@
 import operator as op
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
 from typing import Any
 
 import pytest
+import sqlalchemy as sa
 from sqlalchemy import and_, or_, select
 from sqlalchemy.testing import AssertsCompiledSQL
 
@@ -90,3 +92,141 @@ class TestRangeFilterBuildSelect(AssertsCompiledSQL):
             "WHERE parent.date >= '2000-01-01 00:00:00' AND parent.date <= '2000-01-02 00:00:00'",
             literal_binds=True,
         )
+
+
+event = sa.Table(
+    "event",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("number", sa.Integer),
+    sa.Column("amount", sa.Numeric),
+    sa.Column("day", sa.Date),
+    sa.Column("occurred_at", sa.DateTime),
+    sa.Column("created_at", sa.DateTime(timezone=True)),
+)
+utc_plus_3 = timezone(timedelta(hours=3))
+
+
+class TestPrunableRangeFilterBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "field, left_lookup_expr, right_lookup_expr, value, expected",
+        [
+            (
+                event.c.number,
+                op.ge,
+                op.le,
+                (1, 10),
+                "event.number >= 1 AND event.number < 11",
+            ),
+            (
+                event.c.number,
+                op.gt,
+                op.lt,
+                (1, 10),
+                "event.number >= 2 AND event.number < 10",
+            ),
+            (event.c.number, op.ge, op.le, (None, 10), "event.number < 11"),
+            (
+                event.c.amount,
+                op.gt,
+                op.le,
+                (Decimal("1.5"), Decimal("10")),
+                "event.amount > 1.5 AND event.amount <= 10",
+            ),
+            (
+                event.c.day,
+                op.ge,
+                op.le,
+                (date(2023, 1, 1), date(2023, 1, 31)),
+                "event.day >= '2023-01-01' AND event.day < '2023-02-01'",
+            ),
+            (
+                event.c.occurred_at,
+                op.ge,
+                op.le,
+                (date(2023, 1, 1), datetime(2023, 2, 1, 3, tzinfo=utc_plus_3)),
+                "event.occurred_at >= '2023-01-01 00:00:00' "
+                "AND event.occurred_at < '2023-02-01 00:00:00.000001'",
+            ),
+            (
+                event.c.created_at,
+                op.gt,
+                op.lt,
+                (datetime(2023, 1, 1), datetime(2023, 2, 1, tzinfo=utc_plus_3)),
+                "event.created_at >= '2023-01-01 00:00:00.000001+00:00' "
+                "AND event.created_at < '2023-02-01 00:00:00+03:00'",
+            ),
+        ],
+    )
+    def test_filtering(
+        self,
+        field: ModelAttribute,
+        left_lookup_expr: Any,
+        right_lookup_expr: Any,
+        value: Any,
+        expected: str,
+    ) -> None:
+        filter_ = RangeFilter(
+            field,
+            left_lookup_expr=left_lookup_expr,
+            right_lookup_expr=right_lookup_expr,
+            prunable=True,
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(event.c.id), value, {}),
+            f"SELECT event.id FROM event WHERE {expected}",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "partition_key_lag, value, expected",
+        [
+            (
+                (timedelta(0), timedelta(days=1)),
+                (datetime(2023, 1, 1), datetime(2023, 1, 31)),
+                "event.occurred_at >= '2023-01-01 00:00:00' "
+                "AND event.occurred_at < '2023-01-31 00:00:00.000001' "
+                "AND event.created_at >= '2023-01-01 00:00:00+00:00' "
+                "AND event.created_at < '2023-02-01 00:00:00.000001+00:00'",
+            ),
+            (
+                (None, None),
+                (None, datetime(2023, 1, 31)),
+                "event.occurred_at < '2023-01-31 00:00:00.000001' "
+                "AND event.created_at < '2023-01-31 00:00:00.000001+00:00'",
+            ),
+            (
+                (timedelta(hours=1), None),
+                (datetime(2023, 1, 1), None),
+                "event.occurred_at >= '2023-01-01 00:00:00' "
+                "AND event.created_at >= '2022-12-31 23:00:00+00:00'",
+            ),
+        ],
+    )
+    def test_partition_key(self, partition_key_lag: Any, value: Any, expected: str) -> None:
+        filter_ = RangeFilter(
+            event.c.occurred_at,
+            prunable=True,
+            partition_key=event.c.created_at,
+            partition_key_lag=partition_key_lag,
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(event.c.id), value, {}),
+            f"SELECT event.id FROM event WHERE {expected}",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"prunable": True, "logic_expr": or_},
+            {"prunable": True, "left_lookup_expr": op.le},
+            {"prunable": True, "right_lookup_expr": op.ge},
+            {"partition_key": event.c.created_at},
+        ],
+    )
+    def test_invalid(self, kwargs: Any) -> None:
+        with pytest.raises(ValueError):
+            RangeFilter(event.c.occurred_at, **kwargs)
@@ -0,0 +1,128 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Type
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import (
+    Filter,
+    RangeAdjacentFilter,
+    RangeContainedByFilter,
+    RangeContainsFilter,
+    RangeOverlapFilter,
+)
+from sqlalchemy_filterset.types import ModelAttribute
+
+booking = sa.Table(
+    "booking",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("during", postgresql.TSTZRANGE),
+    sa.Column("seats", postgresql.INT4RANGE),
+    sa.Column("created_at", sa.DateTime(timezone=True)),
+    sa.Column("updated_at", sa.DateTime),
+    sa.Column("day", sa.Date),
+    sa.Column("number", sa.BigInteger),
+    sa.Column("amount", sa.Numeric),
+    sa.Column("title", sa.String),
+)
+monday = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+monday_end = datetime(2024, 1, 1, 17, tzinfo=timezone.utc)
+tuesday = datetime(2024, 1, 2, 9, tzinfo=timezone.utc)
+tuesday_end = datetime(2024, 1, 2, 17, tzinfo=timezone.utc)
+
+
+class TestRangeTypeFiltersBuildSelect(AssertsCompiledSQL):
+    __dialect__: str = "postgresql"
+
+    @pytest.mark.parametrize(
+        "filter_class, operator",
+        [
+            (RangeOverlapFilter, "&&"),
+            (RangeContainsFilter, "@>"),
+            (RangeContainedByFilter, "<@"),
+            (RangeAdjacentFilter, "-|-"),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "value, expected_type, expected_param",
+        [
+            (
+                (monday, monday_end),
+                "TSTZRANGE",
+                '["2024-01-01 09:00:00+00:00","2024-01-01 17:00:00+00:00")',
+            ),
+            (
+                postgresql.Range(monday, None, bounds="(]"),
+                "TSTZRANGE",
+                '("2024-01-01 09:00:00+00:00",]',
+            ),
+            (postgresql.Range(empty=True), "TSTZRANGE", "empty"),
+            (
+                [(monday, monday_end), (tuesday, tuesday_end)],
+                "TSTZMULTIRANGE",
+                '{["2024-01-01 09:00:00+00:00","2024-01-01 17:00:00+00:00"),'
+                '["2024-01-02 09:00:00+00:00","2024-01-02 17:00:00+00:00")}',
+            ),
+            ([], "TSTZMULTIRANGE", "{}"),
+        ],
+    )
+    def test_filtering(
+        self,
+        filter_class: Type[Filter],
+        operator: str,
+        value: Any,
+        expected_type: str,
+        expected_param: str,
+    ) -> None:
+        filter_ = filter_class(booking.c.during)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(booking.c.id), value, {}),
+            "SELECT booking.id FROM booking "
+            f"WHERE booking.during {operator} CAST(%(param_1)s AS {expected_type})",
+            checkparams={"param_1": expected_param},
+        )
+
+    @pytest.mark.parametrize(
+        "field, value, expected_type, expected_param",
+        [
+            (booking.c.seats, (1, 10), "INT4RANGE", '["1","10")'),
+            (booking.c.seats, [(1, 10)], "INT4MULTIRANGE", '{["1","10")}'),
+            (
+                booking.c.created_at,
+                [(monday, monday_end)],
+                "TSTZMULTIRANGE",
+                '{["2024-01-01 09:00:00+00:00","2024-01-01 17:00:00+00:00")}',
+            ),
+            (
+                booking.c.updated_at,
+                (datetime(2024, 1, 1), None),
+                "TSRANGE",
+                '["2024-01-01 00:00:00",)',
+            ),
+            (booking.c.day, (None, date(2024, 1, 1)), "DATERANGE", '[,"2024-01-01")'),
+            (booking.c.number, (1, 2), "INT8RANGE", '["1","2")'),
+            (booking.c.amount, (Decimal("1.5"), 2), "NUMRANGE", '["1.5","2")'),
+            (booking.c.number, [(1, 2)], "INT8MULTIRANGE", '{["1","2")}'),
+            (booking.c.id, (1, 2), "INT4RANGE", '["1","2")'),
+        ],
+    )
+    def test_field_types(
+        self, field: ModelAttribute, value: Any, expected_type: str, expected_param: str
+    ) -> None:
+        filter_ = RangeContainedByFilter(field)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(booking.c.id), value, {}),
+            "SELECT booking.id FROM booking "
+            f"WHERE {field} <@ CAST(%(param_1)s AS {expected_type})",
+            checkparams={"param_1": expected_param},
+        )
+
+    def test_no_range_type(self) -> None:
+        filter_ = RangeContainedByFilter(booking.c.title)
+        with pytest.raises(ValueError):
+            filter_.filter(select(booking.c.id), ("a", "b"), {})
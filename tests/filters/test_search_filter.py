@@ -1,16 +1,36 @@
-from typing import Any, Sequence
+import functools
+import sys
+from typing import Any, Iterator, Sequence
 
 import pytest
 import sqlalchemy as sa
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql import operators as sa_op
 from sqlalchemy.testing import AssertsCompiledSQL
 
 from sqlalchemy_filterset.filters import SearchFilter
-from sqlalchemy_filterset.operators import icontains
+from sqlalchemy_filterset.operators import (
+    full_text,
+    full_text_rank,
+    icontains,
+    istartswith,
+    prefix_range,
+    startswith,
+    trigram_similar,
+    trigram_similarity_rank,
+)
 from sqlalchemy_filterset.types import LookupExpr, ModelAttribute
 from tests.models.base import Item
 
+document = sa.Table(
+    "document",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("search_vector", postgresql.TSVECTOR),
+)
+fts_document = sa.Table("fts_document", sa.MetaData(), sa.Column("body", sa.String))
+
 
 class TestSearchFilterBuildSelect(AssertsCompiledSQL):
 
@@ -123,3 +143,231 @@ class TestSearchFilterBuildSelect(AssertsCompiledSQL):
             "SELECT item.id FROM item",
             literal_binds=True,
         )
+
+
+class TestSearchFilterFullTextBuildSelect(AssertsCompiledSQL):
+    __dialect__ = "default"
+
+    @pytest.mark.parametrize(
+        "dialect, expected",
+        [
+            (
+                "default",
+                "lower(item.name) LIKE lower('%foo bar%') "
+                "OR lower(item.description) LIKE lower('%foo bar%')",
+            ),
+            (
+                "postgresql",
+                "(to_tsvector('english', item.name) @@ websearch_to_tsquery('english', 'foo bar')) "
+                "OR (to_tsvector('english', item.description) "
+                "@@ websearch_to_tsquery('english', 'foo bar'))",
+            ),
+            (
+                "sqlite",
+                'item.name MATCH \'"foo" "bar"\' OR item.description MATCH \'"foo" "bar"\'',
+            ),
+        ],
+    )
+    def test_filtering(self, dialect: str, expected: str) -> None:
+        filter_ = SearchFilter(Item.name, Item.description, lookup_expr=full_text)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), "foo bar", {}),
+            f"SELECT item.id FROM item WHERE {expected}",
+            dialect=dialect,
+            literal_binds=True,
+        )
+
+    def test_tsvector_field(self) -> None:
+        filter_ = SearchFilter(
+            document.c.search_vector, lookup_expr=functools.partial(full_text, config="simple")
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(document.c.id), "foo", {}),
+            "SELECT document.id FROM document "
+            "WHERE document.search_vector @@ websearch_to_tsquery('simple', 'foo')",
+            dialect="postgresql",
+            literal_binds=True,
+        )
+
+    def test_config_is_literal(self) -> None:
+        filter_ = SearchFilter(Item.name, lookup_expr=full_text)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), "foo", {}),
+            "SELECT item.id FROM item WHERE to_tsvector('english', item.name) "
+            "@@ websearch_to_tsquery('english', %(websearch_to_tsquery_1)s)",
+            dialect="postgresql",
+            render_postcompile=True,
+        )
+
+    @pytest.mark.parametrize(
+        "dialect, expected",
+        [
+            (
+                "default",
+                "lower(item.name) LIKE lower('%foo%') ORDER BY "
+                "CASE WHEN (lower(item.name) LIKE lower('%foo%')) THEN 0 ELSE 1 END",
+            ),
+            (
+                "postgresql",
+                "to_tsvector('english', item.name) @@ websearch_to_tsquery('english', 'foo') "
+                "ORDER BY ts_rank(to_tsvector('english', item.name), "
+                "websearch_to_tsquery('english', 'foo')) DESC",
+            ),
+            ("sqlite", "item.name MATCH '\"foo\"' ORDER BY bm25(item)"),
+        ],
+    )
+    def test_ranking(self, dialect: str, expected: str) -> None:
+        filter_ = SearchFilter(Item.name, lookup_expr=full_text, rank_expr=full_text_rank)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), "foo", {}),
+            f"SELECT item.id FROM item WHERE {expected}",
+            dialect=dialect,
+            literal_binds=True,
+        )
+
+
+class TestSearchFilterFullTextSqlite:
+    @pytest.fixture
+    def connection(self) -> Iterator[sa.Connection]:
+        engine = sa.create_engine("sqlite://")
+        with engine.connect() as connection:
+            connection.execute(sa.text("CREATE VIRTUAL TABLE fts_document USING fts5(body)"))
+            connection.execute(
+                fts_document.insert(),
+                [
+                    {"body": "red-shoe"},
+                    {"body": 'shoe" AND'},
+                    {"body": "c++ by O'Brien"},
+                ],
+            )
+            yield connection
+        engine.dispose()
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("red-shoe", ["red-shoe"]),
+            ('shoe"', ["red-shoe", 'shoe" AND']),
+            ("AND", ['shoe" AND']),
+            ("c++", ["c++ by O'Brien"]),
+            ("O'Brien c", ["c++ by O'Brien"]),
+            ("NEAR(", []),
+            (" ", []),
+        ],
+    )
+    def test_punctuation(self, connection: sa.Connection, value: str, expected: list) -> None:
+        filter_ = SearchFilter(fts_document.c.body, lookup_expr=full_text, rank_expr=full_text_rank)
+        query = filter_.filter(select(fts_document.c.body), value, {})
+        assert sorted(connection.execute(query).scalars()) == expected
+
+
+class TestSearchFilterTrigramBuildSelect(AssertsCompiledSQL):
+    __dialect__ = "postgresql"
+
+    @pytest.mark.parametrize(
+        "lookup_expr, expected",
+        [
+            (trigram_similar, "(item.name %% 'foo') OR (item.description %% 'foo')"),
+            (
+                functools.partial(trigram_similar, word=True),
+                "('foo' <%% item.name) OR ('foo' <%% item.description)",
+            ),
+            (
+                functools.partial(trigram_similar, threshold=0.5),
+                "(item.name %% 'foo') AND similarity(item.name, 'foo') >= 0.5 "
+                "OR (item.description %% 'foo') AND similarity(item.description, 'foo') >= 0.5",
+            ),
+            (
+                functools.partial(trigram_similar, threshold=0.5, word=True),
+                "('foo' <%% item.name) AND word_similarity('foo', item.name) >= 0.5 "
+                "OR ('foo' <%% item.description) "
+                "AND word_similarity('foo', item.description) >= 0.5",
+            ),
+        ],
+    )
+    def test_filtering(self, lookup_expr: LookupExpr, expected: str) -> None:
+        filter_ = SearchFilter(Item.name, Item.description, lookup_expr=lookup_expr)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), "foo", {}),
+            f"SELECT item.id FROM item WHERE {expected}",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "rank_expr, expected",
+        [
+            (trigram_similarity_rank, "similarity(item.name, 'foo') DESC"),
+            (
+                functools.partial(trigram_similarity_rank, word=True),
+                "word_similarity('foo', item.name) DESC",
+            ),
+        ],
+    )
+    def test_ranking(self, rank_expr: LookupExpr, expected: str) -> None:
+        filter_ = SearchFilter(Item.name, lookup_expr=trigram_similar, rank_expr=rank_expr)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), "foo", {}),
+            f"SELECT item.id FROM item WHERE item.name %% 'foo' ORDER BY {expected}",
+            literal_binds=True,
+        )
+
+    def test_fallback(self) -> None:
+        filter_ = SearchFilter(
+            Item.name, lookup_expr=trigram_similar, rank_expr=trigram_similarity_rank
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), "foo", {}),
+            "SELECT item.id FROM item WHERE lower(item.name) LIKE lower('%foo%') ORDER BY "
+            "CASE WHEN (lower(item.name) LIKE lower('%foo%')) THEN 0 ELSE 1 END",
+            dialect="default",
+            literal_binds=True,
+        )
+
+
+class TestSearchFilterPrefixBuildSelect(AssertsCompiledSQL):
+    __dialect__ = "default"
+
+    @pytest.mark.parametrize(
+        "lookup_expr, value, expected",
+        [
+            (startswith, "foo", "item.name LIKE 'foo%' ESCAPE '/'"),
+            (startswith, "1_0%/", "item.name LIKE '1/_0/%//%' ESCAPE '/'"),
+            (istartswith, "Foo", "lower(item.name) LIKE 'foo%' ESCAPE '/'"),
+            (prefix_range, "foo", "item.name >= 'foo' AND item.name < 'fop'"),
+            (prefix_range, "a%", "item.name >= 'a%' AND item.name < 'a&'"),
+            (
+                prefix_range,
+                f"a{chr(sys.maxunicode)}",
+                f"item.name >= 'a{chr(sys.maxunicode)}' AND item.name < 'b'",
+            ),
+            (prefix_range, chr(sys.maxunicode), f"item.name >= '{chr(sys.maxunicode)}'"),
+        ],
+    )
+    def test_filtering(self, lookup_expr: LookupExpr, value: str, expected: str) -> None:
+        filter_ = SearchFilter(Item.name, lookup_expr=lookup_expr)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), value, {}),
+            f"SELECT item.id FROM item WHERE {expected}",
+            literal_binds=True,
+        )
+
+
+class TestSearchFilterTokenizeBuildSelect(AssertsCompiledSQL):
+    __dialect__ = "default"
+
+    def test_filtering(self) -> None:
+        filter_ = SearchFilter(Item.name, Item.description, lookup_expr=startswith, tokenize=True)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), " red  shoe ", {}),
+            "SELECT item.id FROM item "
+            "WHERE (item.name LIKE 'red%' ESCAPE '/' OR item.description LIKE 'red%' ESCAPE '/') "
+            "AND (item.name LIKE 'shoe%' ESCAPE '/' OR item.description LIKE 'shoe%' ESCAPE '/')",
+            literal_binds=True,
+        )
+
+    def test_no_tokens(self) -> None:
+        filter_ = SearchFilter(Item.name, tokenize=True)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_.filter(select(Item.id), "  ", {}),
+            "SELECT item.id FROM item",
+        )
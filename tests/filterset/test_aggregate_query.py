@@ -0,0 +1,92 @@
+from typing import Any, Dict
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import (
+    Filter,
+    InFilter,
+    LimitOffsetFilter,
+    OrderingField,
+    OrderingFilter,
+)
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from sqlalchemy_filterset.strategies import JoinStrategy
+from tests.models.base import Item, ItemLink, ItemToItemLink, Parent
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    name = Filter(Item.name)
+    parent_name = InFilter(Parent.name, strategy=JoinStrategy(Parent, Item.parent_id == Parent.id))
+    ordering = OrderingFilter(area=OrderingField(Item.area))
+    pagination = LimitOffsetFilter()
+
+
+class LinkFilterSet(BaseFilterSet[ItemToItemLink]):
+    link_name = Filter(
+        ItemLink.name, strategy=JoinStrategy(ItemLink, ItemToItemLink.left_id == ItemLink.id)
+    )
+
+
+class TestFilterSetAggregateQuery(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"name": "foo"}, {"name": "foo", "ordering": ["area"], "pagination": (10, 20)}],
+    )
+    def test_aggregate(self, params: Dict[str, Any]) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.aggregate_query(
+                params, total=sa.func.sum(Item.area), last=sa.func.max(Item.date)
+            ),
+            "SELECT sum(item.area) AS total, max(item.date) AS last "
+            "FROM item WHERE item.name = 'foo'",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "base_query, params, expected_ids",
+        [
+            (
+                select(Item),
+                {"parent_name": ["foo"]},
+                "SELECT item.id FROM item JOIN parent ON item.parent_id = parent.id "
+                "WHERE parent.name IN ('foo')",
+            ),
+            (
+                select(Item).distinct(),
+                {"name": "foo"},
+                "SELECT DISTINCT item.id FROM item WHERE item.name = 'foo'",
+            ),
+        ],
+    )
+    def test_by_primary_keys(
+        self, base_query: Any, params: Dict[str, Any], expected_ids: str
+    ) -> None:
+        filter_set = ItemFilterSet(base_query)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.aggregate_query(params, total=sa.func.sum(Item.area)),
+            f"SELECT sum(item.area) AS total FROM item WHERE item.id IN ({expected_ids})",
+            literal_binds=True,
+        )
+
+    def test_composite_primary_key(self) -> None:
+        filter_set = LinkFilterSet(select(ItemToItemLink))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.aggregate_query({"link_name": "foo"}, total=sa.func.count()),
+            "SELECT count(*) AS total FROM item_to_item_link "
+            "WHERE (item_to_item_link.left_id, item_to_item_link.right_id) IN "
+            "(SELECT item_to_item_link.left_id, item_to_item_link.right_id "
+            "FROM item_to_item_link JOIN item_link "
+            "ON item_to_item_link.left_id = item_link.id WHERE item_link.name = 'foo')",
+            literal_binds=True,
+        )
+
+    def test_not_entity(self) -> None:
+        filter_set = ItemFilterSet(select(Item.id, Item.name))
+        with pytest.raises(ValueError):
+            filter_set.aggregate_query({"parent_name": ["foo"]}, total=sa.func.sum(Item.area))
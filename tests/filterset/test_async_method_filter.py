@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Dict
+from unittest import mock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, MethodFilter, OrderingField, OrderingFilter
+from sqlalchemy_filterset.filtersets import AsyncFilterSet, FilterSet
+from tests.models.base import Item, Parent
+
+
+class ItemFilterSet(AsyncFilterSet[Item]):
+    name = Filter(Item.name)
+    ordering = OrderingFilter(date=OrderingField(Item.date))
+    area = MethodFilter(method="filter_area", concurrent=True)
+    parent_name = MethodFilter(method="filter_parent_name", concurrent=True)
+    title = MethodFilter(method="filter_title")
+    limit = MethodFilter(method="filter_limit", concurrent=True)
+    reordering = MethodFilter(method="filter_reordering", concurrent=True)
+    sequential_limit = MethodFilter(method="filter_limit")
+    sequential_name = MethodFilter(method="filter_sequential_name")
+    sequential_title = MethodFilter(method="filter_sequential_title")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.area_event = asyncio.Event()
+        self.parent_name_event = asyncio.Event()
+        self.running = False
+
+    async def _run_alone(self) -> None:
+        assert not self.running
+        self.running = True
+        await asyncio.sleep(0)
+        self.running = False
+
+    async def filter_sequential_name(self, query: Select, value: str) -> Select:
+        await self._run_alone()
+        return query.where(Item.name == value)
+
+    async def filter_sequential_title(self, query: Select, value: str) -> Select:
+        await self._run_alone()
+        return query.where(Item.title == value)
+
+    async def filter_area(self, query: Select, value: int) -> Select:
+        self.area_event.set()
+        await self.parent_name_event.wait()
+        return query.where(Item.area == value).order_by(Item.area)
+
+    async def filter_parent_name(self, query: Select, value: str) -> Select:
+        self.parent_name_event.set()
+        await self.area_event.wait()
+        return query.join(Parent, Item.parent_id == Parent.id).where(Parent.name == value)
+
+    @staticmethod
+    def filter_title(query: Select, value: str) -> Select:
+        return query.where(Item.title == value)
+
+    @staticmethod
+    async def filter_limit(query: Select, value: int) -> Select:
+        return query.limit(value)
+
+    @staticmethod
+    async def filter_reordering(query: Select, value: Any) -> Select:
+        return query.order_by(None).order_by(Item.area)
+
+
+class TestAsyncMethodFilter(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    async def test_concurrent_methods(self) -> None:
+        filter_set = ItemFilterSet(mock.MagicMock(), select(Item.id))
+        params = {"area": 1, "parent_name": "foo", "title": "bar", "name": "baz", "unknown": 1}
+        query = await asyncio.wait_for(filter_set.afilter_query(params), timeout=1)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            query,
+            "SELECT item.id FROM item JOIN parent ON item.parent_id = parent.id "
+            "WHERE item.title = 'bar' AND item.name = 'baz' AND item.area = 1 "
+            "AND parent.name = 'foo' ORDER BY item.area",
+            literal_binds=True,
+        )
+
+    async def test_sequential_methods(self) -> None:
+        filter_set = ItemFilterSet(mock.MagicMock(), select(Item.id))
+        params: Dict[str, Any] = {"sequential_title": "foo", "name": "bar"}
+        params.update(sequential_name="baz", sequential_limit=10)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            await filter_set.afilter_query(params),
+            "SELECT item.id FROM item "
+            "WHERE item.title = 'foo' AND item.name = 'bar' AND item.name = 'baz' LIMIT 10",
+            literal_binds=True,
+        )
+
+    async def test_facets_query(self) -> None:
+        filter_set = ItemFilterSet(mock.MagicMock(), select(Item.id))
+        params = {"sequential_name": "foo", "name": "baz", "title": "bar"}
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            await filter_set.afacets_query(
+                params, {"sequential_name": Item.name, "title": Item.title}
+            ),
+            "SELECT grouping(item.name, item.title) AS grouping_1, "
+            "item.name, count(1) FILTER (WHERE item.title = 'bar') AS anon_1, "
+            "item.title, count(1) FILTER (WHERE item.name = 'foo') AS anon_2 "
+            "FROM item WHERE item.name = 'baz' GROUP BY GROUPING SETS(item.name, item.title)",
+            dialect="postgresql",
+            literal_binds=True,
+        )
+
+    async def test_count_and_exists_query(self) -> None:
+        filter_set = ItemFilterSet(mock.MagicMock(), select(Item.id))
+        params = {"area": 1, "parent_name": "foo"}
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            await filter_set.acount_query(params),
+            "SELECT count(1) AS count_1 FROM item JOIN parent ON item.parent_id = parent.id "
+            "WHERE item.area = 1 AND parent.name = 'foo'",
+            literal_binds=True,
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            await filter_set.aexists_query(params),
+            "SELECT EXISTS (SELECT item.id FROM item JOIN parent ON item.parent_id = parent.id "
+            "WHERE item.area = 1 AND parent.name = 'foo') AS anon_1",
+            literal_binds=True,
+        )
+
+    async def test_update_and_delete_query(self) -> None:
+        filter_set = ItemFilterSet(mock.MagicMock(), select(Item))
+        params = {"area": 1, "parent_name": "foo"}
+        expected_where = (
+            "item.area = 1 AND (EXISTS (SELECT 1 FROM parent "
+            "WHERE item.parent_id = parent.id AND parent.name = 'foo'))"
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            await filter_set.aupdate_query(params, {"title": "bar"}),
+            f"UPDATE item SET title='bar' WHERE {expected_where}",
+            literal_binds=True,
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            await filter_set.adelete_query(params),
+            f"DELETE FROM item WHERE {expected_where}",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"limit": 10}, {"ordering": ["date"], "reordering": True}],
+    )
+    async def test_not_mergeable(self, params: Dict[str, Any]) -> None:
+        filter_set = ItemFilterSet(mock.MagicMock(), select(Item.id))
+        with pytest.raises(ValueError):
+            await filter_set.afilter_query(params)
+
+    async def test_sync_filter_set(self) -> None:
+        class SyncItemFilterSet(FilterSet[Item]):
+            area = MethodFilter(method="filter_area")
+
+            @staticmethod
+            async def filter_area(query: Select, value: int) -> Select:
+                return query  # pragma: no cover
+
+        with pytest.raises(AssertionError):
+            SyncItemFilterSet(mock.MagicMock(), select(Item.id))
+
+    def test_sync_filter(self) -> None:
+        filter_set = ItemFilterSet(mock.MagicMock(), select(Item.id))
+        with pytest.raises(AssertionError):
+            filter_set.filters["area"].filter(select(Item.id), 1, {})
+
+    def test_sync_filter_query(self) -> None:
+        filter_set = ItemFilterSet(mock.MagicMock(), select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.count_query({"title": "bar"}),
+            "SELECT count(1) AS count_1 FROM item WHERE item.title = 'bar'",
+            literal_binds=True,
+        )
+        with pytest.raises(AssertionError):
+            filter_set.filter_query({"area": 1})
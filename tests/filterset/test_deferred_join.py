@@ -0,0 +1,85 @@
+import uuid
+from typing import Any, Dict
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, LimitOffsetFilter, OrderingField, OrderingFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from tests.models.base import Item, ItemToItemLink
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    id = Filter(Item.id)
+    ordering = OrderingFilter(date=OrderingField(Item.date))
+    pagination = LimitOffsetFilter()
+    deferred_pagination = LimitOffsetFilter(deferred_join=True)
+
+
+class LinkFilterSet(BaseFilterSet[ItemToItemLink]):
+    deferred_pagination = LimitOffsetFilter(deferred_join=True)
+
+
+class TestFilterSetDeferredJoin(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    def test_ids_query(self) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        params = {"id": uuid.uuid4(), "ordering": ["date"], "deferred_pagination": (10, 20)}
+        mapper = filter_set._get_deferred_join_mapper(filter_set.filter_query(params), params)
+        assert mapper is not None
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set._ids_query(filter_set.filter_query(params), mapper),
+            "SELECT item.id FROM item WHERE item.id = :id_1 "
+            "ORDER BY item.date ASC LIMIT :param_1 OFFSET :param_2",
+        )
+
+    def test_entities_query(self) -> None:
+        filter_set = ItemFilterSet(select(Item).order_by(Item.date).limit(5))
+        params = {"deferred_pagination": (10, 20)}
+        mapper = filter_set._get_deferred_join_mapper(filter_set.filter_query(params), params)
+        assert mapper is not None
+        ids = [(uuid.UUID(int=1),), (uuid.UUID(int=2),)]
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set._entities_query(mapper, ids),
+            "SELECT item.id, item.name, item.description, item.date, item.area, "
+            "item.is_active, item.title, item.type, item.parent_id FROM item "
+            "WHERE item.id IN ('00000000000000000000000000000001', "
+            "'00000000000000000000000000000002')",
+            literal_binds=True,
+        )
+
+    def test_composite_primary_key(self) -> None:
+        filter_set = LinkFilterSet(select(ItemToItemLink))
+        params = {"deferred_pagination": (10, 20)}
+        mapper = filter_set._get_deferred_join_mapper(filter_set.filter_query(params), params)
+        assert mapper is not None
+        ids = [(uuid.UUID(int=1), uuid.UUID(int=2))]
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set._entities_query(mapper, ids),
+            "SELECT item_to_item_link.left_id, item_to_item_link.right_id "
+            "FROM item_to_item_link WHERE (item_to_item_link.left_id, item_to_item_link.right_id) "
+            "IN (('00000000000000000000000000000001', "
+            "'00000000000000000000000000000002'))",
+            literal_binds=True,
+        )
+        links = [ItemToItemLink(left_id=left, right_id=right) for left, right in [(1, 2), (2, 1)]]
+        assert filter_set._restore_order(mapper, links, [(2, 1), (1, 2)]) == links[::-1]
+
+    @pytest.mark.parametrize(
+        "query, params",
+        [
+            (select(Item), {}),
+            (select(Item), {"pagination": (10, 20)}),
+            (select(Item), {"deferred_pagination": None}),
+            (select(Item.id), {"deferred_pagination": (10, 20)}),
+            (select(Item, Item.id), {"deferred_pagination": (10, 20)}),
+            (select(sa.literal_column("1")), {"deferred_pagination": (10, 20)}),
+            (select(Item).distinct(), {"ordering": ["date"], "deferred_pagination": (10, 20)}),
+        ],
+    )
+    def test_not_applied(self, query: Any, params: Dict[str, Any]) -> None:
+        filter_set = ItemFilterSet(query)
+        assert filter_set._get_deferred_join_mapper(filter_set.filter_query(params), params) is None
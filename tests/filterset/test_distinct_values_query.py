@@ -0,0 +1,108 @@
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import (
+    Filter,
+    InFilter,
+    LimitOffsetFilter,
+    MethodFilter,
+    RangeFilter,
+)
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from sqlalchemy_filterset.strategies import AutoStrategy, JoinStrategy, SubqueryExistsStrategy
+from tests.models.base import Item, Parent
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    name = Filter(Item.name)
+    area = RangeFilter(Item.area)
+    parent_name = InFilter(Parent.name, strategy=JoinStrategy(Parent, Item.parent_id == Parent.id))
+    pagination = LimitOffsetFilter()
+    method = MethodFilter(method="filter_method")
+
+    def filter_method(self, query: Any, value: Any) -> Any:
+        return query
+
+
+class ParentFilterSet(BaseFilterSet[Parent]):
+    name = Filter(Parent.name)
+    item_name = Filter(
+        Item.name, strategy=SubqueryExistsStrategy(Item, Item.parent_id == Parent.id)
+    )
+    item_title = Filter(Item.title, strategy=AutoStrategy(Item, Item.parent_id == Parent.id))
+
+
+class TestFilterSetDistinctValuesQuery(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "params, prefix, expected_where",
+        [
+            ({}, None, "item.name IS NOT NULL"),
+            (
+                {"name": "foo", "area": (1, 2), "pagination": (10, 5)},
+                None,
+                "item.area >= 1 AND item.area <= 2 AND item.name IS NOT NULL",
+            ),
+            (
+                {},
+                "a_%",
+                "item.name IS NOT NULL AND (item.name LIKE 'a/_/%' || '%' ESCAPE '/')",
+            ),
+        ],
+    )
+    def test_distinct(self, params: Dict[str, Any], prefix: Any, expected_where: str) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.distinct_values_query(params, "name", prefix, limit=10),
+            f"SELECT DISTINCT item.name FROM item WHERE {expected_where} "
+            "ORDER BY item.name LIMIT 10",
+            literal_binds=True,
+        )
+
+    def test_join(self) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.distinct_values_query({"name": "foo"}, "parent_name"),
+            "SELECT DISTINCT parent.name FROM item JOIN parent ON item.parent_id = parent.id "
+            "WHERE item.name = 'foo' AND parent.name IS NOT NULL ORDER BY parent.name LIMIT 50",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize("name, column", [("item_name", "name"), ("item_title", "title")])
+    def test_exists_strategy(self, name: str, column: str) -> None:
+        filter_set = ParentFilterSet(select(Parent))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.distinct_values_query({"name": "foo", name: "bar"}, name),
+            f"SELECT DISTINCT item.{column} FROM parent JOIN item ON item.parent_id = parent.id "
+            f"WHERE parent.name = 'foo' AND item.{column} IS NOT NULL "
+            f"ORDER BY item.{column} LIMIT 50",
+            literal_binds=True,
+        )
+
+    def test_loose_index_scan(self) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.distinct_values_query(
+                {"area": (1, 2), "name": "foo"}, "name", limit=10, loose_index_scan=True
+            ),
+            "WITH RECURSIVE distinct_values(value) AS "
+            "(SELECT min(item.name) AS value FROM item "
+            "WHERE item.area >= 1 AND item.area <= 2 AND item.name IS NOT NULL "
+            "UNION ALL SELECT (SELECT min(item.name) AS min_1 FROM item "
+            "WHERE item.area >= 1 AND item.area <= 2 AND item.name IS NOT NULL "
+            "AND item.name > distinct_values.value) AS anon_1 "
+            "FROM distinct_values WHERE distinct_values.value IS NOT NULL) "
+            "SELECT distinct_values.value FROM distinct_values "
+            "WHERE distinct_values.value IS NOT NULL LIMIT 10",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize("name", ["pagination", "method", "unknown"])
+    def test_invalid(self, name: str) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        with pytest.raises(ValueError):
+            filter_set.distinct_values_query({}, name)
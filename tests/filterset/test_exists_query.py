@@ -0,0 +1,33 @@
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, LimitOffsetFilter, OrderingField, OrderingFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from tests.models.base import Item
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    id = Filter(Item.id)
+    ordering = OrderingFilter(date=OrderingField(Item.date))
+    pagination = LimitOffsetFilter()
+
+
+class TestFilterSetExistsQuery(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    def test_exists(self) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.exists_query({}), "SELECT EXISTS (SELECT item.id FROM item) AS anon_1"
+        )
+
+    def test_with_filter(self) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.exists_query(
+                {"id": uuid.uuid4(), "ordering": ["date"], "pagination": (10, 20)}
+            ),
+            "SELECT EXISTS (SELECT item.id FROM item WHERE item.id = :id_1) AS anon_1",
+        )
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, InFilter, LimitOffsetFilter, RangeFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from sqlalchemy_filterset.strategies import JoinStrategy
+from tests.models.base import Item, Parent
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    name = Filter(Item.name)
+    types = InFilter(Item.type)
+    area = RangeFilter(Item.area)
+    parent_name = Filter(Parent.name, strategy=JoinStrategy(Parent, Item.parent_id == Parent.id))
+    pagination = LimitOffsetFilter()
+
+
+class TestFilterSetFacetsQuery(AssertsCompiledSQL):
+    __dialect__: str = "postgresql"
+
+    def test_facets(self) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        query = filter_set.facets_query(
+            {
+                "name": "foo",
+                "types": ["bar"],
+                "area": (1, 5),
+                "parent_name": "baz",
+                "pagination": (10, 20),
+            },
+            {"types": Item.type, "parent_name": Parent.name, "is_active": Item.is_active},
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            query,
+            "SELECT grouping(item.type, parent.name, item.is_active) AS grouping_1, item.type, "
+            "count(1) FILTER (WHERE parent.name = 'baz') AS anon_1, parent.name, "
+            "count(1) FILTER (WHERE item.type IN ('bar')) AS anon_2, item.is_active, "
+            "count(1) FILTER (WHERE item.type IN ('bar') AND parent.name = 'baz') AS anon_3 "
+            "FROM item JOIN parent ON item.parent_id = parent.id "
+            "WHERE item.name = 'foo' AND item.area >= 1 AND item.area <= 5 "
+            "GROUP BY GROUPING SETS(item.type, parent.name, item.is_active)",
+            literal_binds=True,
+        )
+
+    def test_without_faceted_filters(self) -> None:
+        filter_set = ItemFilterSet(select(Item).where(Item.is_active.is_(True)))
+        query = filter_set.facets_query({"name": "foo"}, {"types": Item.type})
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            query,
+            "SELECT grouping(item.type) AS grouping_1, item.type, count(1) AS count_1 "
+            "FROM item WHERE item.is_active IS true AND item.name = 'foo' "
+            "GROUP BY GROUPING SETS(item.type)",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "rows, expected",
+        [
+            ([], {"a": {}, "b": {}}),
+            (
+                [(1, "x", 2, None, 5), (1, "y", 0, None, 5), (2, None, 3, True, 4)],
+                {"a": {"x": 2}, "b": {True: 4}},
+            ),
+        ],
+    )
+    def test_result(self, rows: list, expected: dict) -> None:
+        assert ItemFilterSet._facets_result(rows, {"a": Item.name, "b": Item.is_active}) == expected
@@ -40,9 +40,10 @@ class TestFilterSetFilterQuery(AssertsCompiledSQL):
         "params, expected_where",
         [
             (
-                {"id": uuid_1, "ids": [uuid_2]},
-                f"item.id = '{uuid_1.hex}' AND item.id IN ('{uuid_2.hex}')",
+                {"id": uuid_1, "ids": [uuid_1, uuid_2]},
+                f"item.id = '{uuid_1.hex}'",
             ),
+            ({"id": uuid_1, "ids": [uuid_2]}, "0 = 1"),
         ],
     )
     def test_filter_multiple_param(self, params: Dict[str, Any], expected_where: str) -> None:
@@ -0,0 +1,93 @@
+import datetime
+from decimal import Decimal
+from typing import Any, Tuple
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, LimitOffsetFilter, RangeFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from sqlalchemy_filterset.strategies import JoinStrategy, SubqueryExistsStrategy
+from tests.models.base import Item, Parent
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    name = Filter(Item.name)
+    area = RangeFilter(Item.area)
+    date = RangeFilter(Item.date)
+    pagination = LimitOffsetFilter()
+
+
+class ParentFilterSet(BaseFilterSet[Parent]):
+    name = Filter(Parent.name)
+    item_area = RangeFilter(Item.area, strategy=JoinStrategy(Item, Item.parent_id == Parent.id))
+    exists_item_area = RangeFilter(
+        Item.area, strategy=SubqueryExistsStrategy(Item, Item.parent_id == Parent.id)
+    )
+
+
+class TestFilterSetHistogramQuery(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "dialect, expected_bucket",
+        [
+            ("postgresql", "width_bucket(item.area, 0, 100, 4)"),
+            (
+                "sqlite",
+                "CASE WHEN (item.area < 0) THEN 0 WHEN (item.area >= 100) THEN 5 "
+                "ELSE CAST(((item.area - 0) * 4) / (100 + 0.0) AS INTEGER) + 1 END",
+            ),
+        ],
+    )
+    def test_histogram(self, dialect: str, expected_bucket: str) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        query = filter_set.histogram_query(
+            {"name": "foo", "area": (10, 20), "pagination": (10, 0)}, "area", (0, 100), 4
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            query,
+            f"SELECT {expected_bucket} AS anon_1, count(1) AS count_1 FROM item "
+            "WHERE item.name = 'foo' AND item.area >= 0 AND item.area < 100 "
+            f"GROUP BY {expected_bucket}",
+            dialect=dialect,
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize("name", ["item_area", "exists_item_area"])
+    def test_join(self, name: str) -> None:
+        filter_set = ParentFilterSet(select(Parent))
+        query = filter_set.histogram_query({"name": "foo", name: (1, 2)}, name, (1, 2), 1)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            query,
+            "SELECT width_bucket(item.area, 1, 2, 1) AS anon_1, count(1) AS count_1 "
+            "FROM parent JOIN item ON item.parent_id = parent.id "
+            "WHERE parent.name = 'foo' AND item.area >= 1 AND item.area < 2 "
+            "GROUP BY width_bucket(item.area, 1, 2, 1)",
+            dialect="postgresql",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "name, bounds, buckets",
+        [
+            ("name", (0, 1), 1),
+            ("unknown", (0, 1), 1),
+            ("area", (1, 1), 1),
+            ("area", (0, 1), 0),
+            ("date", (datetime.datetime(2023, 1, 1), datetime.datetime(2023, 2, 1)), 2),
+        ],
+    )
+    def test_invalid(self, name: str, bounds: Tuple[Any, Any], buckets: int) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        with pytest.raises(ValueError):
+            filter_set.histogram_query({}, name, bounds, buckets)
+
+    def test_result(self) -> None:
+        rows = [(1, 3), (3, 1)]
+        assert ItemFilterSet._histogram_result(rows, (Decimal(0), Decimal(9)), 3) == [
+            (Decimal(0), Decimal(3), 3),
+            (Decimal(3), Decimal(6), 0),
+            (Decimal(6), Decimal(9), 1),
+        ]
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, LimitOffsetFilter, OrderingField, OrderingFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from tests.models.base import Item, ItemToItemLink
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    name = Filter(Item.name)
+    ordering = OrderingFilter(date=OrderingField(Item.date))
+    pagination = LimitOffsetFilter()
+
+
+class LinkFilterSet(BaseFilterSet[ItemToItemLink]):
+    left_id = Filter(ItemToItemLink.left_id)
+
+
+class TestFilterSetIdsQuery(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    def test_ids_query(self) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        params = {"name": "foo", "ordering": ["-date"], "pagination": (10, 20)}
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.ids_query(params),
+            "SELECT item.id FROM item WHERE item.name = 'foo' "
+            "ORDER BY item.date DESC LIMIT 10 OFFSET 20",
+            literal_binds=True,
+        )
+
+    def test_distinct(self) -> None:
+        filter_set = ItemFilterSet(select(Item).distinct())
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.ids_query({"ordering": ["-date"]}),
+            "SELECT item.id FROM item GROUP BY item.id ORDER BY item.date DESC",
+        )
+
+    def test_distinct_on(self) -> None:
+        filter_set = ItemFilterSet(select(Item).distinct(Item.date))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.ids_query({"ordering": ["-date"]}),
+            "SELECT DISTINCT ON (item.date) item.id FROM item ORDER BY item.date DESC",
+            dialect="postgresql",
+        )
+
+    def test_composite_primary_key(self) -> None:
+        filter_set = LinkFilterSet(select(ItemToItemLink))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.ids_query({}),
+            "SELECT item_to_item_link.left_id, item_to_item_link.right_id "
+            "FROM item_to_item_link",
+        )
+
+    def test_not_entity(self) -> None:
+        filter_set = ItemFilterSet(select(Item.id, Item.name))
+        with pytest.raises(ValueError):
+            filter_set.ids_query({})
+
+    @pytest.mark.parametrize("row, expected", [((1,), 1), ((1, 2), (1, 2))])
+    def test_get_id(self, row: tuple, expected: object) -> None:
+        assert ItemFilterSet._get_id(row) == expected
@@ -0,0 +1,217 @@
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, MethodFilter, OrderingField, OrderingFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from sqlalchemy_filterset.planner import plan_joins
+from sqlalchemy_filterset.strategies import JoinStrategy, MultiJoinStrategy
+from tests.models.base import GrandParent, Item, ItemLink, ItemToItemLink, Parent
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    outer_parent_name = Filter(
+        Parent.name,
+        strategy=JoinStrategy(Parent, onclause=Parent.id == Item.parent_id, is_outer=True),
+    )
+    grand_parent_name = Filter(
+        GrandParent.name,
+        strategy=MultiJoinStrategy(
+            JoinStrategy(Parent, onclause=Parent.id == Item.parent_id, is_outer=True),
+            JoinStrategy(GrandParent, onclause=GrandParent.id == Parent.parent_id),
+        ),
+    )
+    link_name = Filter(
+        ItemLink.name,
+        strategy=MultiJoinStrategy(
+            JoinStrategy(ItemToItemLink, onclause=Item.id == ItemToItemLink.right_id),
+            JoinStrategy(ItemLink, onclause=ItemLink.id == ItemToItemLink.left_id),
+        ),
+    )
+    link = Filter(
+        ItemToItemLink.left_id,
+        strategy=JoinStrategy(ItemToItemLink, onclause=Item.id == ItemToItemLink.right_id),
+    )
+    full_parent_name = Filter(
+        Parent.name,
+        strategy=JoinStrategy(Parent, onclause=Parent.id == Item.parent_id, is_full=True),
+    )
+    parent_name = Filter(
+        Parent.name, strategy=JoinStrategy(Parent, onclause=Parent.id == Item.parent_id)
+    )
+    ordering = OrderingFilter(
+        parent_name=OrderingField(
+            Parent.name, strategy=JoinStrategy(Parent, onclause=Parent.id == Item.parent_id)
+        )
+    )
+    raw_link = MethodFilter(method="filter_raw_link")
+
+    @staticmethod
+    def filter_raw_link(query: Select, value: Any) -> Select:
+        return query.join(ItemToItemLink, onclause=Item.id == ItemToItemLink.right_id).where(
+            ItemToItemLink.left_id == value
+        )
+
+
+class TestFilterSetJoinPlanning(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "params, expected",
+        [
+            (
+                {"outer_parent_name": "a", "link": 1},
+                "SELECT item.id FROM item "
+                "JOIN item_to_item_link ON item.id = item_to_item_link.right_id "
+                "LEFT OUTER JOIN parent ON parent.id = item.parent_id "
+                "WHERE parent.name = 'a' AND item_to_item_link.left_id = 1",
+            ),
+            (
+                {"grand_parent_name": "a", "link": 1},
+                "SELECT item.id FROM item "
+                "JOIN item_to_item_link ON item.id = item_to_item_link.right_id "
+                "LEFT OUTER JOIN parent ON parent.id = item.parent_id "
+                "JOIN grand_parent ON grand_parent.id = parent.parent_id "
+                "WHERE grand_parent.name = 'a' AND item_to_item_link.left_id = 1",
+            ),
+            (
+                {"full_parent_name": "a", "link": 1},
+                "SELECT item.id FROM item "
+                "FULL OUTER JOIN parent ON parent.id = item.parent_id "
+                "JOIN item_to_item_link ON item.id = item_to_item_link.right_id "
+                "WHERE parent.name = 'a' AND item_to_item_link.left_id = 1",
+            ),
+        ],
+    )
+    def test_inner_joins_before_outer(self, params: Dict[str, Any], expected: str) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.filter_query(params), expected, literal_binds=True
+        )
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"link": 1, "link_name": "a"},
+            {"link_name": "a", "link": 1},
+            {"link_name": "a", "raw_link": 1},
+            {"link": 1, "raw_link": 1, "link_name": "a"},
+        ],
+    )
+    def test_join_once(self, params: Dict[str, Any]) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        query = filter_set.filter_query(params)
+        assert len(query._setup_joins) == 2
+        assert str(query).startswith(
+            "SELECT item.id \nFROM item "
+            "JOIN item_to_item_link ON item.id = item_to_item_link.right_id "
+            "JOIN item_link ON item_link.id = item_to_item_link.left_id \nWHERE"
+        )
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"parent_name": "a", "ordering": ["parent_name"]},
+            {"ordering": ["parent_name"], "parent_name": "a"},
+        ],
+    )
+    def test_ordering_join_is_merged(self, params: Dict[str, Any]) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.filter_query(params),
+            "SELECT item.id FROM item JOIN parent ON parent.id = item.parent_id "
+            "WHERE parent.name = 'a' ORDER BY parent.name ASC",
+            literal_binds=True,
+        )
+
+    def test_base_query_joins_are_kept(self) -> None:
+        base_query = select(Item.id).join(Parent, isouter=True)
+        filter_set = ItemFilterSet(base_query)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.filter_query({"link": 1}),
+            "SELECT item.id FROM item "
+            "LEFT OUTER JOIN parent ON parent.id = item.parent_id "
+            "JOIN item_to_item_link ON item.id = item_to_item_link.right_id "
+            "WHERE item_to_item_link.left_id = 1",
+            literal_binds=True,
+        )
+
+    def test_without_joins(self) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        query = filter_set.filter_query({})
+        self.assert_compile(query, "SELECT item.id FROM item")  # type: ignore[no-untyped-call]
+
+
+class TestPlanJoins(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    def test_same_target_without_onclause(self) -> None:
+        base_query = select(Item.id)
+        query = base_query.join(Parent, Parent.id == Item.parent_id).join(Parent).join(Parent)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            plan_joins(query, base_query),
+            "SELECT item.id FROM item JOIN parent ON parent.id = item.parent_id",
+        )
+
+    def test_same_target_by_relationship(self) -> None:
+        base_query = select(Item.id)
+        query = (
+            base_query.join(Item.parent)
+            .join(Parent, Item.parent)
+            .join(Parent, Item.parent_id == Parent.id)
+            .join(GrandParent, isouter=True)
+            .join(Parent.parent)
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            plan_joins(query, base_query),
+            "SELECT item.id FROM item JOIN parent ON parent.id = item.parent_id "
+            "JOIN grand_parent ON grand_parent.id = parent.parent_id",
+        )
+
+    def test_secondary_relationship(self) -> None:
+        base_query = select(Item.id)
+        query = base_query.join(Item.links).join(Parent).join(Item.links)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            plan_joins(query, base_query),
+            "SELECT item.id FROM item "
+            "JOIN item_to_item_link AS item_to_item_link_1 "
+            "ON item.id = item_to_item_link_1.right_id "
+            "JOIN item_link ON item_link.id = item_to_item_link_1.left_id "
+            "JOIN parent ON parent.id = item.parent_id",
+        )
+
+    def test_ambiguous_onclause(self) -> None:
+        base_query = select(Item.id, GrandParent.id)
+        query = base_query.join(Parent).join(Parent, Parent.id == Item.parent_id)
+        assert len(plan_joins(query, base_query)._setup_joins) == 2
+
+    def test_join_from_without_onclause(self) -> None:
+        base_query = select(Item.id, GrandParent.id)
+        query = base_query.join_from(Item, Parent).join_from(
+            Item, Parent, Parent.id == Item.parent_id
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            plan_joins(query, base_query),
+            "SELECT item.id, grand_parent.id AS id_1 FROM item "
+            "JOIN parent ON parent.id = item.parent_id, grand_parent",
+        )
+
+    def test_join_from(self) -> None:
+        base_query = select(Item.id)
+        onclause = Item.id == ItemToItemLink.right_id
+        query = (
+            base_query.join(ItemToItemLink, onclause, isouter=True)
+            .join_from(Item, ItemToItemLink, onclause, isouter=True)
+            .join_from(Item, ItemToItemLink, onclause, isouter=True)
+            .join(Parent, Parent.id == Item.parent_id)
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            plan_joins(query, base_query),
+            "SELECT item.id FROM item "
+            "JOIN parent ON parent.id = item.parent_id "
+            "LEFT OUTER JOIN item_to_item_link ON item.id = item_to_item_link.right_id "
+            "LEFT OUTER JOIN item_to_item_link ON item.id = item_to_item_link.right_id",
+        )
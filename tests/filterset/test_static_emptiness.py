@@ -0,0 +1,65 @@
+import operator as op
+from typing import Any, Dict
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from sqlalchemy_filterset.filters import Filter, InFilter, RangeFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from sqlalchemy_filterset.planner import is_statically_empty
+from tests.models.base import Item
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    area = Filter(Item.area)
+    area_gt = Filter(Item.area, lookup_expr=op.gt)
+    areas = InFilter(Item.area)
+    areas_array = InFilter(Item.area, as_array=True)
+    area_range = RangeFilter(Item.area)
+    area_outer = RangeFilter(
+        Item.area, left_lookup_expr=op.lt, right_lookup_expr=op.gt, logic_expr=sa.or_
+    )
+
+
+class TestFilterSetStaticEmptiness:
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"areas": []},
+            {"areas_array": []},
+            {"area_range": (5, 1)},
+            {"area": 1, "areas": [2, 3]},
+            {"area": 1, "area_gt": 1},
+        ],
+    )
+    def test_empty(self, params: Dict[str, Any]) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        assert is_statically_empty(filter_set.filter_query(params))
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"areas": [1]},
+            {"area_range": (1, 5)},
+            {"area": 1, "areas": [1, 2]},
+            {"area_outer": (5, 1)},
+        ],
+    )
+    def test_not_empty(self, params: Dict[str, Any]) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        assert not is_statically_empty(filter_set.filter_query(params))
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            select(sa.func.count()).select_from(Item),
+            select(Item.name).group_by(Item.name),
+            select(Item.name).having(sa.true()),
+        ],
+    )
+    def test_aggregates(self, query: Select) -> None:
+        filter_set = ItemFilterSet(query)
+        assert not is_statically_empty(filter_set.filter_query({"areas": []}))
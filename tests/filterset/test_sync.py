@@ -1,17 +1,39 @@
 import typing
+import uuid
+from unittest import mock
 
-from sqlalchemy import select
+import pytest
+from sqlalchemy import create_engine, func, select, text
 from sqlalchemy.orm import Session
 
-from sqlalchemy_filterset.filters import Filter, InFilter
+from sqlalchemy_filterset.filters import (
+    Filter,
+    InFilter,
+    LimitOffsetFilter,
+    NotInFilter,
+    OrderingField,
+    OrderingFilter,
+    RangeFilter,
+)
 from sqlalchemy_filterset.filtersets import FilterSet
-from tests.models.base import Item
+from tests.models.base import Item, ItemType
 from tests.models.factories import ItemFactory
 
 
 class ItemFilterSet(FilterSet[Item]):
     id = Filter(Item.id)
     ids = InFilter(Item.id)
+    ids_array = InFilter(Item.id, as_array=True)
+    excluded_ids_array = NotInFilter(Item.id, as_array=True)
+    ids_table = InFilter(Item.id, temporary_table_threshold=1)
+    titles_table = InFilter(Item.title, temporary_table_threshold=1)
+    ordering = OrderingFilter(date=OrderingField(Item.date), id=OrderingField(Item.id))
+    pagination = LimitOffsetFilter()
+    deferred_pagination = LimitOffsetFilter(deferred_join=True)
+    type = InFilter(Item.type)
+    is_active = Filter(Item.is_active)
+    area = RangeFilter(Item.area)
+    title = Filter(Item.title)
 
 
 class TestSyncFilterSet:
@@ -39,3 +61,185 @@ class TestSyncFilterSet:
         three_items: typing.List[Item] = await ItemFactory.create_batch(3)
         filter_set = ItemFilterSet(sync_session, select(Item))
         assert filter_set.count({"ids": [three_items[0].id, three_items[1].id]}) == 2
+
+    async def test_filter_ids_array(self, sync_session: Session) -> None:
+        three_items: typing.List[Item] = await ItemFactory.create_batch(3)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        result = filter_set.filter({"ids_array": [three_items[0].id, three_items[1].id]})
+        assert {item.id for item in three_items[:2]} == {item.id for item in result}
+        result = filter_set.filter({"excluded_ids_array": [three_items[0].id]})
+        assert {item.id for item in three_items[1:]} == {item.id for item in result}
+        assert filter_set.count({"ids_array": []}) == 0
+        assert filter_set.count({"excluded_ids_array": []}) == 3
+
+    async def test_filter_ids_temporary_table(self, sync_session: Session) -> None:
+        three_items: typing.List[Item] = await ItemFactory.create_batch(3)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        ids = [three_items[0].id, three_items[1].id, three_items[0].id, None]
+        result = filter_set.filter({"ids_table": ids})
+        assert {item.id for item in three_items[:2]} == {item.id for item in result}
+        assert filter_set.count({"ids_table": ids}) == 2
+        assert filter_set.count({"ids_table": [three_items[2].id]}) == 1
+
+        query = text(
+            "SELECT count(*) FROM pg_class WHERE relnamespace = pg_my_temp_schema() "
+            "AND relname LIKE 'in_filter_values%'"
+        )
+        assert (sync_session.execute(query)).scalar() == 0
+
+    async def test_temporary_table_cleanup(self, sync_session: Session) -> None:
+        three_items: typing.List[Item] = await ItemFactory.create_batch(3)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        params = {"ids_table": [item.id for item in three_items]}
+        ids = filter_set.stream_ids(params, batch_size=1)
+        for _ in ids:
+            assert filter_set.count(params) == 3
+            break
+        ids.close()
+        assert len(filter_set.filter_ids(params)) == 3
+
+        query = text(
+            "SELECT count(*) FROM pg_class WHERE relnamespace = pg_my_temp_schema() "
+            "AND relname LIKE 'in_filter_values%'"
+        )
+        assert sync_session.execute(query).scalar() == 0
+
+    async def test_temporary_tables_of_filters(self, sync_session: Session) -> None:
+        items = [await ItemFactory.create() for _ in range(3)]
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        params = {
+            "ids_table": (item.id for item in items[:2]),
+            "titles_table": [items[1].title, items[2].title],
+        }
+        assert filter_set.filter_ids(params) == [items[1].id]
+
+    async def test_temporary_table_autocommit(self, sync_database_url: str) -> None:
+        three_items: typing.List[Item] = await ItemFactory.create_batch(3)
+        engine = create_engine(sync_database_url, isolation_level="AUTOCOMMIT")
+        with Session(engine) as session:
+            filter_set = ItemFilterSet(session, self.base_query)
+            assert filter_set.count({"ids_table": [item.id for item in three_items]}) == 3
+        engine.dispose()
+
+    async def test_exists(self, sync_session: Session) -> None:
+        three_items: typing.List[Item] = await ItemFactory.create_batch(3)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        assert filter_set.exists({"id": three_items[0].id}) is True
+        assert filter_set.exists({"ids": [uuid.uuid4()]}) is False
+        assert filter_set.exists({"ids_table": [three_items[0].id, uuid.uuid4()]}) is True
+
+    async def test_statically_empty(self, sync_session: Session) -> None:
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        with mock.patch.object(sync_session, "execute") as execute:
+            assert filter_set.filter({"ids": []}) == []
+            assert filter_set.count({"ids": []}) == 0
+            assert filter_set.exists({"ids": []}) is False
+        execute.assert_not_called()
+
+    async def test_filter_deferred_join(self, sync_session: Session) -> None:
+        await ItemFactory.create_batch(5)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        ordering = ["-date", "id"]
+        expected = filter_set.filter({"ordering": ordering, "pagination": (3, 1)})
+        result = filter_set.filter({"ordering": ordering, "deferred_pagination": (3, 1)})
+        assert [item.id for item in result] == [item.id for item in expected]
+        assert len(result) == 3
+        assert filter_set.filter({"deferred_pagination": (3, 5)}) == []
+
+    async def test_facets(self, sync_session: Session) -> None:
+        await ItemFactory.create(type=ItemType.foo, is_active=True)
+        await ItemFactory.create(type=ItemType.foo, is_active=False)
+        await ItemFactory.create(type=ItemType.bar, is_active=True)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        facets = {"type": Item.type, "is_active": Item.is_active}
+        result = filter_set.facets({"type": [ItemType.foo], "is_active": False}, facets)
+        assert result == {"type": {ItemType.foo: 1}, "is_active": {True: 1, False: 1}}
+        result = filter_set.facets({"ids": []}, facets)
+        assert result == {"type": {}, "is_active": {}}
+
+    async def test_histogram(self, sync_session: Session) -> None:
+        for area in [1, 2, 5, 10, 12]:
+            await ItemFactory.create(area=area, is_active=area != 2)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        params = {"area": (5, 5), "is_active": True}
+        assert filter_set.histogram(params, "area", (0, 10), 2) == [(0, 5, 1), (5, 10, 1)]
+
+    @pytest.mark.parametrize("loose_index_scan", [False, True])
+    async def test_distinct_values(self, sync_session: Session, loose_index_scan: bool) -> None:
+        for title, area in [("b", 1), ("a", 2), ("b", 3), ("c", 4), ("ab", 20), (None, 5)]:
+            await ItemFactory.create(title=title, area=area)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        params = {"area": (1, 10), "title": "c"}
+        values = filter_set.distinct_values(
+            params, "title", limit=2, loose_index_scan=loose_index_scan
+        )
+        assert values == ["a", "b"]
+        values = filter_set.distinct_values(
+            params, "title", prefix="a", loose_index_scan=loose_index_scan
+        )
+        assert values == ["a"]
+
+    async def test_aggregate(self, sync_session: Session) -> None:
+        for area in [1, 2, 5, 10]:
+            await ItemFactory.create(area=area, is_active=area != 2)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        params = {"is_active": True, "pagination": (1, 0)}
+        result = filter_set.aggregate(
+            params, total=func.sum(Item.area), maximum=func.max(Item.area)
+        )
+        assert result == {"total": 16, "maximum": 10}
+
+    async def test_update(self, sync_session: Session) -> None:
+        items = [await ItemFactory.create(area=area, title="old") for area in [1, 2, 3]]
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        assert filter_set.update({"area": (2, 3)}, {"title": "new"}) == 2
+        assert filter_set.update({"ids": []}, {"title": "new"}) == 0
+        sync_session.commit()
+        titles = (sync_session.execute(select(Item.id, Item.title))).all()
+        assert {id_: title for id_, title in titles} == {
+            items[0].id: "old",
+            items[1].id: "new",
+            items[2].id: "new",
+        }
+
+    async def test_delete(self, sync_session: Session) -> None:
+        items = [await ItemFactory.create(area=area) for area in [1, 2, 3]]
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        assert filter_set.delete({"area": (2, 3)}) == 2
+        assert filter_set.delete({"ids": []}) == 0
+        sync_session.commit()
+        ids = (sync_session.execute(select(Item.id))).scalars().all()
+        assert ids == [items[0].id]
+
+    async def test_filter_ids_only(self, sync_session: Session) -> None:
+        items = [await ItemFactory.create() for _ in range(3)]
+        items.sort(key=lambda item: item.date)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        params = {"ordering": ["date"], "pagination": (2, 1)}
+        assert filter_set.filter_ids(params) == [items[1].id, items[2].id]
+        assert filter_set.filter_ids({"ids": []}) == []
+
+    async def test_stream_ids(self, sync_session: Session) -> None:
+        items = [await ItemFactory.create() for _ in range(3)]
+        items.sort(key=lambda item: item.date)
+        filter_set = ItemFilterSet(sync_session, self.base_query)
+        params = {"ordering": ["date"], "pagination": (2, 1)}
+        assert list(filter_set.stream_ids(params, batch_size=1)) == [items[1].id, items[2].id]
+        assert list(filter_set.stream_ids({"ids": []}, batch_size=1)) == []
+
+    async def test_filter_ids_distinct(self, sync_session: Session) -> None:
+        items = [await ItemFactory.create() for _ in range(3)]
+        items.sort(key=lambda item: item.date)
+        filter_set = ItemFilterSet(sync_session, select(Item).distinct())
+        params = {"ordering": ["date"], "pagination": (2, 1)}
+        assert filter_set.filter_ids(params) == [items[1].id, items[2].id]
+        ids = [id_ for id_ in filter_set.stream_ids(params, batch_size=1)]
+        assert ids == [items[1].id, items[2].id]
+
+    async def test_filter_deferred_join_distinct(self, sync_session: Session) -> None:
+        items = [await ItemFactory.create() for _ in range(3)]
+        items.sort(key=lambda item: item.date)
+        filter_set = ItemFilterSet(sync_session, select(Item).distinct())
+        params = {"ordering": ["date"], "deferred_pagination": (2, 1)}
+        result = filter_set.filter(params)
+        assert [item.id for item in result] == [items[1].id, items[2].id]
@@ -0,0 +1,105 @@
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, InFilter, LimitOffsetFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from sqlalchemy_filterset.strategies import JoinStrategy, MultiJoinStrategy
+from tests.models.base import GrandParent, Item, ItemLink, ItemToItemLink, Parent
+
+parent_join = JoinStrategy(Parent, Item.parent_id == Parent.id)
+parent_alias = aliased(Parent)
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    name = Filter(Item.name)
+    parent_name = InFilter(Parent.name, strategy=parent_join)
+    grand_parent_name = Filter(
+        GrandParent.name,
+        strategy=MultiJoinStrategy(
+            parent_join, JoinStrategy(GrandParent, Parent.parent_id == GrandParent.id)
+        ),
+    )
+    outer_parent_name = Filter(
+        Parent.name, strategy=JoinStrategy(Parent, Item.parent_id == Parent.id, is_outer=True)
+    )
+    alias_name = Filter(
+        parent_alias.name, strategy=JoinStrategy(parent_alias, Item.parent_id == parent_alias.id)
+    )
+    pagination = LimitOffsetFilter()
+
+
+class LinkFilterSet(BaseFilterSet[ItemToItemLink]):
+    link_name = Filter(
+        ItemLink.name,
+        strategy=JoinStrategy(ItemLink, ItemToItemLink.left_id == ItemLink.id, is_outer=True),
+    )
+
+
+class TestFilterSetUpdateDeleteQuery(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "params, expected_where",
+        [
+            ({"name": "foo", "pagination": (10, 20)}, "item.name = 'foo'"),
+            (
+                {"name": "foo", "parent_name": ["bar"], "grand_parent_name": "baz"},
+                "item.name = 'foo' AND (EXISTS (SELECT 1 FROM parent "
+                "JOIN grand_parent ON parent.parent_id = grand_parent.id "
+                "WHERE item.parent_id = parent.id AND parent.name IN ('bar') "
+                "AND grand_parent.name = 'baz'))",
+            ),
+            (
+                {"alias_name": "foo"},
+                "EXISTS (SELECT 1 FROM parent AS parent_1 "
+                "WHERE item.parent_id = parent_1.id AND parent_1.name = 'foo')",
+            ),
+            (
+                {"outer_parent_name": "foo", "pagination": (10, 20)},
+                "item.id IN (SELECT item.id FROM item "
+                "LEFT OUTER JOIN parent ON item.parent_id = parent.id WHERE parent.name = 'foo')",
+            ),
+        ],
+    )
+    def test_update_delete(self, params: Dict[str, Any], expected_where: str) -> None:
+        filter_set = ItemFilterSet(select(Item))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.update_query(params, {"title": "new"}),
+            f"UPDATE item SET title='new' WHERE {expected_where}",
+            literal_binds=True,
+        )
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.delete_query(params),
+            f"DELETE FROM item WHERE {expected_where}",
+            literal_binds=True,
+        )
+
+    def test_base_query_joins(self) -> None:
+        filter_set = ItemFilterSet(select(Item).join(Parent, Item.parent_id == Parent.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.delete_query({"name": "foo"}),
+            "DELETE FROM item WHERE item.id IN (SELECT item.id FROM item "
+            "JOIN parent ON item.parent_id = parent.id WHERE item.name = 'foo')",
+            literal_binds=True,
+        )
+
+    def test_composite_primary_key(self) -> None:
+        filter_set = LinkFilterSet(select(ItemToItemLink))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.delete_query({"link_name": "foo"}),
+            "DELETE FROM item_to_item_link "
+            "WHERE (item_to_item_link.left_id, item_to_item_link.right_id) IN "
+            "(SELECT item_to_item_link.left_id, item_to_item_link.right_id "
+            "FROM item_to_item_link LEFT OUTER JOIN item_link "
+            "ON item_to_item_link.left_id = item_link.id WHERE item_link.name = 'foo')",
+            literal_binds=True,
+        )
+
+    def test_not_entity(self) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        with pytest.raises(ValueError):
+            filter_set.delete_query({"name": "foo"})
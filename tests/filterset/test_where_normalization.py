@@ -0,0 +1,156 @@
+import datetime
+import operator as op
+from decimal import Decimal
+from typing import Any, Dict
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.filters import Filter, InFilter, RangeFilter
+from sqlalchemy_filterset.filtersets import BaseFilterSet
+from sqlalchemy_filterset.planner import normalize_where
+from tests.models.base import Item
+
+date_1 = datetime.datetime(2023, 1, 1)
+date_2 = datetime.datetime(2023, 2, 1)
+aware_date = datetime.datetime(2023, 1, 15, tzinfo=datetime.timezone.utc)
+
+
+class ItemFilterSet(BaseFilterSet[Item]):
+    area = Filter(Item.area)
+    areas = InFilter(Item.area)
+    area_range = RangeFilter(Item.area)
+    area_outer = RangeFilter(
+        Item.area, left_lookup_expr=op.lt, right_lookup_expr=op.gt, logic_expr=sa.or_
+    )
+    area_gt = Filter(Item.area, lookup_expr=op.gt)
+    area_lt = Filter(Item.area, lookup_expr=op.lt)
+    area_ne = Filter(Item.area, lookup_expr=op.ne)
+    date_range = RangeFilter(Item.date)
+    date_from = Filter(Item.date, lookup_expr=op.ge)
+    name = Filter(Item.name)
+    names = InFilter(Item.name)
+
+
+class TestFilterSetWhereNormalization(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "params, expected_where",
+        [
+            ({"area": 1, "areas": [1, 2]}, "item.area = 1"),
+            ({"areas": [3, 1, 2], "area_range": (2, 5)}, "item.area IN (2, 3)"),
+            ({"areas": [1, 2, 3], "area_range": (2, None)}, "item.area IN (2, 3)"),
+            ({"areas": [1, 2], "area_gt": 1}, "item.area = 2"),
+            ({"areas": [1, Decimal("2.5")], "area_lt": 2}, "item.area = 1"),
+            ({"area_range": (1, 10), "area_gt": 5}, "item.area > 5 AND item.area <= 10"),
+            ({"area_range": (1, 10), "area_lt": 10}, "item.area >= 1 AND item.area < 10"),
+            ({"area_range": (1, 10), "area_gt": 1}, "item.area > 1 AND item.area <= 10"),
+            ({"area_range": (1, 10), "area_gt": 0}, "item.area >= 1 AND item.area <= 10"),
+            ({"area_range": (5, 5)}, "item.area = 5"),
+            ({"areas": [1.5, 2.5], "area_range": (2.0, 3.0)}, "item.area = 2.5"),
+            (
+                {"date_range": (date_1, date_2), "date_from": datetime.datetime(2023, 1, 15)},
+                "item.date >= '2023-01-15 00:00:00' AND item.date <= '2023-02-01 00:00:00'",
+            ),
+            (
+                {"area": 1, "name": "a", "areas": [1, 2]},
+                "item.area = 1 AND item.name = 'a'",
+            ),
+        ],
+    )
+    def test_merge(self, params: Dict[str, Any], expected_where: str) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.filter_query(params),
+            f"SELECT item.id FROM item WHERE {expected_where}",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "params, expected_where",
+        [
+            ({"area": 1, "areas": [2, 3]}, "0 = 1"),
+            ({"areas": [1, 2], "area_range": (3, 5)}, "0 = 1"),
+            ({"area_range": (5, 1)}, "0 = 1"),
+            ({"area_range": (5, 10), "area_lt": 5}, "0 = 1"),
+            ({"area_range": (1, 5), "area_gt": 5}, "0 = 1"),
+            ({"area": 1, "name": "a", "area_gt": 1}, "0 = 1"),
+        ],
+    )
+    def test_contradiction(self, params: Dict[str, Any], expected_where: str) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.filter_query(params),
+            f"SELECT item.id FROM item WHERE {expected_where}",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "params, expected_where",
+        [
+            ({"area_range": (1, 10)}, "item.area >= 1 AND item.area <= 10"),
+            ({"area": 1, "area_ne": 2}, "item.area = 1 AND item.area != 2"),
+            (
+                {"area": 1, "area_outer": (0, 2)},
+                "item.area = 1 AND (item.area < 0 OR item.area > 2)",
+            ),
+            ({"name": "a", "names": ["a", "b"]}, "item.name = 'a' AND item.name IN ('a', 'b')"),
+            ({"area": 1, "areas": [True]}, "item.area = 1 AND item.area IN (1)"),
+            (
+                {"area": 1.1, "areas": [Decimal("1.10")]},
+                "item.area = 1.1 AND item.area IN (1.10)",
+            ),
+            ({"area": 1.0, "areas": [1]}, "item.area = 1.0 AND item.area IN (1)"),
+            (
+                {"area": 1, "date_range": (date_1, date_2)},
+                "item.area = 1 AND item.date >= '2023-01-01 00:00:00' "
+                "AND item.date <= '2023-02-01 00:00:00'",
+            ),
+            (
+                {"date_range": (date_1, date_2), "date_from": aware_date},
+                "item.date >= '2023-01-01 00:00:00' AND item.date <= '2023-02-01 00:00:00' "
+                "AND item.date >= '2023-01-15 00:00:00+00:00'",
+            ),
+            (
+                {"date_from": datetime.date(2023, 1, 15), "date_range": (date_1, None)},
+                "item.date >= '2023-01-15' AND item.date >= '2023-01-01 00:00:00'",
+            ),
+        ],
+    )
+    def test_unchanged(self, params: Dict[str, Any], expected_where: str) -> None:
+        filter_set = ItemFilterSet(select(Item.id))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.filter_query(params),
+            f"SELECT item.id FROM item WHERE {expected_where}",
+            literal_binds=True,
+        )
+
+    def test_base_query_criteria_are_kept(self) -> None:
+        filter_set = ItemFilterSet(select(Item.id).where(Item.area == 1))
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            filter_set.filter_query({"areas": [1, 2], "area": 2}),
+            "SELECT item.id FROM item WHERE item.area = 1 AND item.area = 2",
+            literal_binds=True,
+        )
+
+
+class TestNormalizeWhere(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    @pytest.mark.parametrize(
+        "criterion",
+        [
+            Item.area.in_(sa.bindparam("areas", expanding=True, callable_=lambda: [1])),
+            Item.area.in_(sa.bindparam("areas", expanding=True)),
+            Item.area.in_(select(Item.area)),
+            Item.area == Item.area,
+            Item.area == None,  # noqa: E711
+        ],
+    )
+    def test_not_merged(self, criterion: Any) -> None:
+        base_query = select(Item.id)
+        query = base_query.where(Item.area == 1, criterion)
+        assert normalize_where(query, base_query) is query
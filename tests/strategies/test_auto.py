@@ -0,0 +1,114 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.testing import AssertsCompiledSQL
+
+from sqlalchemy_filterset.strategies import AutoStrategy, JoinStrategy, SubqueryExistsStrategy
+from tests.models.base import Item, ItemLink, ItemToItemLink, Parent
+
+metadata = sa.MetaData()
+
+
+class Code:
+    __table__ = sa.Table(
+        "code",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("value", sa.String, unique=True),
+        sa.Column("item_id", sa.Integer),
+        sa.Column("kind", sa.String),
+        sa.Column("name", sa.String),
+        sa.Index("ix_code_item_id_kind", "item_id", "kind", unique=True),
+    )
+
+
+code = Code.__table__
+sa.Index("ix_code_lower_name", sa.func.lower(code.c.name), unique=True)
+
+
+class TestAutoStrategyDecision:
+    def test_to_one(self) -> None:
+        strategy = AutoStrategy(Parent, onclause=Parent.id == Item.parent_id)
+        assert strategy.is_to_one
+        assert isinstance(strategy.strategy, JoinStrategy)
+
+    def test_to_many(self) -> None:
+        strategy = AutoStrategy(Item, onclause=Item.parent_id == Parent.id)
+        assert not strategy.is_to_one
+        assert isinstance(strategy.strategy, SubqueryExistsStrategy)
+
+    def test_part_of_composite_primary_key(self) -> None:
+        strategy = AutoStrategy(ItemToItemLink, onclause=Item.id == ItemToItemLink.right_id)
+        assert not strategy.is_to_one
+
+    def test_composite_primary_key(self) -> None:
+        strategy = AutoStrategy(
+            ItemToItemLink,
+            onclause=sa.and_(
+                Item.id == ItemToItemLink.right_id, ItemLink.id == ItemToItemLink.left_id
+            ),
+        )
+        assert strategy.is_to_one
+
+    @pytest.mark.parametrize(
+        "onclause, is_to_one",
+        [
+            (code.c.value == Item.name, True),
+            (sa.and_(code.c.item_id == Item.id, code.c.kind == "main"), True),
+            (code.c.item_id == Item.id, False),
+            (code.c.name == Item.name, False),
+            (code.c.id == code.c.item_id, False),
+            (code.c.id > Item.area, False),
+            (sa.or_(code.c.id == Item.area, code.c.value == Item.name), False),
+        ],
+    )
+    def test_unique_constraints(self, onclause: sa.ColumnElement[bool], is_to_one: bool) -> None:
+        strategy = AutoStrategy(Code, onclause=onclause)
+        assert strategy.is_to_one is is_to_one
+
+
+class TestAutoStrategy(AssertsCompiledSQL):
+    __dialect__: str = "default"
+
+    def test_filter_to_one(self) -> None:
+        strategy = AutoStrategy(Parent, onclause=Parent.id == Item.parent_id)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            strategy.filter(select(Item.id), Parent.name == "test"),
+            "SELECT item.id FROM item JOIN parent "
+            "ON parent.id = item.parent_id WHERE parent.name = 'test'",
+            literal_binds=True,
+        )
+
+    def test_filter_to_one_outer(self) -> None:
+        strategy = AutoStrategy(Parent, onclause=Parent.id == Item.parent_id, is_outer=True)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            strategy.filter(select(Item.id), Parent.name.is_(None)),
+            "SELECT item.id FROM item LEFT OUTER JOIN parent "
+            "ON parent.id = item.parent_id WHERE parent.name IS NULL",
+            literal_binds=True,
+        )
+
+    @pytest.mark.parametrize(
+        "apply_join, join",
+        [
+            (AutoStrategy.apply_join, "JOIN"),
+            (AutoStrategy.apply_ordering_join, "LEFT OUTER JOIN"),
+        ],
+    )
+    def test_apply_join_to_one(self, apply_join: Any, join: str) -> None:
+        strategy = AutoStrategy(Parent, onclause=Parent.id == Item.parent_id)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            apply_join(strategy, select(Item.id)),
+            f"SELECT item.id FROM item {join} parent ON parent.id = item.parent_id",
+        )
+
+    def test_filter_to_many(self) -> None:
+        strategy = AutoStrategy(Item, onclause=Item.parent_id == Parent.id)
+        self.assert_compile(  # type: ignore[no-untyped-call]
+            strategy.filter(select(Parent.id), Item.name == "test"),
+            "SELECT parent.id FROM parent WHERE EXISTS (SELECT 1 FROM item "
+            "WHERE item.parent_id = parent.id AND item.name = 'test')",
+            literal_binds=True,
+        )